@@ -1,28 +1,99 @@
 """API эндпоинты для записей на прием."""
 
 import logging
+import time
+from datetime import datetime
+from typing import Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.appointment import create_appointment_with_validation, get_appointment
+from app.core.settings import get_settings
+from app.crud.appointment import (
+    BUSY_REASON,
+    check_appointment_series,
+    create_appointment_series,
+    create_appointment_with_validation,
+    get_appointment,
+)
+from app.crud.archive import get_archived_appointment
+from app.crud.booking_ticket import enqueue_booking, get_booking_ticket
+from app.crud.stats import increment_doctor_daily_stats
 from app.db.database import get_db
-from app.schemas.appointment import AppointmentCreate, AppointmentResponse
+from app.models.booking_ticket import TICKET_PENDING
+from app.schemas.appointment import (
+    AppointmentCreate,
+    AppointmentResponse,
+    AppointmentSeriesCreate,
+    AppointmentSeriesResponse,
+    SeriesConflict,
+)
+from app.schemas.booking_ticket import BookingTicketResponse
+from app.services.booking_queue import get_booking_signals
+from app.services.doctor_directory import get_doctor_directory
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 
+# Максимальное время long-poll ожидания заявки и шаг перечитывания из БД
+MAX_TICKET_WAIT_SECONDS = 30
+TICKET_RECHECK_SECONDS = 1.0
+
+
+async def enqueue_appointment(
+    appointment: AppointmentCreate, db: AsyncSession
+) -> JSONResponse:
+    """Режим очереди: сохранить заявку и ответить 202 с ее токеном."""
+    try:
+        # Неизвестный врач отсекается сразу, по справочнику в памяти
+        if await get_doctor_directory().get_doctor(db, appointment.doctor_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Врач с ID {appointment.doctor_id} не найден или неактивен",
+            )
+        ticket = await enqueue_booking(db, appointment)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Ошибка базы данных при постановке заявки в очередь: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+    get_booking_signals().wake_shard(ticket.doctor_id)
+    logger.info(f"Заявка {ticket.id} на врача {ticket.doctor_id} поставлена в очередь")
+    location = f"{router.prefix}/tickets/{ticket.token}"
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=BookingTicketResponse.model_validate(ticket).model_dump(mode="json"),
+        headers={"Location": location},
+    )
+
 
 @router.post(
-    "", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED
+    "",
+    response_model=AppointmentResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": BookingTicketResponse,
+            "description": "Заявка принята в очередь (BOOKING_QUEUE_ENABLED)",
+        }
+    },
 )
 async def create_new_appointment(
     appointment: AppointmentCreate, db: AsyncSession = Depends(get_db)
-) -> AppointmentResponse:
+) -> Union[AppointmentResponse, JSONResponse]:
     """
     Создать новую запись на прием.
 
+    В режиме очереди (BOOKING_QUEUE_ENABLED) запись не создается сразу:
+    ответ 202 содержит токен заявки, результат - в
+    GET /appointments/tickets/{token}.
+
     Полная валидация включает:
     - Проверку существования и активности врача
     - Проверку доступности времени (нет конфликтующих записей)
@@ -34,6 +105,9 @@ async def create_new_appointment(
     Все операции выполняются в единой транзакции с блокировкой
     для предотвращения race condition.
     """
+    if get_settings().booking_queue_enabled:
+        return await enqueue_appointment(appointment, db)
+
     try:
         # Создаем запись с валидацией (без коммита)
         db_appointment = await create_appointment_with_validation(
@@ -44,6 +118,13 @@ async def create_new_appointment(
         await db.flush()
         await db.refresh(db_appointment)
 
+        # Агрегат загрузки обновляется в той же транзакции
+        await increment_doctor_daily_stats(
+            db,
+            db_appointment.doctor_id,
+            [(db_appointment.start_time, db_appointment.duration_minutes)],
+        )
+
         # Фиксируем транзакцию только после успешного создания
         await db.commit()
 
@@ -66,7 +147,7 @@ async def create_new_appointment(
         await db.rollback()
         logger.warning(f"Ошибка целостности при создании записи: {e}")
         # Дополнительная проверка для понятного сообщения об ошибке
-        if "unique_doctor_time" in str(e):
+        if "unique_doctor_time" in str(e) or "appointments_no_overlap" in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Врач уже занят в это время",
@@ -97,20 +178,171 @@ async def create_new_appointment(
         )
 
 
+def series_conflict_response(
+    conflicts: list[tuple[datetime, str]],
+) -> JSONResponse:
+    """409: ни одна запись серии не создана, даты конфликтов - в conflicts."""
+    response = AppointmentSeriesResponse(
+        created=[],
+        conflicts=[
+            SeriesConflict(start_time=start_time, reason=reason)
+            for start_time, reason in sorted(conflicts)
+        ],
+    )
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT, content=response.model_dump(mode="json")
+    )
+
+
+async def series_race_response(
+    db: AsyncSession, series: AppointmentSeriesCreate
+) -> JSONResponse:
+    """
+    409 после гонки: конкурент занял дату серии между проверкой и вставкой.
+
+    Конфликты проверяются заново уже с записью конкурента; если ее успели
+    отменить, конфликтными считаются все свободные даты серии.
+    """
+    try:
+        free, conflicts = await check_appointment_series(db, series)
+        await db.rollback()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Ошибка базы данных при проверке серии записей: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+    busy = [conflict for conflict in conflicts if conflict[1] == BUSY_REASON]
+    return series_conflict_response(
+        conflicts if busy else [*conflicts, *((t, BUSY_REASON) for t in free)]
+    )
+
+
+@router.post(
+    "/series",
+    response_model=AppointmentSeriesResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_409_CONFLICT: {
+            "model": AppointmentSeriesResponse,
+            "description": "Ни одна запись серии не создана, см. conflicts",
+        }
+    },
+)
+async def create_appointment_series_endpoint(
+    series: AppointmentSeriesCreate, db: AsyncSession = Depends(get_db)
+) -> Union[AppointmentSeriesResponse, JSONResponse]:
+    """
+    Создать серию записей (например, 10 еженедельных приемов) одним запросом.
+
+    Каждая дата проверяется по правилам обычной записи (рабочие часы и дни,
+    интервал 30 минут). Занятость всей серии проверяется одним запросом,
+    записи вставляются одним INSERT без блокировки врача.
+
+    - `all_or_nothing` - при любом конфликте ничего не создается (409);
+    - `best_effort` - создаются свободные даты, остальные - в `conflicts`.
+    """
+    try:
+        result = await create_appointment_series(db, series)
+        if not result.created or (result.conflicts and series.mode == "all_or_nothing"):
+            await db.rollback()
+            return series_conflict_response(result.conflicts)
+
+        await increment_doctor_daily_stats(
+            db,
+            series.doctor_id,
+            [(row["start_time"], series.duration_minutes) for row in result.created],
+        )
+        await db.commit()
+    except ValueError as e:
+        await db.rollback()
+        logger.warning(f"Ошибка валидации при создании серии записей: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError as e:
+        # Дату серии занял конкурент после проверки: ограничение отклонило
+        # всю вставку (в SQLite - триггер appointments_no_overlap)
+        await db.rollback()
+        logger.warning(f"Конфликт при вставке серии записей: {e}")
+        return await series_race_response(db, series)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Ошибка базы данных при создании серии записей: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+    logger.info(
+        f"Создана серия из {len(result.created)} записей для врача "
+        f"{series.doctor_id}, конфликтов: {len(result.conflicts)}"
+    )
+    return AppointmentSeriesResponse(
+        created=[AppointmentResponse.model_validate(row) for row in result.created],
+        conflicts=[
+            SeriesConflict(start_time=start_time, reason=reason)
+            for start_time, reason in result.conflicts
+        ],
+    )
+
+
+@router.get("/tickets/{token}", response_model=BookingTicketResponse)
+async def read_booking_ticket(
+    token: str,
+    wait: float = Query(
+        0, ge=0, le=MAX_TICKET_WAIT_SECONDS, description="Ждать результат, секунды"
+    ),
+    db: AsyncSession = Depends(get_db),
+) -> BookingTicketResponse:
+    """
+    Состояние заявки очереди бронирований.
+
+    С `wait` ответ задерживается до обработки заявки (long-poll). Между
+    проверками соединение возвращается в пул.
+    """
+    deadline = time.monotonic() + wait
+    signals = get_booking_signals()
+    try:
+        while True:
+            ticket = await get_booking_ticket(db, token)
+            if ticket is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Заявка не найдена"
+                )
+            response = BookingTicketResponse.model_validate(ticket)
+            await db.rollback()
+
+            remaining = deadline - time.monotonic()
+            if response.status != TICKET_PENDING or remaining <= 0:
+                return response
+            await signals.wait_for_ticket(token, min(remaining, TICKET_RECHECK_SECONDS))
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при получении заявки: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
 async def read_appointment(
     appointment_id: int, db: AsyncSession = Depends(get_db)
 ) -> AppointmentResponse:
-    """Получить запись на прием по ID."""
+    """Получить запись на прием по ID (включая перенесенные в архив)."""
     try:
-        db_appointment = await get_appointment(db=db, appointment_id=appointment_id)
-        if db_appointment is None:
-            logger.warning(f"Запись {appointment_id} не найдена")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Запись не найдена"
+        appointment = await get_appointment(db=db, appointment_id=appointment_id)
+        if appointment is None:
+            archived = await get_archived_appointment(
+                db=db, appointment_id=appointment_id
             )
+            if archived is None:
+                logger.warning(f"Запись {appointment_id} не найдена")
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Запись не найдена"
+                )
+            appointment = AppointmentResponse.model_validate(archived)
         logger.info(f"Получена запись {appointment_id}")
-        return AppointmentResponse.model_validate(db_appointment)
+        return appointment
     except HTTPException:
         raise
     except SQLAlchemyError as e:
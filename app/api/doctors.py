@@ -0,0 +1,108 @@
+"""API эндпоинты справочника врачей."""
+
+import logging
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.slots import resolve_duration, resolve_search_days
+from app.core.schedule import DEFAULT_VISIT_MINUTES
+from app.db.database import get_db
+from app.schemas.doctor import DoctorResponse
+from app.schemas.slot import FreeSlotResponse
+from app.services.doctor_directory import DoctorDirectory, get_doctor_directory
+from app.services.slot_search import earliest_free_slots
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/doctors", tags=["doctors"])
+
+
+@router.get("", response_model=list[DoctorResponse])
+async def read_doctors(
+    specialization: Optional[str] = Query(None, min_length=1, max_length=255),
+    db: AsyncSession = Depends(get_db),
+    directory: DoctorDirectory = Depends(get_doctor_directory),
+) -> tuple[DoctorResponse, ...]:
+    """
+    Список активных врачей, опционально по специализации.
+
+    Специализация сравнивается без учета регистра и лишних пробелов.
+    Ответ строится из справочника в памяти, БД читается только при
+    обновлении снимка или промахе.
+    """
+    try:
+        return await directory.list_doctors(db, specialization)
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при чтении справочника врачей: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+
+@router.get("/{doctor_id}", response_model=DoctorResponse)
+async def read_doctor(
+    doctor_id: int,
+    db: AsyncSession = Depends(get_db),
+    directory: DoctorDirectory = Depends(get_doctor_directory),
+) -> DoctorResponse:
+    """Получить активного врача по ID."""
+    try:
+        doctor = await directory.get_doctor(db, doctor_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при получении врача {doctor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+    if doctor is None:
+        logger.warning(f"Врач {doctor_id} не найден")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Врач не найден"
+        )
+    return doctor
+
+
+@router.get("/{doctor_id}/slots", response_model=list[FreeSlotResponse])
+async def read_doctor_slots(
+    doctor_id: int,
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    duration_minutes: int = Query(DEFAULT_VISIT_MINUTES),
+    after: Optional[datetime] = Query(
+        None, description="Курсор страницы: слоты строго позже этого времени"
+    ),
+    db: AsyncSession = Depends(get_db),
+    directory: DoctorDirectory = Depends(get_doctor_directory),
+) -> list[FreeSlotResponse]:
+    """
+    Свободные слоты врача по возрастанию времени (по умолчанию - две недели).
+
+    Следующая страница запрашивается с `after` = время последнего слота.
+    """
+    days = resolve_search_days(date_from, date_to)
+    duration_minutes = resolve_duration(duration_minutes)
+    now = datetime.now(timezone.utc)
+    if after is not None:
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+        now = max(now, after)
+    try:
+        doctor = await directory.get_doctor(db, doctor_id)
+        if doctor is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Врач не найден"
+            )
+        return await earliest_free_slots(
+            db, [doctor], days, limit, duration_minutes, now=now
+        )
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при поиске слотов врача {doctor_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
@@ -0,0 +1,79 @@
+"""API эндпоинты временных удержаний слотов."""
+
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.settings import get_settings
+from app.crud.slot_hold import create_slot_hold, release_slot_hold
+from app.db.database import get_db
+from app.schemas.slot_hold import SlotHoldCreate, SlotHoldResponse
+from app.services.slot_holds import get_slot_hold_expirer
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/holds", tags=["holds"])
+
+
+@router.post("", response_model=SlotHoldResponse, status_code=status.HTTP_201_CREATED)
+async def create_hold(
+    hold: SlotHoldCreate, db: AsyncSession = Depends(get_db)
+) -> SlotHoldResponse:
+    """
+    Временно удержать слот врача (SLOT_HOLD_TTL_SECONDS).
+
+    Пока удержание действует, записаться на слот можно только с его токеном
+    (`hold_token` в POST /appointments).
+    """
+    try:
+        slot_hold = await create_slot_hold(
+            db, hold.doctor_id, hold.start_time, get_settings().slot_hold_ttl_seconds
+        )
+        await db.commit()
+    except ValueError as e:
+        await db.rollback()
+        logger.info(f"Удержание слота врача {hold.doctor_id} отклонено: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except IntegrityError as e:
+        # Конкурентное удержание того же слота с другим токеном
+        await db.rollback()
+        logger.warning(f"Ошибка целостности при удержании слота: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Слот временно удерживается другим пациентом",
+        )
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Ошибка базы данных при удержании слота: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+    expirer = get_slot_hold_expirer()
+    expirer.track(slot_hold.token, slot_hold.expires_at)
+    if isinstance(db.bind, AsyncEngine):
+        expirer.ensure_started(db.bind)
+    return SlotHoldResponse.model_validate(slot_hold)
+
+
+@router.delete("/{token}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_hold(token: str, db: AsyncSession = Depends(get_db)) -> Response:
+    """Снять удержание слота."""
+    try:
+        released = await release_slot_hold(db, token)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Ошибка базы данных при снятии удержания: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+    if not released:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Удержание не найдено"
+        )
+    get_slot_hold_expirer().forget(token)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
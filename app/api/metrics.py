@@ -0,0 +1,24 @@
+"""Эндпоинт внутренних метрик процесса."""
+
+from typing import Any
+
+from fastapi import APIRouter, Request
+
+from app.crud.coalesce import read_flights
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def read_metrics(request: Request) -> dict[str, Any]:
+    """Счетчики процесса: объединение чтений и контроль допуска."""
+    metrics: dict[str, Any] = {
+        "singleflight": {
+            **read_flights.stats.as_dict(),
+            "in_flight": read_flights.in_flight,
+        }
+    }
+    controller = getattr(request.app.state, "admission_controller", None)
+    if controller is not None:
+        metrics["admission"] = controller.as_dict()
+    return metrics
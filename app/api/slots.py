@@ -0,0 +1,75 @@
+"""API эндпоинты поиска свободных слотов."""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.stats import resolve_range
+from app.core.schedule import DEFAULT_VISIT_MINUTES, VISIT_DURATIONS, clinic_day
+from app.db.database import get_db
+from app.schemas.slot import FreeSlotResponse
+from app.services.doctor_directory import DoctorDirectory, get_doctor_directory
+from app.services.slot_search import earliest_free_slots
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/slots", tags=["slots"])
+
+# Период поиска по умолчанию, дней
+DEFAULT_SEARCH_DAYS = 14
+
+
+def resolve_search_days(
+    date_from: Optional[date], date_to: Optional[date]
+) -> list[date]:
+    """Дни поиска (по умолчанию - две недели с сегодняшнего дня клиники)."""
+    date_from = date_from or clinic_day(datetime.now(timezone.utc))
+    date_to = date_to or date_from + timedelta(days=DEFAULT_SEARCH_DAYS - 1)
+    return resolve_range(date_from, date_to)
+
+
+def resolve_duration(duration_minutes: int) -> int:
+    """
+    Длительность приема из query-параметра.
+
+    Literal[15, 30, 60] не приводит строку запроса к числу, поэтому
+    допустимость проверяется здесь.
+    """
+    if duration_minutes not in VISIT_DURATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Длительность приема - одно из значений {list(VISIT_DURATIONS)}",
+        )
+    return duration_minutes
+
+
+@router.get("/earliest", response_model=list[FreeSlotResponse])
+async def read_earliest_slots(
+    specialization: str = Query(..., min_length=1, max_length=255),
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    limit: int = Query(5, ge=1, le=100),
+    duration_minutes: int = Query(DEFAULT_VISIT_MINUTES),
+    db: AsyncSession = Depends(get_db),
+    directory: DoctorDirectory = Depends(get_doctor_directory),
+) -> list[FreeSlotResponse]:
+    """
+    Ближайшие свободные слоты среди всех активных врачей специализации.
+
+    Слоты упорядочены по времени; при равном времени - по ID врача.
+    Занятость читается только за дни, до которых дошел поиск.
+    """
+    days = resolve_search_days(date_from, date_to)
+    duration_minutes = resolve_duration(duration_minutes)
+    try:
+        doctors = await directory.list_doctors(db, specialization)
+        return await earliest_free_slots(db, doctors, days, limit, duration_minutes)
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при поиске свободных слотов: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
@@ -0,0 +1,153 @@
+"""API эндпоинты агрегатов загрузки врачей."""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import SLOT_MINUTES, clinic_day, slots_per_day
+from app.crud.stats import (
+    DailyLoad,
+    get_doctor_daily_stats,
+    get_specialization_daily_stats,
+)
+from app.db.database import get_db
+from app.models.doctor import Doctor
+from app.schemas.stats import (
+    DailyOccupancy,
+    DoctorDailyStatsResponse,
+    SpecializationDailyStatsResponse,
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+MAX_RANGE_DAYS = 366
+
+
+def resolve_range(date_from: Optional[date], date_to: Optional[date]) -> list[date]:
+    """Дни периода (по умолчанию - неделя с сегодняшнего дня клиники)."""
+    date_from = date_from or clinic_day(datetime.now(timezone.utc))
+    date_to = date_to or date_from + timedelta(days=6)
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to не может быть раньше date_from",
+        )
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Период не может быть длиннее {MAX_RANGE_DAYS} дней",
+        )
+    return [
+        date_from + timedelta(days=i) for i in range((date_to - date_from).days + 1)
+    ]
+
+
+def occupancy(day: date, load: DailyLoad, doctors: int = 1) -> dict:
+    """
+    Поля загрузки за день для `doctors` врачей.
+
+    Приемы бывают 15, 30 и 60 минут, поэтому загрузка считается по занятым
+    минутам, а не по числу записей: свободные слоты - целые слоты
+    SLOT_MINUTES в оставшемся времени.
+    """
+    capacity = slots_per_day(day) * doctors
+    capacity_minutes = capacity * SLOT_MINUTES
+    free_minutes = max(capacity_minutes - load.booked_minutes, 0)
+    return DailyOccupancy(
+        day=day,
+        appointments=load.appointments,
+        booked_minutes=load.booked_minutes,
+        capacity=capacity,
+        free_slots=free_minutes // SLOT_MINUTES,
+        utilization=(
+            round(min(load.booked_minutes / capacity_minutes, 1.0), 4)
+            if capacity
+            else 0.0
+        ),
+    ).model_dump()
+
+
+@router.get("/doctors/daily", response_model=list[DoctorDailyStatsResponse])
+async def read_doctor_daily_stats(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    doctor_id: Optional[int] = Query(None, ge=1),
+    specialization: Optional[str] = Query(None, min_length=1),
+    db: AsyncSession = Depends(get_db),
+) -> list[DoctorDailyStatsResponse]:
+    """
+    Загрузка активных врачей по дням.
+
+    Читает только агрегаты doctor_daily_stats (O(врачи × дни)),
+    без сканирования appointments.
+    """
+    days = resolve_range(date_from, date_to)
+    try:
+        query = select(Doctor.id).where(Doctor.is_active).order_by(Doctor.id)
+        if doctor_id is not None:
+            query = query.where(Doctor.id == doctor_id)
+        if specialization is not None:
+            query = query.where(Doctor.specialization == specialization)
+        doctor_ids = list((await db.execute(query)).scalars().all())
+
+        loads = await get_doctor_daily_stats(db, days[0], days[-1], doctor_ids)
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при чтении загрузки врачей: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+    return [
+        DoctorDailyStatsResponse(
+            doctor_id=doc_id,
+            **occupancy(day, loads.get((doc_id, day), DailyLoad())),
+        )
+        for doc_id in doctor_ids
+        for day in days
+    ]
+
+
+@router.get(
+    "/specializations/daily", response_model=list[SpecializationDailyStatsResponse]
+)
+async def read_specialization_daily_stats(
+    date_from: Optional[date] = Query(None),
+    date_to: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_db),
+) -> list[SpecializationDailyStatsResponse]:
+    """Загрузка и свободная емкость по специализациям и дням."""
+    days = resolve_range(date_from, date_to)
+    try:
+        doctors_result = await db.execute(
+            select(Doctor.specialization, func.count())
+            .where(Doctor.is_active)
+            .group_by(Doctor.specialization)
+            .order_by(Doctor.specialization)
+        )
+        doctors_per_specialization: dict[str, int] = {
+            spec: count for spec, count in doctors_result.all()
+        }
+        loads = await get_specialization_daily_stats(db, days[0], days[-1])
+    except SQLAlchemyError as e:
+        logger.error(f"Ошибка базы данных при чтении загрузки специализаций: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Произошла ошибка базы данных",
+        )
+
+    return [
+        SpecializationDailyStatsResponse(
+            specialization=spec,
+            doctors=doctors,
+            **occupancy(day, loads.get((spec, day), DailyLoad()), doctors),
+        )
+        for spec, doctors in doctors_per_specialization.items()
+        for day in days
+    ]
@@ -0,0 +1,240 @@
+"""
+Контроль допуска запросов (admission control) и сброс нагрузки.
+
+При всплеске запросы не должны копиться в ожидании соединения из пула:
+клиенты все равно уйдут по таймауту и повторят запрос. Middleware отвечает
+сразу, не ставя запрос в очередь:
+
+- 429 + Retry-After - клиент исчерпал свой token bucket;
+- 503 + Retry-After - превышен лимит одновременных запросов маршрута или
+  сервиса, либо пул БД насыщен (сглаженное ожидание соединения выше порога).
+
+Запросы делятся на чтения (GET/HEAD) и бронирования (остальные методы).
+Приоритетный класс (`ADMISSION_PRIORITY`) может занять всю емкость, второму
+доступна емкость за вычетом резерва, и он первым отбрасывается при насыщении
+пула.
+"""
+
+import logging
+import math
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.settings import Settings
+from app.db.pool_wait import PoolWaitTracker, pool_wait_tracker
+
+logger = logging.getLogger(__name__)
+
+RequestClass = Literal["read", "booking"]
+
+EXEMPT_PATHS = frozenset({"/", "/health"})
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+MAX_TRACKED_CLIENTS = 10_000
+
+
+def path_has_prefix(path: str, prefix: str) -> bool:
+    """Начинается ли путь с префикса из целых сегментов."""
+    prefix = prefix.rstrip("/")
+    return path == prefix or path.startswith(prefix + "/")
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket клиента: `rate` токенов в секунду, не больше `burst`."""
+
+    rate: float
+    burst: float
+    tokens: float
+    updated: float
+
+    def take(self, now: float) -> float:
+        """Взять токен; вернуть 0 или через сколько секунд он появится."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+@dataclass
+class Rejection:
+    """Отказ в допуске."""
+
+    status_code: int
+    retry_after: float
+    reason: str
+
+
+@dataclass
+class AdmissionController:
+    """Счетчики in-flight и решения о допуске (без ASGI)."""
+
+    max_in_flight: int
+    route_limits: dict[str, int]
+    client_rate: float
+    client_burst: int
+    max_pool_wait_seconds: float
+    priority: RequestClass
+    reserved_share: float
+    retry_after_seconds: float
+    pool_wait: PoolWaitTracker = field(default_factory=lambda: pool_wait_tracker)
+    in_flight: int = 0
+    route_in_flight: Counter[str] = field(default_factory=Counter)
+    rejected: Counter[str] = field(default_factory=Counter)
+    _buckets: "OrderedDict[str, TokenBucket]" = field(default_factory=OrderedDict)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AdmissionController":
+        """Построить по настройкам ADMISSION_*."""
+        return cls(
+            max_in_flight=settings.admission_max_in_flight,
+            route_limits=settings.admission_route_limits,
+            client_rate=settings.admission_client_rate,
+            client_burst=settings.admission_client_burst,
+            max_pool_wait_seconds=settings.admission_max_pool_wait_ms / 1000,
+            priority="read" if settings.admission_priority == "reads" else "booking",
+            reserved_share=settings.admission_reserved_share,
+            retry_after_seconds=settings.admission_retry_after_seconds,
+        )
+
+    @property
+    def secondary_capacity(self) -> int:
+        """Емкость неприоритетного класса (без резерва приоритетного)."""
+        return self.max_in_flight - int(self.max_in_flight * self.reserved_share)
+
+    def route_key(self, method: str, path: str) -> Optional[str]:
+        """
+        Самый длинный ключ лимита вида "POST /appointments" для запроса.
+
+        Префикс сравнивается по целым сегментам пути: "/appointments" покрывает
+        "/appointments" и "/appointments/5", но не "/appointmentsX".
+        """
+        best: Optional[str] = None
+        for key in self.route_limits:
+            key_method, _, prefix = key.partition(" ")
+            if key_method not in (method, "*") or not path_has_prefix(path, prefix):
+                continue
+            if best is None or len(key) > len(best):
+                best = key
+        return best
+
+    def _take_token(self, client: str, now: float) -> float:
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            burst = float(self.client_burst)
+            bucket = TokenBucket(self.client_rate, burst, burst, now)
+            self._buckets[client] = bucket
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+        return bucket.take(now)
+
+    def _check(
+        self, request_class: RequestClass, route: Optional[str], client: str
+    ) -> Optional[Rejection]:
+        if self.client_burst > 0:
+            wait = self._take_token(client, time.monotonic())
+            if wait > 0:
+                return Rejection(429, wait, "client_rate")
+
+        secondary = request_class != self.priority
+        if secondary and self.pool_wait.value > self.max_pool_wait_seconds:
+            return Rejection(503, self.retry_after_seconds, "pool_saturated")
+
+        capacity = self.secondary_capacity if secondary else self.max_in_flight
+        if self.in_flight >= capacity:
+            return Rejection(503, self.retry_after_seconds, "in_flight")
+
+        if (
+            route is not None
+            and self.route_in_flight[route] >= self.route_limits[route]
+        ):
+            return Rejection(503, self.retry_after_seconds, "route_limit")
+        return None
+
+    def admit(
+        self, method: str, path: str, client: str
+    ) -> tuple[Optional[Rejection], Optional[str]]:
+        """Решение о допуске; при допуске занимает слоты (см. `release`)."""
+        request_class: RequestClass = "read" if method in READ_METHODS else "booking"
+        route = self.route_key(method, path)
+        rejection = self._check(request_class, route, client)
+        if rejection is not None:
+            self.rejected[rejection.reason] += 1
+            return rejection, None
+
+        self.in_flight += 1
+        if route is not None:
+            self.route_in_flight[route] += 1
+        return None, route
+
+    def release(self, route: Optional[str]) -> None:
+        """Освободить слоты завершившегося запроса."""
+        self.in_flight -= 1
+        if route is not None:
+            self.route_in_flight[route] -= 1
+
+    def as_dict(self) -> dict[str, object]:
+        """Состояние для /metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "route_in_flight": dict(self.route_in_flight),
+            "rejected": dict(self.rejected),
+            "pool_wait_ms": round(self.pool_wait.value * 1000, 3),
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware: отвечает 429/503 сразу, не ставя запрос в очередь."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        client_header: Optional[str] = None,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.client_header = client_header.lower().encode() if client_header else None
+
+    def client_id(self, scope: Scope) -> str:
+        """Идентификатор клиента: заголовок (за прокси) или адрес."""
+        if self.client_header is not None:
+            for name, value in scope.get("headers", []):
+                if name == self.client_header:
+                    return str(value.decode("latin-1")).split(",")[0].strip()
+        client = scope.get("client")
+        return str(client[0]) if client else "unknown"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        rejection, route = self.controller.admit(
+            scope["method"], scope["path"], self.client_id(scope)
+        )
+        if rejection is not None:
+            logger.debug(
+                f"Запрос {scope['method']} {scope['path']} отклонен: "
+                f"{rejection.reason}"
+            )
+            response = JSONResponse(
+                {"detail": "Сервис перегружен, повторите запрос позже"},
+                status_code=rejection.status_code,
+                headers={"Retry-After": str(max(1, math.ceil(rejection.retry_after)))},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(route)
@@ -0,0 +1,54 @@
+"""
+Множество непересекающихся полуинтервалов [start, end) с поиском пересечений.
+
+Приемы одного врача не пересекаются, поэтому интервальное дерево вырождается
+в упорядоченный по началу список: пересечение с [start, end) может быть
+только у интервала, начавшегося последним до `end`, - он находится двоичным
+поиском за O(log n).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Optional
+
+
+class IntervalIndex:
+    """Непересекающиеся интервалы времени, упорядоченные по началу."""
+
+    def __init__(self, intervals: Iterable[tuple[datetime, datetime]] = ()) -> None:
+        self._starts: list[datetime] = []
+        self._ends: list[datetime] = []
+        for start, end in sorted(intervals):
+            self._append(start, end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[tuple[datetime, datetime]]:
+        return iter(zip(self._starts, self._ends))
+
+    def _append(self, start: datetime, end: datetime) -> None:
+        # Пересекающиеся интервалы (запись и удержание того же слота)
+        # склеиваются, чтобы сохранить инвариант непересечения
+        if self._ends and start < self._ends[-1]:
+            self._ends[-1] = max(self._ends[-1], end)
+            return
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def overlapping(self, start: datetime, end: datetime) -> Optional[datetime]:
+        """Начало интервала, пересекающегося с [start, end), или None."""
+        i = bisect_left(self._starts, end) - 1
+        if i >= 0 and self._ends[i] > start:
+            return self._starts[i]
+        return None
+
+    def add(self, start: datetime, end: datetime) -> bool:
+        """Добавить интервал; False, если он пересекается с имеющимся."""
+        if self.overlapping(start, end) is not None:
+            return False
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        return True
@@ -0,0 +1,61 @@
+"""Расписание клиники: рабочие дни, часы и слоты."""
+
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.core.settings import get_settings
+
+# Рабочие часы: первый слот в 9:00, последний - в 17:30, шаг 30 минут
+WORKDAY_START = time(9, 0)
+WORKDAY_END = time(18, 0)
+LAST_SLOT_START = time(17, 30)
+SLOT_MINUTES = 30
+SLOTS_PER_WORKDAY = 18
+
+# Длительности приемов; 15-минутный прием может начинаться в :15 и :45
+VISIT_DURATIONS = (15, 30, 60)
+DEFAULT_VISIT_MINUTES = 30
+MAX_VISIT_MINUTES = max(VISIT_DURATIONS)
+
+
+def clinic_timezone() -> ZoneInfo:
+    """Часовой пояс клиники."""
+    return ZoneInfo(get_settings().timezone)
+
+
+def is_workday(day: date) -> bool:
+    """Рабочий ли день (пн-пт)."""
+    return day.weekday() < 5
+
+
+def slots_per_day(day: date) -> int:
+    """Число слотов врача в этот день."""
+    return SLOTS_PER_WORKDAY if is_workday(day) else 0
+
+
+def clinic_day(moment: datetime) -> date:
+    """День по времени клиники, на который приходится момент (naive = UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(clinic_timezone()).date()
+
+
+def visit_step_minutes(duration_minutes: int) -> int:
+    """Шаг, с которым может начинаться прием этой длительности."""
+    return min(duration_minutes, SLOT_MINUTES)
+
+
+def day_slots(
+    day: date, duration_minutes: int = DEFAULT_VISIT_MINUTES
+) -> list[datetime]:
+    """Начала приемов длительности `duration_minutes` в день клиники (UTC)."""
+    if not is_workday(day):
+        return []
+    tz = clinic_timezone()
+    first = datetime.combine(day, WORKDAY_START, tzinfo=tz)
+    last = datetime.combine(day, WORKDAY_END, tzinfo=tz) - timedelta(
+        minutes=duration_minutes
+    )
+    step = timedelta(minutes=visit_step_minutes(duration_minutes))
+    count = int((last - first) / step) + 1
+    return [(first + step * i).astimezone(timezone.utc) for i in range(count)]
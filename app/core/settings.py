@@ -1,5 +1,9 @@
 """Настройки приложения."""
 
+from functools import lru_cache
+from typing import Any, Literal, Optional
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -15,7 +19,77 @@ class Settings(BaseSettings):
     # Часовой пояс приложения
     timezone: str
 
+    # Помесячное секционирование appointments (sql/partition_appointments.sql)
+    appointments_partitioning: bool = False
+    partition_months_ahead: int = 3
+    partition_maintenance_interval_seconds: float = 6 * 60 * 60
+
+    # Архивация прошедших записей (app/maintenance/archive.py)
+    archive_enabled: bool = False
+    archive_after_days: int = 365
+    archive_batch_size: int = 1000
+    archive_pause_seconds: float = 0.1
+    archive_interval_seconds: float = 24 * 60 * 60
+
+    # Справочник врачей в памяти (app/services/doctor_directory.py)
+    doctor_directory_ttl_seconds: float = 300
+
+    # Контроль допуска и сброс нагрузки (app/core/admission.py)
+    admission_enabled: bool = False
+    admission_max_in_flight: int = 100
+    # JSON: {"POST /appointments": 20, "GET /stats": 5}
+    admission_route_limits: dict[str, int] = {}
+    # Токенов в секунду на клиента; лимит клиента отключает
+    # ADMISSION_CLIENT_BURST=0, а не нулевая скорость
+    admission_client_rate: float = Field(20.0, gt=0)
+    admission_client_burst: int = 40
+    admission_client_header: Optional[str] = None
+    admission_max_pool_wait_ms: float = 200.0
+    admission_priority: Literal["reads", "bookings"] = "reads"
+    admission_reserved_share: float = 0.2
+    admission_retry_after_seconds: float = 1.0
+
+    # Режим очереди бронирований: 202 + заявка (app/services/booking_queue.py)
+    booking_queue_enabled: bool = False
+    booking_queue_shards: int = 4
+    booking_queue_batch_size: int = 50
+    booking_queue_poll_interval_seconds: float = 1.0
+    # Заявка с неожиданной ошибкой повторяется, после N попыток - отклоняется
+    booking_queue_max_attempts: int = 3
+    booking_ticket_retention_hours: float = 24
+
+    # Временные удержания слотов (app/services/slot_holds.py)
+    slot_hold_ttl_seconds: float = 120
+    slot_hold_sweep_interval_seconds: float = 60 * 60
+
+    # Напоминания о приеме (app/services/reminders.py)
+    reminders_enabled: bool = False
+    reminder_lead_minutes: float = 24 * 60
+    reminder_batch_size: int = 500
+    reminder_concurrency: int = 20
+    reminder_interval_seconds: float = 60
+    # Неудачных отправок, после которых напоминание больше не повторяется
+    reminder_max_attempts: int = 5
+    # Токен бота для отправки напоминаний; без него (или с заглушкой из
+    # .env.example) напоминания пишутся в лог
+    telegram_bot_token: Optional[str] = None
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
-settings = Settings()  # type: ignore[call-arg]
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Получить настройки приложения.
+
+    Настройки читаются из окружения при первом обращении, а не при импорте,
+    чтобы CLI, воркеры и тесты не платили за это, пока настройки не нужны.
+    """
+    return Settings()  # type: ignore[call-arg]
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый доступ к `settings` для обратной совместимости."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
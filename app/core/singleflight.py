@@ -0,0 +1,87 @@
+"""
+Single-flight: объединение одинаковых одновременных вызовов.
+
+Первый вызов с данным ключом (лидер) выполняет функцию, остальные,
+пришедшие до его завершения, ждут тот же результат (или исключение).
+Если лидера отменили, ожидающие не получают его CancelledError: один из них
+становится новым лидером.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Счетчики дедупликации."""
+
+    calls: int = 0
+    executions: int = 0
+    shared: int = 0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Доля вызовов, получивших чужой результат."""
+        return self.shared / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """Счетчики для /metrics."""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "shared": self.shared,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+        }
+
+
+@dataclass
+class SingleFlight:
+    """Группа single-flight; ключи живут только пока вызов выполняется."""
+
+    stats: SingleFlightStats = field(default_factory=SingleFlightStats)
+    _flights: dict[Hashable, "asyncio.Future[Any]"] = field(default_factory=dict)
+
+    @property
+    def in_flight(self) -> int:
+        """Число выполняющихся сейчас ключей."""
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Выполнить `call` или дождаться уже выполняющегося с тем же ключом."""
+        self.stats.calls += 1
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                return await self._lead(key, call)
+            try:
+                result: T = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if flight.cancelled():
+                    continue  # лидер отменен - пробуем сами
+                raise
+            self.stats.shared += 1
+            return result
+
+    async def _lead(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        flight: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.stats.executions += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            # Исключение получают ожидающие; без них не логируем "never retrieved"
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
@@ -0,0 +1,98 @@
+"""
+Иерархическое колесо таймеров (hierarchical timing wheel).
+
+Время делится на тики длиной `tick`. Уровень 0 - `slots` ячеек по одному
+тику, каждый следующий уровень покрывает в `slots` раз больший интервал.
+Таймер кладется в ячейку уровня, соответствующего оставшемуся времени, и при
+обороте нижнего уровня спускается вниз. Добавление и отмена - O(1), каждый
+таймер спускается не больше `levels` раз, поэтому истечение тоже O(1) на
+таймер и не требует просмотра всех таймеров.
+"""
+
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimingWheel(Generic[K]):
+    """Колесо таймеров с ключами `K` и временем в секундах."""
+
+    def __init__(
+        self, tick: float, now: float, slots: int = 64, levels: int = 4
+    ) -> None:
+        if slots & (slots - 1):
+            raise ValueError("Число ячеек должно быть степенью двойки")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._current = int(now // tick)
+        self._wheels: list[list[dict[K, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._due: dict[K, int] = {}
+        self._where: dict[K, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where) + len(self._due)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._where or key in self._due
+
+    def _place(self, key: K, deadline: int) -> None:
+        delta = deadline - self._current
+        if delta <= 0:
+            self._due[key] = deadline
+            return
+        for level in range(self.levels):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (deadline >> (self._bits * level)) & self._mask
+                break
+        else:
+            # Дальше горизонта колеса: ждем полный оборот верхнего уровня
+            level = self.levels - 1
+            slot = ((self._current >> (self._bits * level)) - 1) & self._mask
+        self._wheels[level][slot][key] = deadline
+        self._where[key] = (level, slot)
+
+    def add(self, key: K, expires_at: float) -> None:
+        """Добавить (или перенести) таймер, истекающий в `expires_at`."""
+        self.remove(key)
+        self._place(key, int(-(-expires_at // self.tick)))
+
+    def remove(self, key: K) -> bool:
+        """Отменить таймер; False, если его нет."""
+        if self._due.pop(key, None) is not None:
+            return True
+        position = self._where.pop(key, None)
+        if position is None:
+            return False
+        level, slot = position
+        del self._wheels[level][slot][key]
+        return True
+
+    def _cascade(self, level: int) -> None:
+        slot = (self._current >> (self._bits * level)) & self._mask
+        timers = self._wheels[level][slot]
+        self._wheels[level][slot] = {}
+        for key, deadline in timers.items():
+            del self._where[key]
+            self._place(key, deadline)
+
+    def advance(self, now: float) -> list[K]:
+        """Продвинуть время до `now` и вернуть истекшие ключи."""
+        expired = list(self._due)
+        self._due.clear()
+        target = int(now // self.tick)
+        while self._current < target:
+            self._current += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self._current & ((1 << (self._bits * level)) - 1) == 0:
+                    self._cascade(level)
+            # Ячейка уровня 0 истекает; таймеры из-за горизонта кладутся заново
+            self._cascade(0)
+            expired.extend(self._due)
+            self._due.clear()
+        return expired
@@ -1,65 +1,269 @@
 """CRUD операции для записей на прием."""
 
-from datetime import datetime
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.doctor import check_doctor_availability
+from app.core.intervals import IntervalIndex
+from app.core.schedule import MAX_VISIT_MINUTES, SLOT_MINUTES
+from app.crud.coalesce import coalesced_read
+from app.crud.doctor import check_doctor_availability, get_doctor
+from app.crud.slot_hold import get_active_slot_holds
+from app.db.dialect import upsert_insert
 from app.models.appointment import Appointment
-from app.schemas.appointment import AppointmentCreate
+from app.models.slot_hold import SlotHold
+from app.schemas.appointment import (
+    AppointmentCreate,
+    AppointmentResponse,
+    AppointmentSeriesCreate,
+)
+
+BUSY_REASON = "Врач уже занят в это время"
+HELD_REASON = "Слот временно удерживается другим пациентом"
 
 
 async def create_appointment_with_validation(
-    db: AsyncSession, appointment: AppointmentCreate
+    db: AsyncSession, appointment: AppointmentCreate, lock: bool = True
 ) -> Appointment:
     """
     Создать новую запись на прием с полной валидацией и проверкой конфликтов.
 
     Эта функция НЕ управляет транзакциями - вызывающий код должен
-    управлять commit/rollback.
+    управлять commit/rollback. lock=False - см. check_doctor_availability.
     """
     # Проверяем доступность врача с блокировкой
     is_available, doctor = await check_doctor_availability(
-        db, appointment.doctor_id, appointment.start_time
+        db,
+        appointment.doctor_id,
+        appointment.start_time,
+        lock=lock,
+        duration_minutes=appointment.duration_minutes,
     )
 
     if doctor is None:
         raise ValueError(f"Врач с ID {appointment.doctor_id} не найден или неактивен")
 
     if not is_available:
-        raise ValueError("Врач уже занят в это время")
+        raise ValueError(BUSY_REASON)
+
+    # Чужое действующее удержание слота блокирует запись, свое - снимается
+    end_time = appointment.start_time + timedelta(minutes=appointment.duration_minutes)
+    holds = await get_active_slot_holds(
+        db, appointment.doctor_id, appointment.start_time, end_time
+    )
+    if any(hold.token != appointment.hold_token for hold in holds):
+        raise ValueError(HELD_REASON)
+    for hold in holds:
+        await db.delete(hold)
 
     # Создаем запись
-    db_appointment = Appointment(**appointment.model_dump())
+    db_appointment = Appointment(
+        **appointment.model_dump(exclude={"hold_token"}), end_time=end_time
+    )
     db.add(db_appointment)
 
     # НЕ делаем flush/refresh здесь - оставляем управление транзакциями вызывающему коду
     return db_appointment
 
 
+def as_utc(value: datetime) -> datetime:
+    """SQLite возвращает время без timezone - это UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass
+class SeriesResult:
+    """Созданные записи серии и даты, на которые запись не создана."""
+
+    created: list[dict[str, Any]] = field(default_factory=list)
+    conflicts: list[tuple[datetime, str]] = field(default_factory=list)
+
+
+async def find_series_conflicts(
+    db: AsyncSession,
+    doctor_id: int,
+    start_times: list[datetime],
+    duration_minutes: int,
+) -> dict[datetime, str]:
+    """
+    Даты серии, пересекающиеся с записями врача или чужими удержаниями.
+
+    Записи и удержания за период серии читаются двумя запросами-диапазонами
+    (unique_doctor_time и PK удержаний), каждая дата проверяется по
+    IntervalIndex за O(log n).
+    """
+    duration = timedelta(minutes=duration_minutes)
+    lower, upper = min(start_times), max(start_times) + duration
+    booked = await db.execute(
+        select(Appointment.start_time, Appointment.end_time).where(
+            Appointment.doctor_id == doctor_id,
+            Appointment.start_time > lower - timedelta(minutes=MAX_VISIT_MINUTES),
+            Appointment.start_time < upper,
+        )
+    )
+    held = await db.execute(
+        select(SlotHold.start_time).where(
+            SlotHold.doctor_id == doctor_id,
+            SlotHold.start_time > lower - timedelta(minutes=SLOT_MINUTES),
+            SlotHold.start_time < upper,
+            SlotHold.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    busy = IntervalIndex((as_utc(start), as_utc(end)) for start, end in booked.all())
+    holds = IntervalIndex(
+        (as_utc(start), as_utc(start) + timedelta(minutes=SLOT_MINUTES))
+        for start in held.scalars()
+    )
+
+    conflicts = {}
+    for start_time in start_times:
+        if busy.overlapping(start_time, start_time + duration) is not None:
+            conflicts[start_time] = BUSY_REASON
+        elif holds.overlapping(start_time, start_time + duration) is not None:
+            conflicts[start_time] = HELD_REASON
+    return conflicts
+
+
+async def check_appointment_series(
+    db: AsyncSession, series: AppointmentSeriesCreate
+) -> tuple[list[datetime], list[tuple[datetime, str]]]:
+    """
+    Свободные даты серии и конфликты (правила записи, занятость, удержания).
+
+    Эта функция НЕ управляет транзакциями.
+    """
+    if await get_doctor(db, series.doctor_id) is None:
+        raise ValueError(f"Врач с ID {series.doctor_id} не найден или неактивен")
+
+    conflicts = []
+    candidates = []
+    for start_time, reason in series.occurrences():
+        if reason is None:
+            candidates.append(start_time)
+        else:
+            conflicts.append((start_time, reason))
+
+    busy = (
+        await find_series_conflicts(
+            db, series.doctor_id, candidates, series.duration_minutes
+        )
+        if candidates
+        else {}
+    )
+    conflicts.extend((start_time, busy[start_time]) for start_time in busy)
+    free = [start_time for start_time in candidates if start_time not in busy]
+    return free, conflicts
+
+
+async def create_appointment_series(
+    db: AsyncSession, series: AppointmentSeriesCreate
+) -> SeriesResult:
+    """
+    Создать серию записей одним INSERT ... ON CONFLICT DO NOTHING.
+
+    Конфликты проверяются одним запросом на всю серию; запись, занятая
+    конкурентом между проверкой и вставкой, тоже попадает в конфликты
+    (ее строку вставка пропускает по unique_doctor_time или, в PostgreSQL,
+    по appointments_no_overlap). Триггер appointments_no_overlap в SQLite
+    прерывает вставку целиком (RAISE(ABORT) не подавляется ON CONFLICT), и
+    IntegrityError уходит вызывающему коду, как и любое другое нарушение
+    ограничений на гонке. В режиме all_or_nothing при конфликтах ничего не
+    вставляется или вызывающий код откатывает транзакцию.
+    Эта функция НЕ управляет транзакциями.
+    """
+    result = SeriesResult()
+    free, result.conflicts = await check_appointment_series(db, series)
+    if not free or (result.conflicts and series.mode == "all_or_nothing"):
+        result.conflicts.sort()
+        return result
+
+    statement = upsert_insert(db, Appointment).values(
+        [
+            {
+                "doctor_id": series.doctor_id,
+                "patient_name": series.patient_name,
+                "start_time": start_time,
+                "duration_minutes": series.duration_minutes,
+                "end_time": start_time + timedelta(minutes=series.duration_minutes),
+                "telegram_chat_id": series.telegram_chat_id,
+            }
+            for start_time in free
+        ]
+    )
+    inserted = await db.execute(
+        # Без цели конфликта: пропускаются нарушения и уникальности,
+        # и ограничения-исключения
+        statement.on_conflict_do_nothing().returning(
+            Appointment.id,
+            Appointment.doctor_id,
+            Appointment.patient_name,
+            Appointment.start_time,
+            Appointment.duration_minutes,
+            Appointment.end_time,
+            Appointment.created_at,
+            Appointment.updated_at,
+        )
+    )
+    result.created = [dict(row._mapping) for row in inserted]
+    created_times = {as_utc(row["start_time"]) for row in result.created}
+    result.conflicts.extend(
+        (start_time, BUSY_REASON)
+        for start_time in free
+        if start_time not in created_times
+    )
+    result.created.sort(key=lambda row: as_utc(row["start_time"]))
+    result.conflicts.sort()
+    return result
+
+
 async def get_appointment(
     db: AsyncSession, appointment_id: int
-) -> Optional[Appointment]:
-    """Получить запись на прием по ID."""
-    result = await db.execute(
-        select(Appointment).where(Appointment.id == appointment_id)
-    )
-    return result.scalar_one_or_none()
+) -> Optional[AppointmentResponse]:
+    """
+    Получить запись на прием по ID в виде схемы ответа.
+
+    Одновременные чтения одной записи объединяются (app/crud/coalesce.py),
+    поэтому возвращается не ORM-объект сессии, а отвязанная от нее схема.
+    """
+
+    async def read() -> Optional[AppointmentResponse]:
+        result = await db.execute(
+            select(Appointment).where(Appointment.id == appointment_id)
+        )
+        appointment = result.scalar_one_or_none()
+        if appointment is None:
+            return None
+        return AppointmentResponse.model_validate(appointment)
+
+    return await coalesced_read(db, ("appointment", appointment_id), read)
 
 
 async def get_doctor_appointments(
     db: AsyncSession, doctor_id: int, start_time: datetime, end_time: datetime
-) -> list[Appointment]:
-    """Получить все записи врача в указанном временном диапазоне."""
-    result = await db.execute(
-        select(Appointment)
-        .where(
-            Appointment.doctor_id == doctor_id,
-            Appointment.start_time >= start_time,
-            Appointment.start_time < end_time,
+) -> list[AppointmentResponse]:
+    """
+    Получить все записи врача в указанном временном диапазоне.
+
+    Одновременные одинаковые чтения объединяются; каждый вызов получает
+    свою копию списка схем ответа (общих для всех ожидающих).
+    """
+
+    async def read() -> list[AppointmentResponse]:
+        result = await db.execute(
+            select(Appointment)
+            .where(
+                Appointment.doctor_id == doctor_id,
+                Appointment.start_time >= start_time,
+                Appointment.start_time < end_time,
+            )
+            .order_by(Appointment.start_time)
         )
-        .order_by(Appointment.start_time)
-    )
-    return list(result.scalars().all())
+        return [AppointmentResponse.model_validate(row) for row in result.scalars()]
+
+    key = ("doctor_appointments", doctor_id, start_time, end_time)
+    return list(await coalesced_read(db, key, read))
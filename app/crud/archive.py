@@ -0,0 +1,59 @@
+"""CRUD операции для архива прошедших записей."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment, AppointmentArchive
+
+ARCHIVED_COLUMNS = [
+    "id",
+    "doctor_id",
+    "patient_name",
+    "start_time",
+    "duration_minutes",
+    "end_time",
+    "created_at",
+    "updated_at",
+]
+
+
+async def archive_appointments_batch(
+    db: AsyncSession, cutoff: datetime, batch_size: int
+) -> int:
+    """
+    Перенести в архив до `batch_size` самых старых записей раньше `cutoff`.
+
+    Выборка идет по idx_appointments_start_time. Эта функция НЕ управляет
+    транзакциями - вызывающий код коммитит каждую пачку.
+    """
+    ids_result = await db.execute(
+        select(Appointment.id)
+        .where(Appointment.start_time < cutoff)
+        .order_by(Appointment.start_time)
+        .limit(batch_size)
+    )
+    ids = list(ids_result.scalars().all())
+    if not ids:
+        return 0
+
+    source_columns = [getattr(Appointment, column) for column in ARCHIVED_COLUMNS]
+    await db.execute(
+        insert(AppointmentArchive).from_select(
+            ARCHIVED_COLUMNS, select(*source_columns).where(Appointment.id.in_(ids))
+        )
+    )
+    await db.execute(delete(Appointment).where(Appointment.id.in_(ids)))
+    return len(ids)
+
+
+async def get_archived_appointment(
+    db: AsyncSession, appointment_id: int
+) -> Optional[AppointmentArchive]:
+    """Получить архивную запись по ID."""
+    result = await db.execute(
+        select(AppointmentArchive).where(AppointmentArchive.id == appointment_id)
+    )
+    return result.scalar_one_or_none()
@@ -0,0 +1,82 @@
+"""CRUD операции для очереди бронирований (booking_tickets)."""
+
+import secrets
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking_ticket import (
+    TICKET_FAILED,
+    TICKET_PENDING,
+    TICKET_SUCCEEDED,
+    BookingTicket,
+)
+from app.schemas.appointment import AppointmentCreate
+
+
+async def enqueue_booking(
+    db: AsyncSession, appointment: AppointmentCreate
+) -> BookingTicket:
+    """
+    Поставить бронирование в очередь.
+
+    Эта функция НЕ управляет транзакциями.
+    """
+    ticket = BookingTicket(
+        token=secrets.token_hex(16),
+        doctor_id=appointment.doctor_id,
+        patient_name=appointment.patient_name,
+        start_time=appointment.start_time,
+        duration_minutes=appointment.duration_minutes,
+        hold_token=appointment.hold_token,
+        telegram_chat_id=appointment.telegram_chat_id,
+        status=TICKET_PENDING,
+    )
+    db.add(ticket)
+    return ticket
+
+
+async def get_booking_ticket(db: AsyncSession, token: str) -> Optional[BookingTicket]:
+    """Получить заявку по токену."""
+    result = await db.execute(select(BookingTicket).where(BookingTicket.token == token))
+    return result.scalar_one_or_none()
+
+
+async def get_pending_tickets(
+    db: AsyncSession, shard: int, shards: int, limit: int
+) -> list[BookingTicket]:
+    """Необработанные заявки шарда (doctor_id % shards) в порядке поступления."""
+    result = await db.execute(
+        select(BookingTicket)
+        .where(
+            BookingTicket.status == TICKET_PENDING,
+            BookingTicket.doctor_id % shards == shard,
+        )
+        .order_by(BookingTicket.id)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+def mark_ticket_succeeded(ticket: BookingTicket, appointment_id: int) -> None:
+    """Отметить заявку выполненной."""
+    ticket.status = TICKET_SUCCEEDED
+    ticket.appointment_id = appointment_id
+    ticket.processed_at = datetime.now(timezone.utc)
+
+
+def mark_ticket_failed(ticket: BookingTicket, error: str) -> None:
+    """Отметить заявку отклоненной."""
+    ticket.status = TICKET_FAILED
+    ticket.error = error[:255]
+    ticket.processed_at = datetime.now(timezone.utc)
+
+
+async def prune_booking_tickets(db: AsyncSession, processed_before: datetime) -> int:
+    """Удалить обработанные заявки старше границы; вернуть их число."""
+    result = await db.execute(
+        delete(BookingTicket).where(BookingTicket.processed_at < processed_before)
+    )
+    return int(getattr(result, "rowcount", 0) or 0)
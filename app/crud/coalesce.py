@@ -0,0 +1,53 @@
+"""
+Объединение одинаковых одновременных чтений CRUD-слоя.
+
+Чтения с одинаковым ключом из разных сессий выполняются одним запросом,
+результат раздается всем ожидающим и должен использоваться только для
+чтения. Поэтому чтение возвращает данные, не привязанные к сессии (схемы
+ответа, кортежи), а не ORM-объекты: объект из сессии лидера в чужой сессии
+нельзя ни догрузить, ни обновить, а после закрытия сессии лидера он
+отсоединен. Сессия с незафиксированными изменениями не участвует в
+объединении: она должна видеть собственные записи.
+"""
+
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+_HAS_WRITES_KEY = "has_flushed_writes"
+
+read_flights = SingleFlight()
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_writes(session: Session, flush_context: Any) -> None:
+    session.info[_HAS_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    session.info.pop(_HAS_WRITES_KEY, None)
+
+
+def can_coalesce(db: AsyncSession) -> bool:
+    """Сессия без собственных незафиксированных изменений."""
+    if db.new or db.dirty or db.deleted:
+        return False
+    return db.info.get(_HAS_WRITES_KEY) is not True
+
+
+async def coalesced_read(
+    db: AsyncSession, key: tuple[Hashable, ...], read: Callable[[], Awaitable[T]]
+) -> T:
+    """Выполнить чтение через single-flight (ключ дополняется движком сессии)."""
+    if not can_coalesce(db):
+        return await read()
+    return await read_flights.do((id(db.get_bind()), *key), read)
@@ -1,11 +1,12 @@
 """CRUD операции для врачей."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.schedule import DEFAULT_VISIT_MINUTES, MAX_VISIT_MINUTES
 from app.models.appointment import Appointment
 from app.models.doctor import Doctor
 
@@ -21,11 +22,46 @@ async def get_doctor(
     return result.scalar_one_or_none()
 
 
-async def get_doctors(db: AsyncSession, active_only: bool = True) -> List[Doctor]:
-    """Получить список врачей."""
+def normalize_specialization(specialization: str) -> str:
+    """Ключ специализации: без регистра и лишних пробелов."""
+    return " ".join(specialization.split()).casefold()
+
+
+async def matching_specializations(db: AsyncSession, specialization: str) -> list[str]:
+    """
+    Написания специализации в БД с тем же ключом normalize_specialization.
+
+    Нормализация выполняется в Python, а не lower() СУБД: lower() в SQLite
+    меняет регистр только у ASCII и не схлопывает пробелы внутри строки.
+    Различных специализаций немного, DISTINCT читает только
+    idx_doctors_specialization.
+    """
+    key = normalize_specialization(specialization)
+    result = await db.execute(select(Doctor.specialization).distinct())
+    return [
+        spelling
+        for spelling in result.scalars().all()
+        if normalize_specialization(spelling) == key
+    ]
+
+
+async def get_doctors(
+    db: AsyncSession, active_only: bool = True, specialization: Optional[str] = None
+) -> List[Doctor]:
+    """
+    Получить список врачей.
+
+    Специализация сравнивается по normalize_specialization (без учета
+    регистра и лишних пробелов), как в справочнике врачей.
+    """
     query = select(Doctor)
     if active_only:
         query = query.where(Doctor.is_active)
+    if specialization is not None:
+        spellings = await matching_specializations(db, specialization)
+        if not spellings:
+            return []
+        query = query.where(Doctor.specialization.in_(spellings))
 
     result = await db.execute(query.order_by(Doctor.name))
     return list(result.scalars().all())
@@ -37,8 +73,29 @@ async def get_valid_doctor_ids(db: AsyncSession) -> set[int]:
     return set(result.scalars().all())
 
 
+def overlapping_appointments(
+    doctor_id: int, start_time: datetime, end_time: datetime
+) -> Select[tuple[Appointment]]:
+    """
+    Записи врача, пересекающиеся с [start_time, end_time).
+
+    Диапазон по unique_doctor_time ограничен снизу самым длинным приемом,
+    поэтому проверка - O(log n) независимо от истории врача.
+    """
+    return select(Appointment).where(
+        Appointment.doctor_id == doctor_id,
+        Appointment.start_time > start_time - timedelta(minutes=MAX_VISIT_MINUTES),
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time,
+    )
+
+
 async def check_doctor_availability(
-    db: AsyncSession, doctor_id: int, start_time: datetime
+    db: AsyncSession,
+    doctor_id: int,
+    start_time: datetime,
+    lock: bool = True,
+    duration_minutes: int = DEFAULT_VISIT_MINUTES,
 ) -> tuple[bool, Optional[Doctor]]:
     """
     Проверить доступность врача с блокировкой для предотвращения race condition.
@@ -46,24 +103,29 @@ async def check_doctor_availability(
     Возвращает (is_available, doctor) где:
     - is_available: True если врач доступен, False если занят
     - doctor: объект врача или None если врач не найден/неактивен
+
+    lock=False - без FOR UPDATE, для вызывающего кода, который сам
+    сериализует бронирования врача (воркер очереди бронирований).
     """
     # Сначала проверяем и блокируем врача
-    doctor_result = await db.execute(
-        select(Doctor)
-        .where(Doctor.id == doctor_id, Doctor.is_active.is_(True))
-        .with_for_update()  # Блокируем врача для предотвращения race condition
+    doctor_query = select(Doctor).where(
+        Doctor.id == doctor_id, Doctor.is_active.is_(True)
     )
+    if lock:
+        # Блокируем врача для предотвращения race condition
+        doctor_query = doctor_query.with_for_update()
+    doctor_result = await db.execute(doctor_query)
     doctor = doctor_result.scalar_one_or_none()
 
     if doctor is None:
         return False, None
 
-    # Проверяем, нет ли конфликтующих записей (с блокировкой)
-    existing_appointment = await db.execute(
-        select(Appointment)
-        .where(Appointment.doctor_id == doctor_id, Appointment.start_time == start_time)
-        .with_for_update()  # Блокируем существующие записи
-    )
+    # Проверяем, нет ли пересекающихся записей (с блокировкой)
+    end_time = start_time + timedelta(minutes=duration_minutes)
+    conflict_query = overlapping_appointments(doctor_id, start_time, end_time)
+    if lock:
+        conflict_query = conflict_query.with_for_update()  # Блокируем записи
+    existing_appointment = await db.execute(conflict_query.limit(1))
 
     if existing_appointment.scalar_one_or_none() is not None:
         return False, doctor
@@ -0,0 +1,109 @@
+"""CRUD операции для напоминаний о приеме."""
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.appointment import Appointment
+
+
+@dataclass(frozen=True)
+class DueReminder:
+    """Запись, по которой нужно отправить напоминание."""
+
+    appointment_id: int
+    doctor_id: int
+    patient_name: str
+    start_time: datetime
+    telegram_chat_id: Optional[int]
+
+
+async def claim_due_reminders(
+    db: AsyncSession,
+    window_start: datetime,
+    window_end: datetime,
+    batch_size: int,
+    now: datetime,
+) -> list[DueReminder]:
+    """
+    Забрать до `batch_size` записей окна [window_start, window_end) без отметки.
+
+    Пачка выбирается диапазоном по idx_appointments_start_time и одним
+    UPDATE ... RETURNING помечается `reminder_sent_at = now`, поэтому другой
+    процесс ее уже не возьмет. В PostgreSQL строки, занятые параллельным
+    проходом, пропускаются (SKIP LOCKED). Эта функция НЕ управляет
+    транзакциями.
+    """
+    due = (
+        select(Appointment.id)
+        .where(
+            Appointment.start_time >= window_start,
+            Appointment.start_time < window_end,
+            Appointment.reminder_sent_at.is_(None),
+        )
+        .order_by(Appointment.start_time)
+        .limit(batch_size)
+    )
+    # get_bind по модели работает и для сессий с binds= (db.bind там нет)
+    if db.get_bind(Appointment).dialect.name == "postgresql":
+        due = due.with_for_update(skip_locked=True)
+
+    result = await db.execute(
+        update(Appointment)
+        .where(
+            Appointment.id.in_(due.scalar_subquery()),
+            # Диапазон повторяется для отсечения секций в PostgreSQL
+            Appointment.start_time >= window_start,
+            Appointment.start_time < window_end,
+        )
+        .values(reminder_sent_at=now)
+        .returning(
+            Appointment.id,
+            Appointment.doctor_id,
+            Appointment.patient_name,
+            Appointment.start_time,
+            Appointment.telegram_chat_id,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    reminders = []
+    for appointment_id, doctor_id, patient_name, start_time, chat_id in result:
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        reminders.append(
+            DueReminder(appointment_id, doctor_id, patient_name, start_time, chat_id)
+        )
+    reminders.sort(key=lambda reminder: reminder.start_time)
+    return reminders
+
+
+async def release_reminders(
+    db: AsyncSession, appointment_ids: list[int], max_attempts: int
+) -> int:
+    """
+    Учесть неудачную отправку и снять отметку - напоминание уйдет в следующий проход.
+
+    На `max_attempts`-й неудаче отметка остается, и напоминание больше не
+    отправляется. Возвращает число напоминаний, оставленных без повтора.
+    Эта функция НЕ управляет транзакциями.
+    """
+    if not appointment_ids:
+        return 0
+    attempts = Appointment.reminder_attempts + 1
+    result = await db.execute(
+        update(Appointment)
+        .where(Appointment.id.in_(appointment_ids))
+        .values(
+            reminder_attempts=attempts,
+            reminder_sent_at=case(
+                (attempts >= max_attempts, Appointment.reminder_sent_at),
+                else_=None,
+            ),
+        )
+        .returning(Appointment.reminder_sent_at)
+        .execution_options(synchronize_session=False)
+    )
+    return sum(1 for (sent_at,) in result if sent_at is not None)
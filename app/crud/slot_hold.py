@@ -0,0 +1,98 @@
+"""CRUD операции для удержаний слотов."""
+
+import secrets
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import SLOT_MINUTES
+from app.crud.doctor import check_doctor_availability
+from app.db.dialect import upsert_insert
+from app.models.slot_hold import SlotHold
+
+
+async def create_slot_hold(
+    db: AsyncSession, doctor_id: int, start_time: datetime, ttl_seconds: float
+) -> SlotHold:
+    """
+    Удержать слот врача на ttl_seconds.
+
+    Истекшее удержание того же слота перезаписывается одним UPSERT,
+    действующее - нет. Эта функция НЕ управляет транзакциями.
+    """
+    is_available, doctor = await check_doctor_availability(
+        db, doctor_id, start_time, lock=False
+    )
+    if doctor is None:
+        raise ValueError(f"Врач с ID {doctor_id} не найден или неактивен")
+    if not is_available:
+        raise ValueError("Врач уже занят в это время")
+
+    now = datetime.now(timezone.utc)
+    values = {
+        "doctor_id": doctor_id,
+        "start_time": start_time,
+        "token": secrets.token_hex(16),
+        "expires_at": now + timedelta(seconds=ttl_seconds),
+        "created_at": now,
+    }
+    statement = upsert_insert(db, SlotHold).values(**values)
+    result = await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[SlotHold.doctor_id, SlotHold.start_time],
+            set_={
+                "token": statement.excluded.token,
+                "expires_at": statement.excluded.expires_at,
+                "created_at": statement.excluded.created_at,
+            },
+            where=SlotHold.expires_at <= now,
+        ).returning(SlotHold.token)
+    )
+    if result.first() is None:
+        raise ValueError("Слот временно удерживается другим пациентом")
+    return SlotHold(**values)
+
+
+async def get_active_slot_holds(
+    db: AsyncSession, doctor_id: int, start_time: datetime, end_time: datetime
+) -> list[SlotHold]:
+    """Действующие удержания слотов (по SLOT_MINUTES), пересекающих прием."""
+    result = await db.execute(
+        select(SlotHold).where(
+            SlotHold.doctor_id == doctor_id,
+            SlotHold.start_time > start_time - timedelta(minutes=SLOT_MINUTES),
+            SlotHold.start_time < end_time,
+            SlotHold.expires_at > datetime.now(timezone.utc),
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def release_slot_hold(db: AsyncSession, token: str) -> bool:
+    """Снять удержание по токену; False, если его нет."""
+    result = await db.execute(
+        delete(SlotHold).where(SlotHold.token == token).returning(SlotHold.token)
+    )
+    return result.first() is not None
+
+
+async def delete_slot_holds(
+    db: AsyncSession, tokens: Iterable[str], now: datetime
+) -> int:
+    """Удалить истекшие удержания по токенам (точечно, по уникальному индексу)."""
+    result = await db.execute(
+        delete(SlotHold)
+        .where(SlotHold.token.in_(list(tokens)), SlotHold.expires_at <= now)
+        .returning(SlotHold.token)
+    )
+    return len(result.all())
+
+
+async def delete_expired_slot_holds(db: AsyncSession, before: datetime) -> int:
+    """Удалить все удержания, истекшие до `before` (по idx_slot_holds_expires_at)."""
+    result = await db.execute(
+        delete(SlotHold).where(SlotHold.expires_at < before).returning(SlotHold.token)
+    )
+    return len(result.all())
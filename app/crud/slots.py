@@ -0,0 +1,59 @@
+"""CRUD операции для поиска свободных слотов."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import MAX_VISIT_MINUTES, SLOT_MINUTES
+from app.crud.appointment import as_utc
+from app.crud.coalesce import coalesced_read
+from app.models.appointment import Appointment
+from app.models.slot_hold import SlotHold
+
+Interval = tuple[datetime, datetime]
+
+
+async def get_busy_intervals(
+    db: AsyncSession, doctor_ids: tuple[int, ...], start: datetime, end: datetime
+) -> dict[int, tuple[Interval, ...]]:
+    """
+    Занятые интервалы врачей, пересекающие [start, end): записи и действующие
+    удержания (удержание занимает SLOT_MINUTES).
+
+    Один запрос по unique_doctor_time и один по PK удержаний на всех врачей.
+    Одновременные одинаковые чтения объединяются; результат только для чтения.
+    """
+
+    async def read() -> dict[int, tuple[Interval, ...]]:
+        booked = await db.execute(
+            select(
+                Appointment.doctor_id, Appointment.start_time, Appointment.end_time
+            ).where(
+                Appointment.doctor_id.in_(doctor_ids),
+                Appointment.start_time > start - timedelta(minutes=MAX_VISIT_MINUTES),
+                Appointment.start_time < end,
+                Appointment.end_time > start,
+            )
+        )
+        held = await db.execute(
+            select(SlotHold.doctor_id, SlotHold.start_time).where(
+                SlotHold.doctor_id.in_(doctor_ids),
+                SlotHold.start_time > start - timedelta(minutes=SLOT_MINUTES),
+                SlotHold.start_time < end,
+                SlotHold.expires_at > datetime.now(timezone.utc),
+            )
+        )
+        busy: dict[int, list[Interval]] = {}
+        for doctor_id, start_time, end_time in booked.all():
+            busy.setdefault(doctor_id, []).append(
+                (as_utc(start_time), as_utc(end_time))
+            )
+        for doctor_id, start_time in held.all():
+            hold_start = as_utc(start_time)
+            busy.setdefault(doctor_id, []).append(
+                (hold_start, hold_start + timedelta(minutes=SLOT_MINUTES))
+            )
+        return {doctor_id: tuple(items) for doctor_id, items in busy.items()}
+
+    return await coalesced_read(db, ("busy_intervals", doctor_ids, start, end), read)
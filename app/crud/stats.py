@@ -0,0 +1,166 @@
+"""CRUD операции для агрегатов загрузки врачей."""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import clinic_day
+from app.db.dialect import upsert_insert
+from app.models.appointment import Appointment, AppointmentArchive
+from app.models.doctor import Doctor
+from app.models.stats import DoctorDailyStats
+
+
+@dataclass(frozen=True)
+class DailyLoad:
+    """Загрузка за день: число записей и занятые ими минуты."""
+
+    appointments: int = 0
+    booked_minutes: int = 0
+
+
+async def increment_doctor_daily_stats(
+    db: AsyncSession, doctor_id: int, visits: Iterable[tuple[datetime, int]]
+) -> None:
+    """
+    Учесть новые записи врача в дневных агрегатах (один UPSERT на вызов).
+
+    `visits` - пары (начало, длительность в минутах). Вызывается в транзакции
+    бронирования. Блокировка врача не требуется (серии и очередь бронирования
+    вызывают функцию без нее): UPSERT с `appointments_count =
+    appointments_count + excluded` атомарен, и конкурирующие транзакции
+    не теряют приращений друг друга.
+    Эта функция НЕ управляет транзакциями.
+    """
+    counts: Counter[date] = Counter()
+    minutes: Counter[date] = Counter()
+    for start_time, duration_minutes in visits:
+        day = clinic_day(start_time)
+        counts[day] += 1
+        minutes[day] += duration_minutes
+    if not counts:
+        return
+
+    statement = upsert_insert(db, DoctorDailyStats).values(
+        [
+            {
+                "doctor_id": doctor_id,
+                "day": day,
+                "appointments_count": count,
+                "booked_minutes": minutes[day],
+            }
+            for day, count in counts.items()
+        ]
+    )
+    await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[DoctorDailyStats.doctor_id, DoctorDailyStats.day],
+            set_={
+                "appointments_count": DoctorDailyStats.appointments_count
+                + statement.excluded.appointments_count,
+                "booked_minutes": DoctorDailyStats.booked_minutes
+                + statement.excluded.booked_minutes,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def get_doctor_daily_stats(
+    db: AsyncSession,
+    date_from: date,
+    date_to: date,
+    doctor_ids: Optional[list[int]] = None,
+) -> dict[tuple[int, date], DailyLoad]:
+    """Загрузка по (врач, день) за период включительно."""
+    query = select(
+        DoctorDailyStats.doctor_id,
+        DoctorDailyStats.day,
+        DoctorDailyStats.appointments_count,
+        DoctorDailyStats.booked_minutes,
+    ).where(DoctorDailyStats.day >= date_from, DoctorDailyStats.day <= date_to)
+    if doctor_ids is not None:
+        query = query.where(DoctorDailyStats.doctor_id.in_(doctor_ids))
+
+    result = await db.execute(query)
+    return {
+        (doctor_id, day): DailyLoad(count, minutes)
+        for doctor_id, day, count, minutes in result.all()
+    }
+
+
+async def get_specialization_daily_stats(
+    db: AsyncSession, date_from: date, date_to: date
+) -> dict[tuple[str, date], DailyLoad]:
+    """Загрузка по (специализация, день) среди активных врачей."""
+    result = await db.execute(
+        select(
+            Doctor.specialization,
+            DoctorDailyStats.day,
+            func.sum(DoctorDailyStats.appointments_count),
+            func.sum(DoctorDailyStats.booked_minutes),
+        )
+        .join(Doctor, Doctor.id == DoctorDailyStats.doctor_id)
+        .where(
+            Doctor.is_active,
+            DoctorDailyStats.day >= date_from,
+            DoctorDailyStats.day <= date_to,
+        )
+        .group_by(Doctor.specialization, DoctorDailyStats.day)
+    )
+    return {
+        (spec, day): DailyLoad(int(count), int(minutes))
+        for spec, day, count, minutes in result.all()
+    }
+
+
+async def rebuild_doctor_daily_stats(db: AsyncSession) -> int:
+    """
+    Пересчитать агрегаты с нуля по appointments и архиву.
+
+    Нужен для первичного заполнения (например, после benchmarks.datagen).
+    День определяется по времени клиники в Python, чтобы не зависеть от
+    поддержки timezone в СУБД. Возвращает число строк агрегата.
+
+    Записи, закоммиченные между чтением и заменой агрегата, потеряли бы свое
+    приращение, поэтому запись в таблицы записей блокируется до конца
+    транзакции: в PostgreSQL - LOCK TABLE ... IN SHARE MODE (ждет идущие
+    бронирования и задерживает новые, на каком бы пути они ни шли), в SQLite
+    DELETE до чтения берет единственную блокировку записи базы.
+    Эта функция НЕ управляет транзакциями.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(
+            text("LOCK TABLE appointments, appointments_archive IN SHARE MODE")
+        )
+    await db.execute(delete(DoctorDailyStats))
+
+    counts: Counter[tuple[int, date]] = Counter()
+    minutes: Counter[tuple[int, date]] = Counter()
+    for model in (Appointment, AppointmentArchive):
+        rows = await db.stream(
+            select(model.doctor_id, model.start_time, model.duration_minutes)
+        )
+        async for doctor_id, start_time, duration_minutes in rows:
+            key = (doctor_id, clinic_day(start_time))
+            counts[key] += 1
+            minutes[key] += duration_minutes
+
+    if counts:
+        await db.execute(
+            upsert_insert(db, DoctorDailyStats),
+            [
+                {
+                    "doctor_id": doctor_id,
+                    "day": day,
+                    "appointments_count": count,
+                    "booked_minutes": minutes[(doctor_id, day)],
+                }
+                for (doctor_id, day), count in counts.items()
+            ],
+        )
+    return len(counts)
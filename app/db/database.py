@@ -1,21 +1,60 @@
 """Конфигурация базы данных."""
 
-from typing import AsyncGenerator
+from functools import lru_cache
+from typing import Any, AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
-from app.core.settings import settings
+from app.core.settings import get_settings
 
-# Создаем асинхронный движок
-engine = create_async_engine(settings.database_url)
-AsyncSessionLocal = async_sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    expire_on_commit=False,
-    bind=engine,
-    class_=AsyncSession,
-)
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    """
+    Получить асинхронный движок.
+
+    Движок (и драйвер БД) создается при первом обращении, поэтому импорт
+    моделей и приложения не открывает пул и не загружает asyncpg.
+    """
+    return create_async_engine(get_settings().database_url)
+
+
+@lru_cache
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Получить фабрику сессий, привязанную к движку."""
+    return async_sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=get_engine(),
+        class_=AsyncSession,
+    )
+
+
+async def dispose_engine() -> bool:
+    """Закрыть пул соединений, если движок уже был создан."""
+    if get_engine.cache_info().currsize == 0:
+        return False
+
+    await get_engine().dispose()
+    get_sessionmaker.cache_clear()
+    get_engine.cache_clear()
+    return True
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый доступ к `engine` и `AsyncSessionLocal` для обратной совместимости."""
+    if name == "engine":
+        return get_engine()
+    if name == "AsyncSessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Base(DeclarativeBase):
@@ -26,7 +65,7 @@ class Base(DeclarativeBase):
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Получить асинхронную сессию базы данных."""
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
         finally:
@@ -0,0 +1,29 @@
+"""Вспомогательные функции для диалектно-зависимых конструкций."""
+
+from typing import TYPE_CHECKING, Any, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from sqlalchemy.dialects.postgresql import Insert as PostgresInsert
+    from sqlalchemy.dialects.sqlite import Insert as SqliteInsert
+
+
+def upsert_insert(
+    db: AsyncSession, table: Any
+) -> Union["PostgresInsert", "SqliteInsert"]:
+    """
+    INSERT с поддержкой ON CONFLICT для диалекта сессии.
+
+    PostgreSQL и SQLite поддерживают одинаковые on_conflict_do_update /
+    on_conflict_do_nothing, различается только конструктор. Диалекты
+    импортируются при вызове, чтобы не тянуть драйверы при старте процесса.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects import postgresql
+
+        return postgresql.insert(table)
+
+    from sqlalchemy.dialects import sqlite
+
+    return sqlite.insert(table)
@@ -0,0 +1,70 @@
+"""Обслуживание помесячных секций таблицы appointments (PostgreSQL)."""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment: datetime) -> datetime:
+    """Начало месяца (UTC), в который попадает момент."""
+    utc = moment.astimezone(timezone.utc)
+    return utc.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(moment: datetime) -> str:
+    """Имя секции месяца, как его формирует ensure_appointments_partitions."""
+    start = month_start(moment)
+    return f"appointments_y{start.year:04d}m{start.month:02d}"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Секционирована ли таблица appointments (только PostgreSQL)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    relkind = await conn.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass('appointments')")
+    )
+    return bool(relkind == "p")
+
+
+async def ensure_partitions(engine: AsyncEngine, months_ahead: int) -> list[str]:
+    """
+    Создать секции на текущий и `months_ahead` следующих месяцев.
+
+    Для несекционированной таблицы (или не PostgreSQL) ничего не делает.
+    Возвращает имена созданных секций.
+    """
+    async with engine.begin() as conn:
+        if not await is_partitioned(conn):
+            logger.warning(
+                "appointments не секционирована: примените "
+                "sql/partition_appointments.sql"
+            )
+            return []
+
+        result = await conn.execute(
+            text("SELECT ensure_appointments_partitions(:months_ahead)"),
+            {"months_ahead": months_ahead},
+        )
+        created = list(result.scalars().all())
+
+    if created:
+        logger.info(f"Созданы секции appointments: {', '.join(created)}")
+    return created
+
+
+async def run_partition_maintenance(
+    engine: AsyncEngine, months_ahead: int, interval_seconds: float
+) -> None:
+    """Фоновая задача: периодически создавать секции будущих месяцев."""
+    while True:
+        try:
+            await ensure_partitions(engine, months_ahead)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Ошибка обслуживания секций appointments: {e}")
+        await asyncio.sleep(interval_seconds)
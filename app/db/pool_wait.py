@@ -0,0 +1,85 @@
+"""
+Учет времени ожидания соединения из пула.
+
+Сессия берет соединение при первом запросе в транзакции. Время от этого
+запроса (`do_orm_execute`) до начала транзакции на полученном соединении
+(`after_begin`) - это ожидание пула плюс BEGIN; под нагрузкой оно почти
+целиком состоит из ожидания свободного соединения.
+
+Без новых замеров значение затухает со временем (период полураспада
+`half_life_seconds`): иначе всплеск ожидания держал бы контроль допуска в
+режиме перегрузки, пока не придет следующий запрос к БД, а его как раз
+отбрасывают.
+"""
+
+import math
+import time
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+_STARTED_KEY = "pool_wait_started"
+
+
+class PoolWaitTracker:
+    """Экспоненциально сглаженное время ожидания пула, секунды."""
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        half_life_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.alpha = alpha
+        self.half_life_seconds = half_life_seconds
+        self.clock = clock
+        self.samples = 0
+        self._value = 0.0
+        self._recorded_at = clock()
+
+    @property
+    def value(self) -> float:
+        """Сглаженное значение с затуханием с момента последнего замера."""
+        elapsed = self.clock() - self._recorded_at
+        if elapsed <= 0 or self.half_life_seconds <= 0:
+            return self._value
+        return self._value * math.pow(0.5, elapsed / self.half_life_seconds)
+
+    def record(self, seconds: float) -> None:
+        """Учесть одно ожидание."""
+        if self.samples == 0:
+            self._value = seconds
+        else:
+            current = self.value
+            self._value = current + self.alpha * (seconds - current)
+        self._recorded_at = self.clock()
+        self.samples += 1
+
+    def reset(self) -> None:
+        """Сбросить накопленное значение."""
+        self._value = 0.0
+        self._recorded_at = self.clock()
+        self.samples = 0
+
+
+pool_wait_tracker = PoolWaitTracker()
+
+
+def _on_execute(state: ORMExecuteState) -> None:
+    session = state.session
+    if not session.in_transaction():
+        session.info[_STARTED_KEY] = time.perf_counter()
+
+
+def _on_begin(session: Session, transaction: Any, connection: Any) -> None:
+    started = session.info.pop(_STARTED_KEY, None)
+    if started is not None:
+        pool_wait_tracker.record(time.perf_counter() - started)
+
+
+def install_pool_wait_tracking() -> None:
+    """Подписаться на события сессий (повторный вызов ничего не делает)."""
+    if not event.contains(Session, "do_orm_execute", _on_execute):
+        event.listen(Session, "do_orm_execute", _on_execute)
+        event.listen(Session, "after_begin", _on_begin)
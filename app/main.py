@@ -1,24 +1,110 @@
 """Основное FastAPI приложение."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
 
 from fastapi import FastAPI
 
 from app.api.appointments import router as appointments_router
-from app.core.settings import settings
-from app.db.database import engine
-
-# Настройка логирования
-log_level = logging.DEBUG if settings.debug else logging.INFO
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+from app.api.doctors import router as doctors_router
+from app.api.holds import router as holds_router
+from app.api.metrics import router as metrics_router
+from app.api.slots import router as slots_router
+from app.api.stats import router as stats_router
+from app.core.admission import AdmissionController, AdmissionControlMiddleware
+from app.core.settings import Settings, get_settings
+from app.db.database import dispose_engine, get_engine, get_sessionmaker
+from app.db.partitioning import run_partition_maintenance
+from app.db.pool_wait import install_pool_wait_tracking
+from app.maintenance.archive import run_archive_maintenance
+from app.services.booking_queue import run_booking_worker
+from app.services.reminders import create_reminder_sender, run_reminder_scheduler
+from app.services.slot_holds import get_slot_hold_expirer
+
 logger = logging.getLogger(__name__)
 
 
+def configure_logging(settings: Settings) -> None:
+    """Настройка логирования."""
+    log_level = logging.DEBUG if settings.debug else logging.INFO
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+
+def start_background_tasks(settings: Settings) -> list[asyncio.Task[None]]:
+    """Запустить фоновые задачи обслуживания, включенные в настройках."""
+    tasks: list[asyncio.Task[None]] = []
+    if settings.appointments_partitioning:
+        tasks.append(
+            asyncio.create_task(
+                run_partition_maintenance(
+                    get_engine(),
+                    settings.partition_months_ahead,
+                    settings.partition_maintenance_interval_seconds,
+                ),
+                name="partition-maintenance",
+            )
+        )
+    if settings.archive_enabled:
+        tasks.append(
+            asyncio.create_task(
+                run_archive_maintenance(
+                    get_sessionmaker(),
+                    settings.archive_after_days,
+                    settings.archive_batch_size,
+                    settings.archive_pause_seconds,
+                    settings.archive_interval_seconds,
+                ),
+                name="archive-maintenance",
+            )
+        )
+    if settings.booking_queue_enabled:
+        for shard in range(settings.booking_queue_shards):
+            tasks.append(
+                asyncio.create_task(
+                    run_booking_worker(
+                        get_engine(),
+                        get_sessionmaker(),
+                        shard,
+                        settings.booking_queue_shards,
+                        settings.booking_queue_batch_size,
+                        settings.booking_queue_max_attempts,
+                        settings.booking_queue_poll_interval_seconds,
+                        settings.booking_ticket_retention_hours,
+                    ),
+                    name=f"booking-worker-{shard}",
+                )
+            )
+    if settings.reminders_enabled:
+        tasks.append(
+            asyncio.create_task(
+                run_reminder_scheduler(
+                    get_sessionmaker(),
+                    create_reminder_sender(settings),
+                    settings.reminder_lead_minutes,
+                    settings.reminder_batch_size,
+                    settings.reminder_concurrency,
+                    settings.reminder_max_attempts,
+                    settings.reminder_interval_seconds,
+                ),
+                name="reminder-scheduler",
+            )
+        )
+    return tasks
+
+
+async def stop_background_tasks(tasks: list[asyncio.Task[None]]) -> None:
+    """Остановить фоновые задачи."""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Менеджер жизненного цикла приложения."""
@@ -27,50 +113,94 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Схема создается через init.sql в Docker Compose
     logger.info("Application started (database schema managed by init.sql)")
+    background_tasks = start_background_tasks(get_settings())
 
     yield
 
     # Корректно закрываем пул соединений для production.
     logger.info("Shutting down application...")
+    await stop_background_tasks(background_tasks)
+    await get_slot_hold_expirer().stop()
     try:
-        await engine.dispose()
-        logger.info("Database connections closed")
+        if await dispose_engine():
+            logger.info("Database connections closed")
     except Exception as e:  # noqa: BLE001
         logger.error(f"Error during engine dispose: {e}")
 
 
-app = FastAPI(
-    title="Clinic Appointments",
-    description="Микросервис для записи пациентов на прием к врачам",
-    version="1.0.0",
-    lifespan=lifespan,
-    redirect_slashes=False,
-    debug=settings.debug,
-)
-
-# Подключение роутеров
-
-app.include_router(appointments_router)
-
-
-@app.get("/health")
 def health_check() -> dict[str, str]:
     """Эндпоинт проверки."""
     return {"status": "healthy"}
 
 
-@app.get("/")
 def root() -> dict[str, str]:
     """Корневой эндпоинт."""
     return {"message": "Clinic Appointments API"}
 
 
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Фабрика приложения.
+
+    Движок БД здесь не создается: пул открывается при первом запросе
+    к базе, поэтому старт процесса и /health не зависят от БД.
+    """
+    settings = settings or get_settings()
+    configure_logging(settings)
+
+    application = FastAPI(
+        title="Clinic Appointments",
+        description="Микросервис для записи пациентов на прием к врачам",
+        version="1.0.0",
+        lifespan=lifespan,
+        redirect_slashes=False,
+        debug=settings.debug,
+    )
+
+    if settings.admission_enabled:
+        install_pool_wait_tracking()
+        controller = AdmissionController.from_settings(settings)
+        application.state.admission_controller = controller
+        application.add_middleware(
+            AdmissionControlMiddleware,
+            controller=controller,
+            client_header=settings.admission_client_header,
+        )
+
+    # Подключение роутеров
+    application.include_router(appointments_router)
+    application.include_router(doctors_router)
+    application.include_router(holds_router)
+    application.include_router(slots_router)
+    application.include_router(stats_router)
+    application.include_router(metrics_router)
+
+    application.add_api_route("/health", health_check, methods=["GET"])
+    application.add_api_route("/", root, methods=["GET"])
+
+    return application
+
+
+@lru_cache
+def get_app() -> FastAPI:
+    """Приложение процесса (собирается при первом обращении)."""
+    return create_app()
+
+
+def __getattr__(name: str) -> Any:
+    """Ленивый доступ к `app` для обратной совместимости."""
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     import uvicorn
 
     uvicorn.run(
-        app,
+        "app.main:create_app",
+        factory=True,
         host="0.0.0.0",
         port=8000,
-        log_level="debug" if settings.debug else "info",
+        log_level="debug" if get_settings().debug else "info",
     )
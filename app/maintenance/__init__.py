@@ -0,0 +1 @@
+"""Фоновые задачи и CLI обслуживания базы данных."""
@@ -0,0 +1,130 @@
+"""
+Перенос прошедших записей в архив (appointments -> appointments_archive).
+
+Записи старше заданного возраста переносятся пачками, каждая пачка - в своей
+транзакции, с паузой между пачками, чтобы не мешать бронированиям. После
+переноса выполняется ANALYZE, чтобы планировщик знал о новом размере таблиц.
+
+Пример:
+    python -m app.maintenance.archive --older-than-days 365 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.settings import get_settings
+from app.crud.archive import archive_appointments_batch
+from app.db.database import dispose_engine, get_sessionmaker
+from app.models.appointment import Appointment
+
+logger = logging.getLogger(__name__)
+
+
+async def analyze_tables(db: AsyncSession) -> None:
+    """
+    Обновить статистику планировщика для appointments и архива.
+
+    Подключение выбирается по модели Appointment, как и в CRUD: у сессии
+    с binds= нет общего db.bind.
+    """
+    bind_arguments = {"mapper": Appointment}
+    if db.get_bind(Appointment).dialect.name == "postgresql":
+        statement = text("ANALYZE appointments, appointments_archive")
+    else:
+        statement = text("ANALYZE")
+    await db.execute(statement, bind_arguments=bind_arguments)
+    await db.commit()
+
+
+async def archive_old_appointments(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    older_than_days: int,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Перенести в архив записи старше `older_than_days` дней; вернуть их число."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    archived = 0
+    batches = 0
+
+    async with sessionmaker() as db:
+        while max_batches is None or batches < max_batches:
+            try:
+                moved = await archive_appointments_batch(db, cutoff, batch_size)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            logger.info(f"Перенесено в архив: {moved} (всего {archived})")
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
+
+        if archived:
+            await analyze_tables(db)
+
+    logger.info(f"Архивация завершена: {archived} записей старше {cutoff.isoformat()}")
+    return archived
+
+
+async def run_archive_maintenance(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    older_than_days: int,
+    batch_size: int,
+    pause_seconds: float,
+    interval_seconds: float,
+) -> None:
+    """Фоновая задача: периодически архивировать прошедшие записи."""
+    while True:
+        try:
+            await archive_old_appointments(
+                sessionmaker, older_than_days, batch_size, pause_seconds
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Ошибка архивации записей: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Архивация прошедших записей")
+    parser.add_argument(
+        "--older-than-days", type=int, default=settings.archive_after_days
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.archive_pause_seconds)
+    parser.add_argument("--max-batches", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[list[str]] = None) -> None:
+    """Точка входа CLI."""
+    args = parse_args(argv)
+    try:
+        archived = await archive_old_appointments(
+            get_sessionmaker(),
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            max_batches=args.max_batches,
+        )
+        print(f"Перенесено в архив: {archived}")
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
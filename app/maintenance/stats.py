@@ -0,0 +1,34 @@
+"""
+Пересчет агрегатов загрузки врачей (doctor_daily_stats) с нуля.
+
+Агрегаты поддерживаются инкрементально при бронировании; пересчет нужен
+для первичного заполнения и после массовой загрузки данных в обход API.
+
+Пример:
+    python -m app.maintenance.stats
+"""
+
+import asyncio
+import logging
+
+from app.crud.stats import rebuild_doctor_daily_stats
+from app.db.database import dispose_engine, get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Точка входа CLI."""
+    try:
+        async with get_sessionmaker()() as db:
+            rows = await rebuild_doctor_daily_stats(db)
+            await db.commit()
+        logger.info(f"Агрегаты загрузки пересчитаны: {rows} строк")
+        print(f"Строк агрегата: {rows}")
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
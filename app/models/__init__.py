@@ -1,5 +1,16 @@
 """Модуль моделей."""
 
-from .appointment import Appointment
+from .appointment import Appointment, AppointmentArchive
+from .booking_ticket import BookingTicket
+from .doctor import Doctor
+from .slot_hold import SlotHold
+from .stats import DoctorDailyStats
 
-__all__ = ["Appointment"]
+__all__ = [
+    "Appointment",
+    "AppointmentArchive",
+    "BookingTicket",
+    "Doctor",
+    "DoctorDailyStats",
+    "SlotHold",
+]
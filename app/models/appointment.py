@@ -1,21 +1,35 @@
 """Модель записи на прием."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     DateTime,
     ForeignKey,
     Index,
     Integer,
+    SmallInteger,
     String,
     UniqueConstraint,
+    event,
     func,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.core.schedule import DEFAULT_VISIT_MINUTES, MAX_VISIT_MINUTES
 from app.db.database import Base
 
 
+def default_end_time(context: Any) -> datetime:
+    """Окончание приема по умолчанию: start_time + duration_minutes."""
+    params = context.get_current_parameters()
+    duration = params.get("duration_minutes") or DEFAULT_VISIT_MINUTES
+    start_time: datetime = params["start_time"]
+    return start_time + timedelta(minutes=duration)
+
+
 class Appointment(Base):
     """Модель записи на прием."""
 
@@ -32,6 +46,15 @@ class Appointment(Base):
     start_time: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, index=True
     )
+    duration_minutes: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=DEFAULT_VISIT_MINUTES,
+        server_default=str(DEFAULT_VISIT_MINUTES),
+    )
+    end_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=default_end_time
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -40,9 +63,68 @@ class Appointment(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    # Канал напоминания (чат Telegram) и отметка об отправленном напоминании
+    telegram_chat_id: Mapped[Optional[int]] = mapped_column(BigInteger)
+    reminder_sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True)
+    )
+    reminder_attempts: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=0, server_default="0"
+    )
 
     __table_args__ = (
         UniqueConstraint("doctor_id", "start_time", name="unique_doctor_time"),
         Index("idx_appointments_doctor_id", "doctor_id"),
         Index("idx_appointments_start_time", "start_time"),
     )
+
+
+class AppointmentArchive(Base):
+    """Архив прошедших записей на прием (перенесенных из appointments)."""
+
+    __tablename__ = "appointments_archive"
+
+    # ID сохраняется из appointments, чтобы GET /appointments/{id} работал прозрачно
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    doctor_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    patient_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    start_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    duration_minutes: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=DEFAULT_VISIT_MINUTES,
+        server_default=str(DEFAULT_VISIT_MINUTES),
+    )
+    end_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=default_end_time
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_appointments_archive_doctor_id", "doctor_id"),
+        Index("idx_appointments_archive_start_time", "start_time"),
+    )
+
+
+# В PostgreSQL пересечения приемов врача отсекает ограничение-исключение
+# appointments_no_overlap (init.sql). В SQLite (тесты) его заменяет триггер
+# с той же проверкой диапазоном по unique_doctor_time: нижняя граница
+# start_time отсекает записи, закончившиеся раньше самого длинного приема.
+event.listen(
+    Appointment.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER appointments_no_overlap BEFORE INSERT ON appointments "
+        "WHEN EXISTS (SELECT 1 FROM appointments "
+        "WHERE doctor_id = NEW.doctor_id "
+        f"AND start_time > datetime(NEW.start_time, '-{MAX_VISIT_MINUTES} minutes') "
+        "AND start_time < NEW.end_time AND end_time > NEW.start_time) "
+        "BEGIN SELECT RAISE(ABORT, 'appointments_no_overlap'); END"
+    ).execute_if(dialect="sqlite"),
+)
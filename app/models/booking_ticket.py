@@ -0,0 +1,58 @@
+"""Модель заявки на бронирование (режим очереди)."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, SmallInteger, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.schedule import DEFAULT_VISIT_MINUTES
+from app.db.database import Base
+
+TICKET_PENDING = "pending"
+TICKET_SUCCEEDED = "succeeded"
+TICKET_FAILED = "failed"
+
+
+class BookingTicket(Base):
+    """
+    Заявка на бронирование в очереди booking_tickets.
+
+    `id` задает порядок обработки, клиенту выдается непредсказуемый `token`.
+    Внешних ключей нет: запись может быть перенесена в архив, а таблица
+    appointments - секционирована.
+    """
+
+    __tablename__ = "booking_tickets"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    token: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    doctor_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    patient_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    start_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    duration_minutes: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=DEFAULT_VISIT_MINUTES
+    )
+    hold_token: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    telegram_chat_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=TICKET_PENDING
+    )
+    appointment_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    attempts: Mapped[int] = mapped_column(
+        SmallInteger, nullable=False, default=0, server_default="0"
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    __table_args__ = (
+        Index("idx_booking_tickets_status_doctor", "status", "doctor_id"),
+        Index("idx_booking_tickets_processed_at", "processed_at"),
+    )
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String, func
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -25,3 +25,5 @@ class Doctor(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+
+    __table_args__ = (Index("idx_doctors_specialization", "specialization"),)
@@ -0,0 +1,35 @@
+"""Модель временного удержания слота."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class SlotHold(Base):
+    """
+    Удержание слота врача до `expires_at`.
+
+    Истекшее удержание считается отсутствующим сразу, физически строка
+    удаляется позже (колесо таймеров процесса или редкая чистка по индексу).
+    """
+
+    __tablename__ = "slot_holds"
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    start_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    token: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (Index("idx_slot_holds_expires_at", "expires_at"),)
@@ -0,0 +1,30 @@
+"""Модель агрегатов загрузки врачей."""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class DoctorDailyStats(Base):
+    """Число записей и занятые минуты врача за день (по времени клиники)."""
+
+    __tablename__ = "doctor_daily_stats"
+
+    doctor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("doctors.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    appointments_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    booked_minutes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (Index("idx_doctor_daily_stats_day", "day"),)
@@ -1,15 +1,114 @@
 """Схемы записей на прием."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
 from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
-from app.core.settings import settings
+from app.core.schedule import (
+    DEFAULT_VISIT_MINUTES,
+    SLOT_MINUTES,
+    WORKDAY_END,
+    WORKDAY_START,
+    visit_step_minutes,
+)
+from app.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Максимальная длина серии записей (POST /appointments/series)
+MAX_SERIES_LENGTH = 52
+
+
+VisitDuration = Literal[15, 30, 60]
+
+
+def validate_appointment_time(
+    v: datetime, duration_minutes: int = DEFAULT_VISIT_MINUTES
+) -> datetime:
+    """
+    Валидация времени записи с обязательным timezone.
+    - Требуем обязательный timezone для избежания путаницы
+    - Валидируем в том timezone, который указал пользователь
+    - Прием длительности `duration_minutes` должен уложиться в рабочие часы
+    - Храним в UTC
+    """
+    settings = get_settings()
+
+    # ТРЕБУЕМ обязательный timezone для избежания путаницы
+    if v.tzinfo is None:
+        raise ValueError(
+            "Timezone обязателен! Укажите время с timezone, например: "
+            "2025-07-01T12:00:00+03:00 (Moscow) или "
+            "2025-07-01T12:00:00Z (UTC). "
+            f"Локальный timezone клиники: {settings.timezone}"
+        )
+
+    # Получаем клинический timezone для валидации рабочих часов
+    clinic_tz = ZoneInfo(settings.timezone)
+    v_clinic_tz = v.astimezone(clinic_tz)
+
+    # СНАЧАЛА проверяем интервал записи (кратно 30 минутам, для 15-минутных
+    # приемов - 15 минутам) по времени клиники
+    step = visit_step_minutes(duration_minutes)
+    if (
+        v_clinic_tz.minute % step != 0
+        or v_clinic_tz.second != 0
+        or v_clinic_tz.microsecond != 0
+    ):
+        if step == SLOT_MINUTES:
+            raise ValueError(
+                "Запись возможна только в начале часа или в половину "
+                "(по времени клиники)"
+            )
+        raise ValueError(
+            f"Прием {duration_minutes} минут начинается в :00, :15, :30 или :45 "
+            "(по времени клиники)"
+        )
+
+    # Валидируем время в том timezone, который указал пользователь
+    user_timezone = v.tzinfo
+
+    # Текущее время в timezone пользователя для корректного сравнения
+    now_user_tz = datetime.now(user_timezone)
+
+    # Проверка, что время в будущем (в timezone пользователя)
+    if v <= now_user_tz:
+        raise ValueError("Время записи должно быть в будущем")
+
+    # Проверка рабочих часов клиники (прием с 9:00 и до 18:00 по времени клиники)
+    visit_end = v_clinic_tz + timedelta(minutes=duration_minutes)
+    if (
+        v_clinic_tz.time() < WORKDAY_START
+        or visit_end.date() != v_clinic_tz.date()
+        or visit_end.time() > WORKDAY_END
+    ):
+        last_start = datetime.combine(v_clinic_tz.date(), WORKDAY_END) - timedelta(
+            minutes=duration_minutes
+        )
+        raise ValueError(
+            f"Записи принимаются с 9:00 до {last_start.strftime('%H:%M')} "
+            f"по времени клиники ({settings.timezone}). "
+            f"Ваше время {v.strftime('%H:%M')} "
+            f"соответствует {v_clinic_tz.strftime('%H:%M')} времени клиники"
+        )
+
+    # Проверка рабочих дней (по времени клиники)
+    if v_clinic_tz.weekday() > 4:  # 5=суббота, 6=воскресенье
+        raise ValueError("Записи принимаются только в рабочие дни (пн-пт)")
+
+    # Логируем для отладки
+    logger.info(
+        f"Время записи: {v.isoformat()} ({user_timezone}) -> "
+        f"время клиники: {v_clinic_tz.strftime('%H:%M %Z')} -> "
+        f"UTC: {v.astimezone(timezone.utc).isoformat()}"
+    )
+
+    # Храним в UTC
+    return v.astimezone(timezone.utc)
+
 
 class AppointmentBase(BaseModel):
     """Базовая схема записи на прием."""
@@ -24,6 +123,9 @@ class AppointmentBase(BaseModel):
         description="Имя пациента",
         examples=["Иван Иванов"],
     )
+    duration_minutes: VisitDuration = Field(
+        30, description="Длительность приема, минут (15, 30, 60)"
+    )
     start_time: datetime = Field(
         ...,
         description=(
@@ -36,6 +138,15 @@ class AppointmentBase(BaseModel):
 class AppointmentCreate(AppointmentBase):
     """Схема для создания записи на прием."""
 
+    hold_token: Optional[str] = Field(
+        None,
+        max_length=32,
+        description="Токен удержания слота (POST /holds), если слот удерживался",
+    )
+    telegram_chat_id: Optional[int] = Field(
+        None, description="Чат Telegram для напоминания о приеме"
+    )
+
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -56,79 +167,102 @@ class AppointmentCreate(AppointmentBase):
 
     @field_validator("start_time")
     @classmethod
-    def validate_start_time(_, v: datetime) -> datetime:
-        """
-        Валидация времени записи с обязательным timezone.
-        - Требуем обязательный timezone для избежания путаницы
-        - Валидируем в том timezone, который указал пользователь
-        - Храним в UTC
-        """
-        # ТРЕБУЕМ обязательный timezone для избежания путаницы
-        if v.tzinfo is None:
-            raise ValueError(
-                "Timezone обязателен! Укажите время с timezone, например: "
-                "2025-07-01T12:00:00+03:00 (Moscow) или "
-                "2025-07-01T12:00:00Z (UTC). "
-                f"Локальный timezone клиники: {settings.timezone}"
-            )
+    def validate_start_time(_, v: datetime, info: ValidationInfo) -> datetime:
+        """Валидация времени записи (см. validate_appointment_time)."""
+        duration = info.data.get("duration_minutes", DEFAULT_VISIT_MINUTES)
+        return validate_appointment_time(v, duration)
 
-        # Получаем клинический timezone для валидации рабочих часов
-        clinic_tz = ZoneInfo(settings.timezone)
-        v_clinic_tz = v.astimezone(clinic_tz)
 
-        # СНАЧАЛА проверяем интервал записи (кратно 30 минутам) по времени клиники
-        if (
-            v_clinic_tz.minute not in [0, 30]
-            or v_clinic_tz.second != 0
-            or v_clinic_tz.microsecond != 0
-        ):
-            raise ValueError(
-                "Запись возможна только в начале часа или в половину "
-                "(по времени клиники)"
-            )
+class AppointmentResponse(AppointmentBase):
+    """Схема ответа записи на прием."""
+
+    id: int
+    end_time: datetime
+    created_at: datetime
+    updated_at: datetime
 
-        # Валидируем время в том timezone, который указал пользователь
-        user_timezone = v.tzinfo
+    model_config = ConfigDict(from_attributes=True)
 
-        # Текущее время в timezone пользователя для корректного сравнения
-        now_user_tz = datetime.now(user_timezone)
 
-        # Проверка, что время в будущем (в timezone пользователя)
-        if v <= now_user_tz:
-            raise ValueError("Время записи должно быть в будущем")
+class AppointmentSeriesCreate(AppointmentBase):
+    """
+    Схема серии записей: `count` приемов каждые `interval_days` дней.
 
-        # Проверка рабочих часов клиники (9:00 - 17:30 по времени клиники)
-        if (
-            v_clinic_tz.hour < 9
-            or v_clinic_tz.hour > 17
-            or (v_clinic_tz.hour == 17 and v_clinic_tz.minute > 30)
-        ):
-            raise ValueError(
-                f"Записи принимаются с 9:00 до 17:30 по времени клиники "
-                f"({settings.timezone}). Ваше время {v.strftime('%H:%M')} "
-                f"соответствует {v_clinic_tz.strftime('%H:%M')} времени клиники"
-            )
+    Первый прием задается `start_time`, следующие - в то же время по часам
+    клиники (переход на летнее время не сдвигает прием).
+    """
 
-        # Проверка рабочих дней (по времени клиники)
-        if v_clinic_tz.weekday() > 4:  # 5=суббота, 6=воскресенье
-            raise ValueError("Записи принимаются только в рабочие дни (пн-пт)")
+    interval_days: int = Field(7, ge=1, le=28, description="Шаг серии, дней")
+    count: int = Field(
+        ..., ge=2, le=MAX_SERIES_LENGTH, description="Число приемов в серии"
+    )
+    mode: Literal["all_or_nothing", "best_effort"] = Field(
+        "all_or_nothing",
+        description=(
+            "all_or_nothing - при любом конфликте не создается ничего; "
+            "best_effort - создаются свободные даты"
+        ),
+    )
+    telegram_chat_id: Optional[int] = Field(
+        None, description="Чат Telegram для напоминаний о приемах"
+    )
 
-        # Логируем для отладки
-        logger.info(
-            f"Время записи: {v.isoformat()} ({user_timezone}) -> "
-            f"время клиники: {v_clinic_tz.strftime('%H:%M %Z')} -> "
-            f"UTC: {v.astimezone(timezone.utc).isoformat()}"
-        )
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "doctor_id": 1,
+                "patient_name": "Иван Иванов",
+                "start_time": "2025-07-15T11:30:00+03:00",
+                "interval_days": 7,
+                "count": 10,
+                "mode": "all_or_nothing",
+            }
+        }
+    )
 
-        # Храним в UTC
-        return v.astimezone(timezone.utc)
+    @field_validator("patient_name")
+    @classmethod
+    def validate_patient_name(_, v: str) -> str:
+        """Валидация имени пациента."""
+        if not v.strip():
+            raise ValueError("Имя пациента не может быть пустым")
+        return v.strip()
 
+    @field_validator("start_time")
+    @classmethod
+    def validate_start_time(_, v: datetime, info: ValidationInfo) -> datetime:
+        """Первый прием проверяется как обычная запись."""
+        duration = info.data.get("duration_minutes", DEFAULT_VISIT_MINUTES)
+        return validate_appointment_time(v, duration)
 
-class AppointmentResponse(AppointmentBase):
-    """Схема ответа записи на прием."""
+    def occurrences(self) -> list[tuple[datetime, Optional[str]]]:
+        """
+        Даты серии (UTC) и причина, по которой дата недопустима, или None.
 
-    id: int
-    created_at: datetime
-    updated_at: datetime
+        Каждая дата проходит те же правила, что и AppointmentCreate.
+        """
+        first = self.start_time.astimezone(ZoneInfo(get_settings().timezone))
+        result: list[tuple[datetime, Optional[str]]] = []
+        for i in range(self.count):
+            local = first + timedelta(days=i * self.interval_days)
+            try:
+                result.append(
+                    (validate_appointment_time(local, self.duration_minutes), None)
+                )
+            except ValueError as e:
+                result.append((local.astimezone(timezone.utc), str(e)))
+        return result
 
-    model_config = ConfigDict(from_attributes=True)
+
+class SeriesConflict(BaseModel):
+    """Дата серии, на которую запись не создана."""
+
+    start_time: datetime
+    reason: str
+
+
+class AppointmentSeriesResponse(BaseModel):
+    """Результат создания серии записей."""
+
+    created: list[AppointmentResponse]
+    conflicts: list[SeriesConflict]
@@ -0,0 +1,23 @@
+"""Схемы заявок очереди бронирований."""
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class BookingTicketResponse(BaseModel):
+    """Состояние заявки на бронирование."""
+
+    token: str = Field(..., description="Идентификатор заявки для опроса")
+    status: Literal["pending", "succeeded", "failed"]
+    doctor_id: int
+    start_time: datetime
+    appointment_id: Optional[int] = Field(
+        None, description="ID созданной записи (status=succeeded)"
+    )
+    error: Optional[str] = Field(None, description="Причина отказа (status=failed)")
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,13 @@
+"""Схемы для врачей."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DoctorResponse(BaseModel):
+    """Схема ответа врача из справочника."""
+
+    id: int
+    name: str
+    specialization: str
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
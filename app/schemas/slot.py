@@ -0,0 +1,15 @@
+"""Схемы свободных слотов."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class FreeSlotResponse(BaseModel):
+    """Свободный слот врача."""
+
+    doctor_id: int
+    doctor_name: str
+    specialization: str
+    start_time: datetime
+    duration_minutes: int
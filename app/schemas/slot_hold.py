@@ -0,0 +1,35 @@
+"""Схемы удержаний слотов."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.schemas.appointment import validate_appointment_time
+
+
+class SlotHoldCreate(BaseModel):
+    """Запрос на удержание слота."""
+
+    doctor_id: int = Field(..., ge=1, description="ID врача", examples=[1])
+    start_time: datetime = Field(
+        ...,
+        description="Время начала приема (с обязательным timezone)",
+        examples=["2025-07-15T11:30:00+03:00"],
+    )
+
+    @field_validator("start_time")
+    @classmethod
+    def validate_start_time(_, v: datetime) -> datetime:
+        """Те же правила, что и для записи (см. validate_appointment_time)."""
+        return validate_appointment_time(v)
+
+
+class SlotHoldResponse(BaseModel):
+    """Удержание слота; `token` передается в POST /appointments как hold_token."""
+
+    token: str
+    doctor_id: int
+    start_time: datetime
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,29 @@
+"""Схемы агрегатов загрузки врачей."""
+
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class DailyOccupancy(BaseModel):
+    """Загрузка за день."""
+
+    day: date
+    appointments: int = Field(..., description="Число записей")
+    booked_minutes: int = Field(..., description="Минуты, занятые приемами")
+    capacity: int = Field(..., description="Число 30-минутных слотов за день")
+    free_slots: int = Field(..., description="Свободные 30-минутные слоты")
+    utilization: float = Field(..., description="Доля занятого времени (0-1)")
+
+
+class DoctorDailyStatsResponse(DailyOccupancy):
+    """Загрузка врача за день."""
+
+    doctor_id: int
+
+
+class SpecializationDailyStatsResponse(DailyOccupancy):
+    """Загрузка специализации за день (по активным врачам)."""
+
+    specialization: str
+    doctors: int = Field(..., description="Число активных врачей")
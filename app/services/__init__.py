@@ -0,0 +1 @@
+"""Сервисы приложения поверх CRUD-слоя (кэши, фоновые обработчики)."""
@@ -0,0 +1,269 @@
+"""
+Асинхронная очередь бронирований: воркеры, шардированные по doctor_id.
+
+В режиме очереди `POST /appointments` только сохраняет заявку в
+booking_tickets и отвечает 202. Заявки врача обрабатывает ровно один воркер
+(шард `doctor_id % shards`) строго по очереди, поэтому проверка доступности
+идет без FOR UPDATE, а UNIQUE(doctor_id, start_time) остается страховкой.
+
+В PostgreSQL шард закрепляется за процессом advisory-блокировкой: при
+нескольких репликах API каждый шард обрабатывает одна из них, остальные
+ждут и подхватывают шард, если владелец упал. Advisory-блокировка живет на
+соединении, поэтому владелец шарда держит одно соединение пула все время
+владения: 4 шарда по умолчанию занимают 4 из 5 соединений пула
+(`pool_size=5`), и пул стоит увеличить на число шардов.
+
+Каждая заявка обрабатывается в своей транзакции вместе с записью, поэтому
+после падения воркера заявка просто остается pending и обрабатывается
+повторно. Отказ по бизнес-правилам (ValueError, конфликт UNIQUE) сразу
+отклоняет заявку; неожиданная ошибка учитывается в `attempts`, и после
+`max_attempts` попыток заявка тоже отклоняется, а не блокирует шард.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.settings import get_settings
+from app.crud.appointment import create_appointment_with_validation
+from app.crud.booking_ticket import (
+    get_pending_tickets,
+    mark_ticket_failed,
+    mark_ticket_succeeded,
+    prune_booking_tickets,
+)
+from app.crud.stats import increment_doctor_daily_stats
+from app.models.booking_ticket import TICKET_PENDING, BookingTicket
+from app.schemas.appointment import AppointmentCreate
+
+logger = logging.getLogger(__name__)
+
+# Пространство ключей advisory-блокировок шардов
+ADVISORY_LOCK_BASE = 0x0B00C000
+PRUNE_INTERVAL_SECONDS = 60 * 60
+UNEXPECTED_ERROR = "Не удалось обработать заявку"
+
+
+class BookingQueueSignals:
+    """
+    Сигналы внутри процесса: новая заявка шарда и завершение заявки.
+
+    Без них воркер и ожидающий клиент узнают о событиях опросом БД
+    (этого достаточно, когда API и воркер в разных процессах).
+    """
+
+    def __init__(self, shards: int) -> None:
+        self.shards = shards
+        self._work = [asyncio.Event() for _ in range(shards)]
+        self._tickets: "weakref.WeakValueDictionary[str, asyncio.Event]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def shard_of(self, doctor_id: int) -> int:
+        """Шард врача."""
+        return doctor_id % self.shards
+
+    def wake_shard(self, doctor_id: int) -> None:
+        """Разбудить воркер шарда врача."""
+        self._work[self.shard_of(doctor_id)].set()
+
+    async def wait_for_work(self, shard: int, timeout: float) -> None:
+        """Ждать новую заявку шарда не дольше timeout."""
+        event = self._work[shard]
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
+
+    def ticket_done(self, token: str) -> None:
+        """Сообщить ожидающим о завершении заявки."""
+        event = self._tickets.pop(token, None)
+        if event is not None:
+            event.set()
+
+    async def wait_for_ticket(self, token: str, timeout: float) -> None:
+        """Ждать завершения заявки не дольше timeout."""
+        event = self._tickets.get(token)
+        if event is None:
+            event = asyncio.Event()
+            self._tickets[token] = event
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+@lru_cache
+def get_booking_signals() -> BookingQueueSignals:
+    """Сигналы очереди процесса."""
+    return BookingQueueSignals(get_settings().booking_queue_shards)
+
+
+async def _fail_ticket(db: AsyncSession, ticket_id: int, error: str) -> None:
+    await db.rollback()
+    ticket = await db.get(BookingTicket, ticket_id)
+    if ticket is not None:
+        mark_ticket_failed(ticket, error)
+        await db.commit()
+
+
+async def _record_failed_attempt(
+    db: AsyncSession, ticket_id: int, max_attempts: int
+) -> None:
+    await db.rollback()
+    ticket = await db.get(BookingTicket, ticket_id)
+    if ticket is None:
+        return
+    ticket.attempts += 1
+    if ticket.attempts >= max_attempts:
+        logger.error(f"Заявка {ticket_id} отклонена после {ticket.attempts} попыток")
+        mark_ticket_failed(ticket, UNEXPECTED_ERROR)
+    await db.commit()
+
+
+async def process_ticket(
+    sessionmaker: async_sessionmaker[AsyncSession], ticket_id: int, max_attempts: int
+) -> None:
+    """Обработать одну заявку: запись, агрегат и статус - в одной транзакции."""
+    async with sessionmaker() as db:
+        ticket = await db.get(BookingTicket, ticket_id)
+        if ticket is None or ticket.status != TICKET_PENDING:
+            return
+        token = ticket.token
+        start_time = ticket.start_time
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+
+        try:
+            if start_time <= datetime.now(timezone.utc):
+                raise ValueError("Время записи должно быть в будущем")
+            # Данные уже провалидированы при постановке в очередь
+            request = AppointmentCreate.model_construct(
+                doctor_id=ticket.doctor_id,
+                patient_name=ticket.patient_name,
+                start_time=start_time,
+                duration_minutes=ticket.duration_minutes,
+                hold_token=ticket.hold_token,
+                telegram_chat_id=ticket.telegram_chat_id,
+            )
+            appointment = await create_appointment_with_validation(
+                db, request, lock=False
+            )
+            await db.flush()
+            await increment_doctor_daily_stats(
+                db,
+                appointment.doctor_id,
+                [(appointment.start_time, appointment.duration_minutes)],
+            )
+            mark_ticket_succeeded(ticket, appointment.id)
+            await db.commit()
+            logger.info(f"Заявка {ticket_id}: создана запись {appointment.id}")
+        except ValueError as e:
+            logger.info(f"Заявка {ticket_id} отклонена: {e}")
+            await _fail_ticket(db, ticket_id, str(e))
+        except IntegrityError as e:
+            logger.warning(f"Ошибка целостности при обработке заявки {ticket_id}: {e}")
+            await _fail_ticket(db, ticket_id, "Врач уже занят в это время")
+        except Exception as e:  # noqa: BLE001
+            logger.exception(f"Ошибка при обработке заявки {ticket_id}: {e}")
+            await _record_failed_attempt(db, ticket_id, max_attempts)
+
+    get_booking_signals().ticket_done(token)
+
+
+async def process_shard(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    shard: int,
+    shards: int,
+    batch_size: int,
+    max_attempts: int,
+) -> int:
+    """Обработать пачку заявок шарда по порядку; вернуть их число."""
+    async with sessionmaker() as db:
+        tickets = await get_pending_tickets(db, shard, shards, batch_size)
+        ticket_ids = [ticket.id for ticket in tickets]
+
+    for ticket_id in ticket_ids:
+        await process_ticket(sessionmaker, ticket_id, max_attempts)
+    return len(ticket_ids)
+
+
+@asynccontextmanager
+async def shard_ownership(engine: AsyncEngine, shard: int) -> AsyncIterator[bool]:
+    """
+    Закрепить шард за процессом (advisory-блокировка PostgreSQL).
+
+    Блокировка держится на соединении, поэтому оно не возвращается в пул,
+    пока шард закреплен.
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    key = ADVISORY_LOCK_BASE + shard
+    async with engine.connect() as conn:
+        owned = bool(
+            await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        )
+        try:
+            yield owned
+        finally:
+            if owned:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                )
+
+
+async def prune_processed_tickets(
+    sessionmaker: async_sessionmaker[AsyncSession], retention_hours: float
+) -> int:
+    """Удалить обработанные заявки старше срока хранения."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    async with sessionmaker() as db:
+        pruned = await prune_booking_tickets(db, cutoff)
+        await db.commit()
+    if pruned:
+        logger.info(f"Удалено обработанных заявок: {pruned}")
+    return pruned
+
+
+async def run_booking_worker(
+    engine: AsyncEngine,
+    sessionmaker: async_sessionmaker[AsyncSession],
+    shard: int,
+    shards: int,
+    batch_size: int,
+    max_attempts: int,
+    poll_interval_seconds: float,
+    retention_hours: float,
+) -> None:
+    """Фоновая задача: обрабатывать заявки шарда, пока он закреплен за процессом."""
+    signals = get_booking_signals()
+    last_prune = 0.0
+    while True:
+        try:
+            async with shard_ownership(engine, shard) as owned:
+                while owned:
+                    processed = await process_shard(
+                        sessionmaker, shard, shards, batch_size, max_attempts
+                    )
+                    if shard == 0 and time.monotonic() - last_prune > (
+                        PRUNE_INTERVAL_SECONDS
+                    ):
+                        await prune_processed_tickets(sessionmaker, retention_hours)
+                        last_prune = time.monotonic()
+                    if processed < batch_size:
+                        await signals.wait_for_work(shard, poll_interval_seconds)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Ошибка воркера очереди бронирований (шард {shard}): {e}")
+        await asyncio.sleep(poll_interval_seconds)
@@ -0,0 +1,143 @@
+"""
+Справочник активных врачей в памяти процесса.
+
+Справочник читается ботом на каждый диалог, а меняется редко, поэтому
+запросы обслуживаются из снимка: словарь по ID и индекс по нормализованной
+специализации. Снимок перечитывается одним запросом по истечении TTL или
+после `invalidate()`. Промахи (неизвестный ID или специализация) проверяются
+в БД точечным запросом по PK / idx_doctors_specialization; если врач
+там нашелся, снимок устарел и сбрасывается, иначе промах запоминается в
+снимке и до следующей загрузки в БД не ходит.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import get_settings
+from app.crud.doctor import get_doctor, get_doctors, normalize_specialization
+from app.schemas.doctor import DoctorResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    """
+    Неизменяемый снимок справочника.
+
+    Множества промахов пополняются после проверки в БД и живут, пока жив
+    снимок: перезагрузка или `invalidate()` их сбрасывает.
+    """
+
+    doctors: tuple[DoctorResponse, ...]
+    by_id: dict[int, DoctorResponse]
+    by_specialization: dict[str, tuple[DoctorResponse, ...]]
+    loaded_at: float
+    missing_ids: set[int] = field(default_factory=set)
+    missing_specializations: set[str] = field(default_factory=set)
+
+    @classmethod
+    def build(cls, doctors: list[DoctorResponse]) -> "DirectorySnapshot":
+        """Построить индексы по списку врачей (уже отсортированному)."""
+        by_specialization: dict[str, list[DoctorResponse]] = {}
+        for doctor in doctors:
+            key = normalize_specialization(doctor.specialization)
+            by_specialization.setdefault(key, []).append(doctor)
+        return cls(
+            doctors=tuple(doctors),
+            by_id={doctor.id: doctor for doctor in doctors},
+            by_specialization={
+                key: tuple(group) for key, group in by_specialization.items()
+            },
+            loaded_at=time.monotonic(),
+        )
+
+
+@dataclass
+class DoctorDirectory:
+    """Кэш справочника врачей с TTL и явной инвалидацией."""
+
+    ttl_seconds: float
+    _snapshot: Optional[DirectorySnapshot] = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def invalidate(self) -> None:
+        """Сбросить снимок: следующий запрос перечитает справочник."""
+        self._snapshot = None
+
+    def _fresh(self) -> Optional[DirectorySnapshot]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if time.monotonic() - snapshot.loaded_at >= self.ttl_seconds:
+            return None
+        return snapshot
+
+    async def snapshot(self, db: AsyncSession) -> DirectorySnapshot:
+        """Актуальный снимок; перечитывается одним запросом на все ожидающие."""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        async with self._lock:
+            snapshot = self._fresh()
+            if snapshot is None:
+                doctors = await get_doctors(db)
+                snapshot = DirectorySnapshot.build(
+                    [DoctorResponse.model_validate(doctor) for doctor in doctors]
+                )
+                logger.info(f"Справочник врачей загружен: {len(doctors)} врачей")
+                if self.ttl_seconds > 0:
+                    self._snapshot = snapshot
+            return snapshot
+
+    async def list_doctors(
+        self, db: AsyncSession, specialization: Optional[str] = None
+    ) -> tuple[DoctorResponse, ...]:
+        """Активные врачи, опционально одной специализации."""
+        snapshot = await self.snapshot(db)
+        if specialization is None:
+            return snapshot.doctors
+
+        key = normalize_specialization(specialization)
+        doctors = snapshot.by_specialization.get(key)
+        if doctors is not None:
+            return doctors
+        if key in snapshot.missing_specializations:
+            return ()
+
+        found = await get_doctors(db, specialization=specialization)
+        if not found:
+            snapshot.missing_specializations.add(key)
+            return ()
+        self.invalidate()
+        return tuple(DoctorResponse.model_validate(doctor) for doctor in found)
+
+    async def get_doctor(
+        self, db: AsyncSession, doctor_id: int
+    ) -> Optional[DoctorResponse]:
+        """Активный врач по ID или None."""
+        snapshot = await self.snapshot(db)
+        doctor = snapshot.by_id.get(doctor_id)
+        if doctor is not None:
+            return doctor
+        if doctor_id in snapshot.missing_ids:
+            return None
+
+        found = await get_doctor(db, doctor_id)
+        if found is None:
+            snapshot.missing_ids.add(doctor_id)
+            return None
+        self.invalidate()
+        return DoctorResponse.model_validate(found)
+
+
+@lru_cache
+def get_doctor_directory() -> DoctorDirectory:
+    """Справочник врачей процесса."""
+    return DoctorDirectory(ttl_seconds=get_settings().doctor_directory_ttl_seconds)
@@ -0,0 +1,265 @@
+"""
+Напоминания о приеме.
+
+Проход планировщика забирает записи ближайшего окна (REMINDER_LEAD_MINUTES)
+пачками: каждая пачка - один запрос-диапазон по idx_appointments_start_time,
+который тут же ставит отметку `reminder_sent_at`. Отметка делает проход
+идемпотентным и разводит реплики API: запись забирает ровно один процесс.
+Пачка рассылается ограниченным пулом воркеров (REMINDER_CONCURRENCY);
+с напоминаний, которые не удалось отправить, отметка снимается одним UPDATE
+в конце прохода, и они уходят в следующий. Неудачи считаются в
+`reminder_attempts`: после REMINDER_MAX_ATTEMPTS напоминание больше не
+повторяется, чтобы неисправный канал не рассылал одно и то же бесконечно.
+Если процесс упал между отметкой и отправкой, напоминание теряется
+(доставка не больше одного раза).
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional, Protocol
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.settings import Settings, get_settings
+from app.crud.reminder import DueReminder, claim_due_reminders, release_reminders
+from app.services.doctor_directory import get_doctor_directory
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+# Токен бота: "<ID бота>:<секрет>"; заглушки вроде your_telegram_bot_token_here
+# из .env.example под формат не подходят
+TELEGRAM_TOKEN_PATTERN = re.compile(r"\d+:[\w-]+")
+
+
+@dataclass(frozen=True)
+class Reminder:
+    """Напоминание, готовое к отправке."""
+
+    appointment: DueReminder
+    doctor_name: str
+
+    def text(self, timezone_name: str) -> str:
+        """Текст напоминания по времени клиники."""
+        local = self.appointment.start_time.astimezone(ZoneInfo(timezone_name))
+        return (
+            f"Напоминаем о приеме: {self.doctor_name}, "
+            f"{local.strftime('%d.%m.%Y в %H:%M')}. "
+            f"Пациент: {self.appointment.patient_name}."
+        )
+
+
+class ReminderSender(Protocol):
+    """Канал доставки напоминаний."""
+
+    async def send(self, reminder: Reminder) -> bool:
+        """Отправить напоминание; False - отправлять некуда."""
+        ...
+
+
+class LoggingReminderSender:
+    """Канал по умолчанию: напоминание пишется в лог."""
+
+    async def send(self, reminder: Reminder) -> bool:
+        """Записать напоминание в лог."""
+        logger.info(
+            f"Напоминание по записи {reminder.appointment.appointment_id}: "
+            f"{reminder.text(get_settings().timezone)}"
+        )
+        return True
+
+
+class TelegramReminderSender:
+    """Отправка через Telegram Bot API (sendMessage) одним HTTP-клиентом."""
+
+    def __init__(self, token: str, timeout_seconds: float = 10.0) -> None:
+        self.token = token
+        self.timeout_seconds = timeout_seconds
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                base_url=f"{TELEGRAM_API_URL}/bot{self.token}",
+                timeout=self.timeout_seconds,
+            )
+        return self._client
+
+    async def send(self, reminder: Reminder) -> bool:
+        """Отправить сообщение в чат записи."""
+        chat_id = reminder.appointment.telegram_chat_id
+        if chat_id is None:
+            return False
+        response = await self._get_client().post(
+            "/sendMessage",
+            json={"chat_id": chat_id, "text": reminder.text(get_settings().timezone)},
+        )
+        response.raise_for_status()
+        return True
+
+    async def close(self) -> None:
+        """Закрыть HTTP-клиент."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def create_reminder_sender(settings: Settings) -> ReminderSender:
+    """Канал по настройкам: Telegram при настоящем токене бота, иначе лог."""
+    token = (settings.telegram_bot_token or "").strip()
+    if TELEGRAM_TOKEN_PATTERN.fullmatch(token):
+        return TelegramReminderSender(token)
+    if token:
+        logger.warning(
+            "TELEGRAM_BOT_TOKEN не похож на токен бота, напоминания пишутся в лог"
+        )
+    return LoggingReminderSender()
+
+
+@dataclass
+class ReminderPassResult:
+    """Итог прохода планировщика."""
+
+    claimed: int = 0
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    abandoned: int = 0
+    batches: int = 0
+
+
+async def dispatch_reminders(
+    reminders: list[Reminder],
+    sender: ReminderSender,
+    concurrency: int,
+    result: ReminderPassResult,
+) -> list[int]:
+    """Разослать пачку пулом из `concurrency` воркеров; вернуть ID неудачных."""
+    queue: asyncio.Queue[Reminder] = asyncio.Queue()
+    for reminder in reminders:
+        queue.put_nowait(reminder)
+    failed: list[int] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            reminder = queue.get_nowait()
+            try:
+                if await sender.send(reminder):
+                    result.sent += 1
+                else:
+                    result.skipped += 1
+            except Exception as e:  # noqa: BLE001
+                failed.append(reminder.appointment.appointment_id)
+                logger.warning(
+                    f"Напоминание по записи {reminder.appointment.appointment_id} "
+                    f"не отправлено: {e}"
+                )
+
+    workers = min(concurrency, len(reminders))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    result.failed += len(failed)
+    return failed
+
+
+async def prepare_reminders(
+    db: AsyncSession, appointments: list[DueReminder]
+) -> list[Reminder]:
+    """Подставить имена врачей из справочника в памяти (без запроса на запись)."""
+    snapshot = await get_doctor_directory().snapshot(db)
+    reminders = []
+    for appointment in appointments:
+        doctor = snapshot.by_id.get(appointment.doctor_id)
+        doctor_name = doctor.name if doctor is not None else "врач клиники"
+        reminders.append(Reminder(appointment, doctor_name))
+    return reminders
+
+
+async def send_due_reminders(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    sender: ReminderSender,
+    lead: timedelta,
+    batch_size: int,
+    concurrency: int,
+    max_attempts: int = 5,
+    now: Optional[datetime] = None,
+) -> ReminderPassResult:
+    """Разослать напоминания о записях, начинающихся в ближайшие `lead`."""
+    now = now or datetime.now(timezone.utc)
+    window_end = now + lead
+    result = ReminderPassResult()
+    failed: list[int] = []
+
+    async with sessionmaker() as db:
+        while True:
+            try:
+                claimed = await claim_due_reminders(
+                    db, now, window_end, batch_size, now
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            if not claimed:
+                break
+            result.claimed += len(claimed)
+            result.batches += 1
+
+            reminders = await prepare_reminders(db, claimed)
+            failed += await dispatch_reminders(reminders, sender, concurrency, result)
+            if len(claimed) < batch_size:
+                break
+
+        # Отметки снимаются в конце прохода, чтобы он не забрал их повторно
+        if failed:
+            result.abandoned = await release_reminders(db, failed, max_attempts)
+            await db.commit()
+
+    if result.claimed:
+        logger.info(
+            f"Напоминания: отправлено {result.sent}, без канала {result.skipped}, "
+            f"с ошибкой {result.failed} (пачек {result.batches})"
+        )
+    if result.abandoned:
+        logger.error(
+            f"Напоминаний без повтора после {max_attempts} неудачных попыток: "
+            f"{result.abandoned}"
+        )
+    return result
+
+
+async def run_reminder_scheduler(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    sender: ReminderSender,
+    lead_minutes: float,
+    batch_size: int,
+    concurrency: int,
+    max_attempts: int,
+    interval_seconds: float,
+) -> None:
+    """Фоновая задача: проход планировщика раз в `interval_seconds`."""
+    try:
+        while True:
+            try:
+                await send_due_reminders(
+                    sessionmaker,
+                    sender,
+                    timedelta(minutes=lead_minutes),
+                    batch_size,
+                    concurrency,
+                    max_attempts,
+                )
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Ошибка рассылки напоминаний: {e}")
+            await asyncio.sleep(interval_seconds)
+    finally:
+        if isinstance(sender, TelegramReminderSender):
+            await sender.close()
@@ -0,0 +1,110 @@
+"""
+Истечение удержаний слотов через колесо таймеров.
+
+Проверки удержаний сравнивают `expires_at` с текущим временем, поэтому
+истекшее удержание перестает действовать сразу. Колесо отвечает только за
+физическое удаление строк: каждый процесс кладет в него токены своих
+удержаний и раз в тик удаляет истекшие по уникальному индексу токена -
+O(1) на удержание, без периодического сканирования таблицы. Строки,
+оставшиеся после падения процесса, раз в SLOT_HOLD_SWEEP_INTERVAL_SECONDS
+удаляются диапазоном по idx_slot_holds_expires_at.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.settings import get_settings
+from app.core.timing_wheel import TimingWheel
+from app.crud.slot_hold import delete_expired_slot_holds, delete_slot_holds
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 1.0
+DELETE_BATCH_SIZE = 500
+
+
+class SlotHoldExpirer:
+    """Колесо таймеров удержаний процесса и фоновая задача удаления."""
+
+    def __init__(self, sweep_interval_seconds: float) -> None:
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.wheel: TimingWheel[str] = TimingWheel(TICK_SECONDS, time.time())
+        self.deleted = 0
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def track(self, token: str, expires_at: datetime) -> None:
+        """Запланировать удаление удержания."""
+        self.wheel.add(token, expires_at.timestamp())
+
+    def forget(self, token: str) -> None:
+        """Удержание снято или использовано - удалять нечего."""
+        self.wheel.remove(token)
+
+    async def expire_due(
+        self, sessionmaker: async_sessionmaker[AsyncSession], now: float
+    ) -> int:
+        """Удалить строки удержаний, истекших к моменту `now`."""
+        tokens = self.wheel.advance(now)
+        if not tokens:
+            return 0
+        moment = datetime.fromtimestamp(now, timezone.utc)
+        deleted = 0
+        async with sessionmaker() as db:
+            for i in range(0, len(tokens), DELETE_BATCH_SIZE):
+                batch = tokens[i : i + DELETE_BATCH_SIZE]
+                deleted += await delete_slot_holds(db, batch, moment)
+            await db.commit()
+        self.deleted += deleted
+        return deleted
+
+    async def sweep(self, sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+        """Удалить все истекшие удержания (в том числе чужих процессов)."""
+        async with sessionmaker() as db:
+            deleted = await delete_expired_slot_holds(db, datetime.now(timezone.utc))
+            await db.commit()
+        return deleted
+
+    async def _run(self, sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        last_sweep = time.monotonic()
+        while True:
+            await asyncio.sleep(TICK_SECONDS)
+            try:
+                await self.expire_due(sessionmaker, time.time())
+                if time.monotonic() - last_sweep >= self.sweep_interval_seconds:
+                    swept = await self.sweep(sessionmaker)
+                    last_sweep = time.monotonic()
+                    if swept:
+                        logger.info(f"Удалено истекших удержаний слотов: {swept}")
+            except Exception as e:  # noqa: BLE001
+                logger.error(f"Ошибка удаления истекших удержаний слотов: {e}")
+
+    def ensure_started(self, engine: AsyncEngine) -> None:
+        """Запустить фоновую задачу при первом удержании в этом event loop."""
+        task = self._task
+        if task is not None and not task.done():
+            if task.get_loop() is asyncio.get_running_loop():
+                return
+        sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        self._task = asyncio.create_task(
+            self._run(sessionmaker), name="slot-hold-expiry"
+        )
+
+    async def stop(self) -> None:
+        """Остановить фоновую задачу."""
+        task, self._task = self._task, None
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@lru_cache
+def get_slot_hold_expirer() -> SlotHoldExpirer:
+    """Колесо удержаний процесса."""
+    return SlotHoldExpirer(get_settings().slot_hold_sweep_interval_seconds)
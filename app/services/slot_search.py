@@ -0,0 +1,125 @@
+"""
+Поиск ближайших свободных слотов.
+
+Свободные слоты каждого врача - ленивый поток по возрастанию времени;
+слот свободен, если прием нужной длительности не пересекает ни одну запись
+или удержание (IntervalIndex, O(log n) на слот).
+Потоки всех врачей специализации сливаются кучей (k-way merge), и поиск
+останавливается, как только найдено `limit` слотов. Занятость читается
+по дням и только для тех дней, до которых дошло слияние: один запрос на
+день для всех врачей сразу. Стоимость растет с размером ответа, а не с
+произведением врачи × дни.
+"""
+
+import heapq
+from collections.abc import AsyncGenerator, Iterable, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.intervals import IntervalIndex
+from app.core.schedule import (
+    DEFAULT_VISIT_MINUTES,
+    WORKDAY_END,
+    clinic_timezone,
+    day_slots,
+)
+from app.crud.slots import get_busy_intervals
+from app.schemas.doctor import DoctorResponse
+from app.schemas.slot import FreeSlotResponse
+
+
+class BusyCalendar:
+    """Занятость группы врачей, подгружаемая по дням."""
+
+    def __init__(self, db: AsyncSession, doctor_ids: Iterable[int]) -> None:
+        self.db = db
+        self.doctor_ids = tuple(sorted(set(doctor_ids)))
+        self._days: dict[date, dict[int, IntervalIndex]] = {}
+
+    @property
+    def loaded_days(self) -> int:
+        """Сколько дней прочитано из БД."""
+        return len(self._days)
+
+    async def busy(self, doctor_id: int, day: date) -> IntervalIndex:
+        """Занятые интервалы врача в рабочие часы дня клиники."""
+        if day not in self._days:
+            tz = clinic_timezone()
+            start = day_slots(day)[0]
+            end = datetime.combine(day, WORKDAY_END, tzinfo=tz).astimezone(timezone.utc)
+            intervals = await get_busy_intervals(self.db, self.doctor_ids, start, end)
+            self._days[day] = {
+                doctor_id: IntervalIndex(items)
+                for doctor_id, items in intervals.items()
+            }
+        return self._days[day].get(doctor_id) or IntervalIndex()
+
+
+async def free_slots(
+    calendar: BusyCalendar,
+    doctor_id: int,
+    days: Sequence[date],
+    not_before: datetime,
+    duration_minutes: int = DEFAULT_VISIT_MINUTES,
+) -> AsyncGenerator[datetime, None]:
+    """Свободные начала приемов врача по возрастанию после `not_before`."""
+    duration = timedelta(minutes=duration_minutes)
+    for day in days:
+        slots = [slot for slot in day_slots(day, duration_minutes) if slot > not_before]
+        if not slots:
+            continue
+        busy = await calendar.busy(doctor_id, day)
+        for slot in slots:
+            if busy.overlapping(slot, slot + duration) is None:
+                yield slot
+
+
+async def earliest_free_slots(
+    db: AsyncSession,
+    doctors: Sequence[DoctorResponse],
+    days: Sequence[date],
+    limit: int,
+    duration_minutes: int = DEFAULT_VISIT_MINUTES,
+    now: Optional[datetime] = None,
+) -> list[FreeSlotResponse]:
+    """Первые `limit` свободных слотов среди врачей (при равенстве - по ID)."""
+    if not doctors or limit <= 0:
+        return []
+    now = now or datetime.now(timezone.utc)
+    calendar = BusyCalendar(db, (doctor.id for doctor in doctors))
+    by_id = {doctor.id: doctor for doctor in doctors}
+    streams = {
+        doctor.id: free_slots(calendar, doctor.id, days, now, duration_minutes)
+        for doctor in doctors
+    }
+
+    heap: list[tuple[datetime, int]] = []
+    result: list[FreeSlotResponse] = []
+    try:
+        for doctor_id, stream in streams.items():
+            first = await anext(stream, None)
+            if first is not None:
+                heap.append((first, doctor_id))
+        heapq.heapify(heap)
+
+        while heap and len(result) < limit:
+            start_time, doctor_id = heapq.heappop(heap)
+            doctor = by_id[doctor_id]
+            result.append(
+                FreeSlotResponse(
+                    doctor_id=doctor.id,
+                    doctor_name=doctor.name,
+                    specialization=doctor.specialization,
+                    start_time=start_time,
+                    duration_minutes=duration_minutes,
+                )
+            )
+            following = await anext(streams[doctor_id], None)
+            if following is not None:
+                heapq.heappush(heap, (following, doctor_id))
+    finally:
+        for stream in streams.values():
+            await stream.aclose()
+    return result
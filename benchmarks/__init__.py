@@ -0,0 +1 @@
+"""Бенчмарки API клиники (запускаются отдельно от тестов)."""
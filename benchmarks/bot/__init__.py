@@ -0,0 +1 @@
+"""Нагрузочный тест Telegram-бота на подставных серверах (без сети)."""
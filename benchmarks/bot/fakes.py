@@ -0,0 +1,425 @@
+"""
+Подставные серверы для нагрузочного теста бота без сети.
+
+Три aiohttp-приложения на 127.0.0.1:
+- OpenAI chat completions (`/v1/chat/completions`) с настраиваемой
+  задержкой и долей ошибок 500;
+- Telegram Bot API: getUpdates (long polling), sendMessage,
+  editMessageText, answerCallbackQuery, sendChatAction и getMe; сервер
+  хранит сообщения чатов и будит ожидающих ответа бота;
+- API клиники: GET /doctors, GET /doctors/{id}/slots, POST /appointments.
+
+Каждый сервер считает вызовы по методам.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+from aiohttp import web
+
+BOT_USER = {
+    "id": 1000,
+    "is_bot": True,
+    "first_name": "Клиника",
+    "username": "clinic_bench_bot",
+}
+
+# Специальности ответа LLM (ключи specialties_map анализатора)
+SPECIALTIES = (
+    "Терапевт",
+    "Невролог",
+    "Кардиолог",
+    "Офтальмолог",
+    "ЛОР",
+    "Дерматолог",
+    "Гастроэнтеролог",
+)
+
+
+async def start_app(app: web.Application) -> tuple[web.AppRunner, str]:
+    """Запустить приложение на свободном порту 127.0.0.1; runner и базовый URL."""
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+class FakeOpenAI:
+    """OpenAI chat completions: рекомендации в JSON после задержки."""
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        error_rate: float = 0.0,
+        random_seed: int = 42,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.calls: Counter[str] = Counter()
+        self._rng = random.Random(random_seed)
+
+    def app(self) -> web.Application:
+        """aiohttp-приложение сервера."""
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        return app
+
+    async def chat_completions(self, request: web.Request) -> web.Response:
+        """POST /v1/chat/completions."""
+        body = await request.json()
+        # Задержка ±50% вокруг средней: ответы LLM не приходят ровно
+        await asyncio.sleep(self.latency_ms / 1000 * self._rng.uniform(0.5, 1.5))
+        if self._rng.random() < self.error_rate:
+            self.calls["error"] += 1
+            return web.json_response(
+                {"error": {"message": "fake overload", "type": "server_error"}},
+                status=500,
+            )
+        self.calls["ok"] += 1
+
+        symptoms = str(body["messages"][-1]["content"])
+        specialty = SPECIALTIES[sum(map(ord, symptoms)) % len(SPECIALTIES)]
+        content = json.dumps(
+            {
+                "recommendations": [
+                    {
+                        "specialty": specialty,
+                        "confidence": 80,
+                        "reasoning": "Подставной ответ нагрузочного теста",
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        )
+        return web.json_response(
+            {
+                "id": f"chatcmpl-{sum(self.calls.values())}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 1,
+                    "total_tokens": 2,
+                },
+            }
+        )
+
+
+@dataclass
+class Chat:
+    """Сообщения одного чата и ожидающие ответа бота."""
+
+    messages: dict[int, dict[str, Any]] = field(default_factory=dict)
+    reply_waiters: list["asyncio.Future[dict[str, Any]]"] = field(default_factory=list)
+
+
+class FakeTelegram:
+    """
+    Telegram Bot API для одного бота.
+
+    Пользователи пишут через `send_text` и нажимают кнопки через `press`;
+    ответ бота на сообщение ждут через `wait_reply` (следующий sendMessage в
+    чат), на нажатие - через future из `press` (answerCallbackQuery).
+    """
+
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.chats: dict[int, Chat] = {}
+        self._updates: list[dict[str, Any]] = []
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._next_callback_id = 1
+        self._new_updates = asyncio.Event()
+        self._closed = False
+        self._callback_waiters: dict[str, "asyncio.Future[None]"] = {}
+
+    def app(self) -> web.Application:
+        """aiohttp-приложение сервера."""
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.dispatch)
+        return app
+
+    # --- сторона пользователей ---
+
+    @staticmethod
+    def user(chat_id: int) -> dict[str, Any]:
+        """Пользователь личного чата (ID пользователя = ID чата)."""
+        return {
+            "id": chat_id,
+            "is_bot": False,
+            "first_name": "Пациент",
+            "last_name": str(chat_id),
+        }
+
+    def _message(
+        self, chat_id: int, text: str, sender: dict[str, Any], **extra: Any
+    ) -> dict[str, Any]:
+        message = {
+            "message_id": self._next_message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": sender,
+            "text": text,
+            **extra,
+        }
+        self._next_message_id += 1
+        self.chats.setdefault(chat_id, Chat()).messages[message["message_id"]] = message
+        return message
+
+    def _push(self, update: dict[str, Any]) -> None:
+        update["update_id"] = self._next_update_id
+        self._next_update_id += 1
+        self._updates.append(update)
+        self._new_updates.set()
+
+    def wait_reply(self, chat_id: int) -> "asyncio.Future[dict[str, Any]]":
+        """Future следующего сообщения бота в чат (создавать до действия)."""
+        future = asyncio.get_running_loop().create_future()
+        self.chats.setdefault(chat_id, Chat()).reply_waiters.append(future)
+        return future
+
+    def send_text(self, chat_id: int, text: str) -> None:
+        """Пользователь пишет боту."""
+        message = self._message(chat_id, text, self.user(chat_id))
+        self._push({"message": message})
+
+    def press(self, chat_id: int, message_id: int, data: str) -> "asyncio.Future[None]":
+        """Пользователь нажимает кнопку; future - ответ бота на нажатие."""
+        callback_id = str(self._next_callback_id)
+        self._next_callback_id += 1
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._callback_waiters[callback_id] = future
+        self._push(
+            {
+                "callback_query": {
+                    "id": callback_id,
+                    "from": self.user(chat_id),
+                    "chat_instance": str(chat_id),
+                    "data": data,
+                    "message": self.chats[chat_id].messages[message_id],
+                }
+            }
+        )
+        return future
+
+    def message(self, chat_id: int, message_id: int) -> dict[str, Any]:
+        """Текущее состояние сообщения чата."""
+        return self.chats[chat_id].messages[message_id]
+
+    # --- сторона бота ---
+
+    async def dispatch(self, request: web.Request) -> web.Response:
+        """POST /bot{token}/{method}: поля формы или JSON."""
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        if request.content_type == "application/json":
+            params = await request.json()
+        else:
+            params = dict(await request.post())
+        handler = getattr(self, f"_{method}", None)
+        result = handler(params) if handler is not None else True
+        if asyncio.iscoroutine(result):
+            result = await result
+        return web.json_response({"ok": True, "result": result})
+
+    def close(self) -> None:
+        """Отпустить ожидающие getUpdates: сервер останавливается."""
+        self._closed = True
+        self._new_updates.set()
+
+    def _getMe(self, params: dict[str, Any]) -> dict[str, Any]:
+        return BOT_USER
+
+    async def _getUpdates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and not self._closed:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(
+                    self._new_updates.wait(), float(params.get("timeout") or 0)
+                )
+            except asyncio.TimeoutError:
+                return []
+        return self._updates[:limit]
+
+    @staticmethod
+    def _markup(params: dict[str, Any]) -> dict[str, Any]:
+        markup = params.get("reply_markup")
+        if isinstance(markup, str):
+            markup = json.loads(markup)
+        return {"reply_markup": markup} if markup else {}
+
+    def _sendMessage(self, params: dict[str, Any]) -> dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        message = self._message(
+            chat_id, params["text"], BOT_USER, **self._markup(params)
+        )
+        for future in self.chats[chat_id].reply_waiters:
+            if not future.done():
+                future.set_result(message)
+        self.chats[chat_id].reply_waiters.clear()
+        return message
+
+    def _editMessageText(self, params: dict[str, Any]) -> dict[str, Any]:
+        message = self.message(int(params["chat_id"]), int(params["message_id"]))
+        message.pop("reply_markup", None)
+        message.update(
+            text=params["text"], edit_date=int(time.time()), **self._markup(params)
+        )
+        return message
+
+    def _answerCallbackQuery(self, params: dict[str, Any]) -> bool:
+        future = self._callback_waiters.pop(str(params["callback_query_id"]), None)
+        if future is not None and not future.done():
+            future.set_result(None)
+        return True
+
+
+class FakeClinicAPI:
+    """API клиники в памяти: врачи, получасовые слоты 9:00-18:00 UTC, записи."""
+
+    def __init__(self, doctors: int = 10) -> None:
+        self.doctors = [
+            {
+                "id": doctor_id,
+                "name": f"Врач {doctor_id}",
+                "specialization": SPECIALTIES[(doctor_id - 1) % len(SPECIALTIES)],
+            }
+            for doctor_id in range(1, doctors + 1)
+        ]
+        self.calls: Counter[str] = Counter()
+        self.booked: set[tuple[int, datetime]] = set()
+
+    def app(self) -> web.Application:
+        """aiohttp-приложение сервера."""
+        app = web.Application()
+        app.router.add_get("/doctors", self.list_doctors)
+        app.router.add_get("/doctors/{doctor_id}/slots", self.list_slots)
+        app.router.add_post("/appointments", self.create_appointment)
+        return app
+
+    async def list_doctors(self, request: web.Request) -> web.Response:
+        """GET /doctors."""
+        self.calls["GET /doctors"] += 1
+        return web.json_response(self.doctors)
+
+    @staticmethod
+    def _slot_times(after: datetime) -> Iterator[datetime]:
+        start = after.replace(minute=0, second=0, microsecond=0)
+        for step in range(14 * 48):
+            slot = start + timedelta(minutes=30 * step)
+            if slot > after and 9 <= slot.hour < 18:
+                yield slot
+
+    async def list_slots(self, request: web.Request) -> web.Response:
+        """GET /doctors/{id}/slots?after=&limit=."""
+        self.calls["GET /doctors/{id}/slots"] += 1
+        doctor_id = int(request.match_info["doctor_id"])
+        if doctor_id > len(self.doctors):
+            return web.json_response({"detail": "Врач не найден"}, status=404)
+        after = datetime.now(timezone.utc) + timedelta(hours=1)
+        if "after" in request.query:
+            after = max(after, datetime.fromisoformat(request.query["after"]))
+        limit = int(request.query.get("limit", 20))
+
+        rows = []
+        for slot in self._slot_times(after):
+            if (doctor_id, slot) not in self.booked:
+                rows.append({"doctor_id": doctor_id, "start_time": slot.isoformat()})
+                if len(rows) == limit:
+                    break
+        return web.json_response(rows)
+
+    async def create_appointment(self, request: web.Request) -> web.Response:
+        """POST /appointments: 201 или 400, если слот занят."""
+        self.calls["POST /appointments"] += 1
+        body = await request.json()
+        key = (int(body["doctor_id"]), datetime.fromisoformat(body["start_time"]))
+        if key in self.booked:
+            return web.json_response(
+                {"detail": "Врач уже занят в это время"}, status=400
+            )
+        self.booked.add(key)
+        now = datetime.now(timezone.utc).isoformat()
+        return web.json_response(
+            {
+                "id": len(self.booked),
+                "doctor_id": key[0],
+                "patient_name": body["patient_name"],
+                "start_time": key[1].isoformat(),
+                "created_at": now,
+            },
+            status=201,
+        )
+
+
+@dataclass
+class FakeServers:
+    """Запущенные подставные серверы и их адреса."""
+
+    openai: FakeOpenAI
+    telegram: FakeTelegram
+    clinic: FakeClinicAPI
+    openai_url: str = ""
+    telegram_url: str = ""
+    clinic_url: str = ""
+    runners: list[web.AppRunner] = field(default_factory=list)
+
+    @classmethod
+    async def start(
+        cls,
+        openai: FakeOpenAI,
+        telegram: FakeTelegram,
+        clinic: FakeClinicAPI,
+    ) -> "FakeServers":
+        """Запустить серверы на свободных портах."""
+        servers = cls(openai, telegram, clinic)
+        runner, url = await start_app(openai.app())
+        servers.runners.append(runner)
+        servers.openai_url = f"{url}/v1"
+        runner, servers.telegram_url = await start_app(telegram.app())
+        servers.runners.append(runner)
+        runner, servers.clinic_url = await start_app(clinic.app())
+        servers.runners.append(runner)
+        return servers
+
+    def environment(self) -> dict[str, str]:
+        """Переменные окружения бота для работы с подставными серверами."""
+        return {
+            "TELEGRAM_BOT_TOKEN": "123456:FAKE-benchmark-token",
+            "TELEGRAM_API_URL": self.telegram_url,
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": self.openai_url,
+            "CLINIC_API_URL": self.clinic_url,
+        }
+
+    def calls(self) -> dict[str, dict[str, int]]:
+        """Счетчики вызовов по серверам."""
+        return {
+            "openai": dict(self.openai.calls),
+            "telegram": dict(self.telegram.calls),
+            "clinic_api": dict(self.clinic.calls),
+        }
+
+    async def stop(self) -> None:
+        """Остановить серверы."""
+        self.telegram.close()
+        for runner in self.runners:
+            await runner.cleanup()
@@ -0,0 +1,308 @@
+"""
+Нагрузочный тест Telegram-бота без сети.
+
+Настоящие Bot и Dispatcher из bot/main.py с роутером симптомов работают в
+одном процессе с подставными серверами OpenAI, Telegram Bot API и API
+клиники (benchmarks/bot/fakes.py); обновления бот получает через
+getUpdates, как в продакшене. Каждый диалог - отдельный пользователь:
+описывает симптомы, выбирает рекомендованного врача и бронирует случайный
+слот из первой страницы. Измеряются пропускная способность обработчиков
+(обновлений в секунду), задержка от действия пользователя до ответа бота
+по шагам и по диалогу целиком, исходы диалогов и число вызовов каждого API.
+
+Примеры:
+    python -m benchmarks.bot.load --conversations 2000 --concurrency 200
+    python -m benchmarks.bot.load --openai-latency-ms 3000 \\
+        --openai-error-rate 0.2 --hedge-ms 500
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.bot.fakes import FakeClinicAPI, FakeOpenAI, FakeServers, FakeTelegram
+from benchmarks.common import LatencyRecorder, quiet_logging, summarize, write_result
+
+# Фрагменты сообщений: ключевые слова правил и фразы, которых в правилах нет
+SYMPTOM_FRAGMENTS = (
+    "сильная головная боль",
+    "головокружение по утрам",
+    "боль в груди при нагрузке",
+    "одышка",
+    "слезятся глаза",
+    "болит горло",
+    "насморк и кашель",
+    "сыпь на руках",
+    "тошнота после еды",
+    "общая слабость",
+    "плохо сплю",
+    "быстро устаю",
+)
+
+# Первый ID чата; пользователь диалога i пишет из чата FIRST_CHAT_ID + i
+FIRST_CHAT_ID = 100_000
+
+
+@dataclass(frozen=True)
+class BotLoadConfig:
+    """Параметры запуска."""
+
+    conversations: int = 1000
+    concurrency: int = 100
+    doctors: int = 10
+    openai_latency_ms: float = 300.0
+    openai_error_rate: float = 0.0
+    hedge_ms: int = 0
+    symptom_variants: int = 200
+    step_timeout_seconds: float = 30.0
+    random_seed: int = 42
+
+
+def build_symptoms(variants: int, rng: random.Random) -> list[str]:
+    """Различные тексты симптомов; повторы в диалогах попадают в кэш анализа."""
+    texts = []
+    for day in range(1, variants + 1):
+        fragments = rng.sample(SYMPTOM_FRAGMENTS, rng.randint(1, 3))
+        texts.append(f"{', '.join(fragments).capitalize()}, {day}-й день")
+    return texts
+
+
+def pick_button(message: dict[str, Any], prefix: str, rng: random.Random) -> Any:
+    """callback_data случайной кнопки сообщения с префиксом или None."""
+    rows = (message.get("reply_markup") or {}).get("inline_keyboard", [])
+    choices = [
+        button["callback_data"]
+        for row in rows
+        for button in row
+        if button.get("callback_data", "").startswith(prefix)
+    ]
+    return rng.choice(choices) if choices else None
+
+
+class Conversations:
+    """Диалоги пользователей с ботом через подставной Telegram."""
+
+    def __init__(
+        self, telegram: FakeTelegram, config: BotLoadConfig, rng: random.Random
+    ) -> None:
+        self.telegram = telegram
+        self.config = config
+        self.rng = rng
+        self.symptoms = build_symptoms(config.symptom_variants, rng)
+        self.steps = LatencyRecorder()
+        self.latencies: list[float] = []
+        self.outcomes: Counter[str] = Counter()
+
+    async def _step(self, name: str, reply: "asyncio.Future[Any]") -> Any:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(reply, self.config.step_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.steps.record(name, time.perf_counter() - started, "timeout")
+            raise
+        self.steps.record(name, time.perf_counter() - started, "ok")
+        return result
+
+    async def _converse(self, chat_id: int) -> str:
+        telegram = self.telegram
+        reply = telegram.wait_reply(chat_id)
+        telegram.send_text(chat_id, self.rng.choice(self.symptoms))
+        message = await self._step("symptoms", reply)
+        message_id = message["message_id"]
+
+        data = pick_button(message, "select_doctor_", self.rng)
+        if data is None:
+            return "no_recommendations"
+        await self._step("slots", telegram.press(chat_id, message_id, data))
+
+        data = pick_button(telegram.message(chat_id, message_id), "book_", self.rng)
+        if data is None:
+            return "no_slots"
+        await self._step("book", telegram.press(chat_id, message_id, data))
+
+        text = telegram.message(chat_id, message_id)["text"]
+        return "booked" if text.startswith("✅") else "rejected"
+
+    async def converse(self, chat_id: int) -> None:
+        """Один диалог от симптомов до записи."""
+        started = time.perf_counter()
+        try:
+            outcome = await self._converse(chat_id)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        self.latencies.append(time.perf_counter() - started)
+        self.outcomes[outcome] += 1
+
+    async def run(self) -> float:
+        """Провести все диалоги `concurrency` воркерами; время прогона."""
+        chat_ids = iter(range(FIRST_CHAT_ID, FIRST_CHAT_ID + self.config.conversations))
+
+        async def worker() -> None:
+            for chat_id in chat_ids:
+                await self.converse(chat_id)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.config.concurrency)))
+        return time.perf_counter() - started
+
+
+def configure_bot(servers: FakeServers, config: BotLoadConfig) -> None:
+    """
+    Направить бота на подставные серверы.
+
+    Настройки бота читаются из окружения при импорте, поэтому окружение
+    задается до импорта модулей бота, а уже созданные настройки и
+    синглтоны процесса перечитываются.
+    """
+    os.environ.update(servers.environment())
+    os.environ["LLM_HEDGE_MS"] = str(config.hedge_ms)
+    for name, value in (
+        ("AI_MODEL", "gpt-4.1"),
+        ("AI_TEMPERATURE", "0.3"),
+        ("TIMEZONE", "Europe/Moscow"),
+    ):
+        os.environ.setdefault(name, value)
+
+    from bot.ai.analyzer import get_symptom_analyzer
+    from bot.api.clinic_client import get_clinic_client
+    from bot.config.settings import BotSettings, bot_settings
+
+    fresh = BotSettings()  # type: ignore[call-arg]
+    for name in BotSettings.model_fields:
+        setattr(bot_settings, name, getattr(fresh, name))
+    get_symptom_analyzer.cache_clear()
+    get_clinic_client.cache_clear()
+
+
+async def run_bot_load(config: BotLoadConfig) -> dict[str, Any]:
+    """Запустить серверы и бота, провести диалоги и вернуть отчет."""
+    servers = await FakeServers.start(
+        FakeOpenAI(
+            config.openai_latency_ms, config.openai_error_rate, config.random_seed
+        ),
+        FakeTelegram(),
+        FakeClinicAPI(config.doctors),
+    )
+    try:
+        configure_bot(servers, config)
+        from bot.ai.analyzer import get_symptom_analyzer
+        from bot.api.clinic_client import close_clinic_client, get_clinic_client
+        from bot.main import create_bot, create_dispatcher
+
+        # bot.main настраивает логирование при импорте
+        quiet_logging()
+        logging.getLogger("aiogram").setLevel(logging.WARNING)
+
+        analyzer = get_symptom_analyzer()
+        dp = create_dispatcher(analyzer)
+        conversations = Conversations(
+            servers.telegram, config, random.Random(config.random_seed)
+        )
+        # Отладочные print обработчиков искажают измерения
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            await get_clinic_client().doctors.warm()
+            polling = asyncio.create_task(
+                dp.start_polling(create_bot(), handle_signals=False)
+            )
+            try:
+                elapsed = await conversations.run()
+            finally:
+                await dp.stop_polling()
+                await polling
+                await close_clinic_client()
+                await analyzer.close()
+    finally:
+        await servers.stop()
+
+    report = conversations.steps.report(elapsed)
+    return {
+        "config": asdict(config),
+        "elapsed_s": round(elapsed, 3),
+        # total - обработанные обновления (сообщения и нажатия)
+        "updates": report["total"],
+        "steps": report["operations"],
+        "conversations": {
+            **summarize(conversations.latencies, elapsed),
+            "outcomes": dict(conversations.outcomes),
+        },
+        "analysis_cache": {
+            "hits": analyzer.cache.hits,
+            "misses": analyzer.cache.misses,
+        },
+        "api_calls": servers.calls(),
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    defaults = BotLoadConfig()
+    parser.add_argument("--conversations", type=int, default=defaults.conversations)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--doctors", type=int, default=defaults.doctors)
+    parser.add_argument(
+        "--openai-latency-ms", type=float, default=defaults.openai_latency_ms
+    )
+    parser.add_argument(
+        "--openai-error-rate", type=float, default=defaults.openai_error_rate
+    )
+    parser.add_argument("--hedge-ms", type=int, default=defaults.hedge_ms)
+    parser.add_argument(
+        "--symptom-variants", type=int, default=defaults.symptom_variants
+    )
+    parser.add_argument(
+        "--step-timeout-seconds", type=float, default=defaults.step_timeout_seconds
+    )
+    parser.add_argument("--random-seed", type=int, default=defaults.random_seed)
+    parser.add_argument("--output-dir", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Точка входа CLI."""
+    args = parse_args(argv)
+    quiet_logging()
+
+    config = BotLoadConfig(
+        conversations=args.conversations,
+        concurrency=args.concurrency,
+        doctors=args.doctors,
+        openai_latency_ms=args.openai_latency_ms,
+        openai_error_rate=args.openai_error_rate,
+        hedge_ms=args.hedge_ms,
+        symptom_variants=args.symptom_variants,
+        step_timeout_seconds=args.step_timeout_seconds,
+        random_seed=args.random_seed,
+    )
+    result = asyncio.run(run_bot_load(config))
+    path = write_result("bot-load", result, args.output_dir)
+
+    updates = result["updates"]
+    dialogs = result["conversations"]
+    print(
+        f"Бот: {updates['throughput_rps']} обновлений/с, "
+        f"{dialogs['throughput_rps']} диалогов/с; диалог p50={dialogs['p50_ms']} ms, "
+        f"p95={dialogs['p95_ms']} ms, p99={dialogs['p99_ms']} ms"
+    )
+    for step, stats in result["steps"].items():
+        print(
+            f"  {step}: p50={stats['p50_ms']} ms, p99={stats['p99_ms']} ms, "
+            f"statuses={stats['statuses']}"
+        )
+    print(f"  исходы: {dialogs['outcomes']}")
+    print(f"  кэш анализа: {result['analysis_cache']}")
+    for server, calls in result["api_calls"].items():
+        print(f"  {server}: {calls}")
+    print(f"Результат сохранен: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Общие утилиты бенчмарков: БД, слоты, статистика и сохранение результатов."""
+
+import json
+import logging
+import math
+import platform
+import subprocess
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.settings import get_settings
+from app.db.database import Base, get_db
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./benchmark.db"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Рабочие слоты клиники: 9:00-17:30 с шагом 30 минут
+SLOT_TIMES = [(hour, minute) for hour in range(9, 18) for minute in (0, 30)]
+
+
+def quiet_logging() -> None:
+    """Отключить логи каждого запроса: они искажают измерения."""
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Перцентиль методом ближайшего ранга по отсортированной выборке."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict[str, float]:
+    """Сводка по латентностям (в секундах): пропускная способность и перцентили."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "count": count,
+        "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+@dataclass
+class LatencyRecorder:
+    """Накопитель латентностей и статусов по типам операций."""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    statuses: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def record(self, operation: str, latency: float, status: int | str) -> None:
+        """Записать результат одной операции."""
+        self.latencies.setdefault(operation, []).append(latency)
+        counters = self.statuses.setdefault(operation, {})
+        counters[str(status)] = counters.get(str(status), 0) + 1
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        """Сводка по всем операциям и по каждой отдельно."""
+        all_latencies = [
+            value for values in self.latencies.values() for value in values
+        ]
+        return {
+            "total": summarize(all_latencies, elapsed),
+            "operations": {
+                operation: {
+                    **summarize(values, elapsed),
+                    "statuses": self.statuses.get(operation, {}),
+                }
+                for operation, values in sorted(self.latencies.items())
+            },
+        }
+
+
+def clinic_timezone() -> ZoneInfo:
+    """Часовой пояс клиники из настроек приложения."""
+    return ZoneInfo(get_settings().timezone)
+
+
+def iter_working_slots(days: int, start: Optional[date] = None) -> Iterator[datetime]:
+    """Рабочие слоты (пн-пт, 9:00-17:30) начиная с завтрашнего дня, в UTC."""
+    clinic_tz = clinic_timezone()
+    first_day = start or (datetime.now(clinic_tz) + timedelta(days=1)).date()
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        if day.weekday() > 4:
+            continue
+        for hour, minute in SLOT_TIMES:
+            local = datetime(
+                day.year, day.month, day.day, hour, minute, tzinfo=clinic_tz
+            )
+            yield local.astimezone(timezone.utc)
+
+
+@dataclass
+class BenchmarkDatabase:
+    """Отдельная БД для бенчмарка с чистой схемой."""
+
+    url: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+
+    @property
+    def dialect(self) -> str:
+        """Имя диалекта (sqlite, postgresql)."""
+        return self.engine.dialect.name
+
+
+@asynccontextmanager
+async def benchmark_database(
+    url: str = DEFAULT_DATABASE_URL, reset: bool = True, **engine_kwargs: Any
+) -> AsyncIterator[BenchmarkDatabase]:
+    """
+    Подключиться к БД бенчмарка и (по умолчанию) пересоздать схему.
+
+    Схема пересоздается через metadata моделей, поэтому используйте
+    отдельную базу, а не рабочую.
+    """
+    engine = create_async_engine(url, **engine_kwargs)
+    if reset:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    sessionmaker = async_sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=engine,
+        class_=AsyncSession,
+    )
+    try:
+        yield BenchmarkDatabase(url=url, engine=engine, sessionmaker=sessionmaker)
+    finally:
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def override_app_db(
+    app: FastAPI, sessionmaker: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[None]:
+    """Подменить зависимость get_db приложения на БД бенчмарка."""
+
+    async def bench_get_db() -> AsyncIterator[AsyncSession]:
+        async with sessionmaker() as session:
+            yield session
+
+    original_overrides = app.dependency_overrides.copy()
+    app.dependency_overrides[get_db] = bench_get_db
+    try:
+        yield
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(original_overrides)
+
+
+async def seed_doctors(
+    sessionmaker: async_sessionmaker[AsyncSession], count: int
+) -> list[int]:
+    """Создать активных врачей и вернуть их ID."""
+    async with sessionmaker() as session:
+        doctors = [
+            Doctor(name=f"Врач {i}", specialization="Терапевт", is_active=True)
+            for i in range(1, count + 1)
+        ]
+        session.add_all(doctors)
+        await session.commit()
+        return [doctor.id for doctor in doctors]
+
+
+async def seed_appointments(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    slots: list[tuple[int, datetime]],
+) -> list[int]:
+    """Создать записи на заданные (doctor_id, start_time) и вернуть их ID."""
+    async with sessionmaker() as session:
+        appointments = [
+            Appointment(
+                doctor_id=doctor_id, patient_name="Пациент", start_time=start_time
+            )
+            for doctor_id, start_time in slots
+        ]
+        session.add_all(appointments)
+        await session.commit()
+        return [appointment.id for appointment in appointments]
+
+
+def git_revision() -> str:
+    """Текущий коммит (или 'unknown' вне git)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_result(
+    name: str, payload: dict[str, Any], output_dir: Optional[Path] = None
+) -> Path:
+    """Сохранить результат бенчмарка в JSON с метаданными запуска."""
+    output_dir = output_dir or RESULTS_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    revision = git_revision()
+    started_at = datetime.now(timezone.utc)
+    document = {
+        "benchmark": name,
+        "git_revision": revision,
+        "timestamp": started_at.isoformat(),
+        "python": platform.python_version(),
+        **payload,
+    }
+
+    path = output_dir / f"{name}-{revision}-{started_at:%Y%m%dT%H%M%S}.json"
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2))
+    return path
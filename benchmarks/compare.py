@@ -0,0 +1,61 @@
+"""
+Сравнение двух результатов бенчмарка (например, до и после изменения).
+
+Пример:
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def load(path: Path) -> dict[str, Any]:
+    """Прочитать JSON-результат."""
+    data: dict[str, Any] = json.loads(path.read_text())
+    return data
+
+
+def delta_percent(before: float, after: float) -> str:
+    """Изменение в процентах относительно базового значения."""
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> list[str]:
+    """Построчное сравнение метрик total и каждой операции."""
+    sections = {"total": (before.get("total", {}), after.get("total", {}))}
+    for operation, stats in after.get("operations", {}).items():
+        sections[operation] = (before.get("operations", {}).get(operation, {}), stats)
+
+    lines = [
+        f"{before.get('git_revision')} -> {after.get('git_revision')} "
+        f"({after.get('benchmark')})"
+    ]
+    for section, (old, new) in sections.items():
+        lines.append(f"[{section}]")
+        for metric in METRICS:
+            if metric in old and metric in new:
+                lines.append(
+                    f"  {metric:>15}: {old[metric]:>10} -> {new[metric]:>10} "
+                    f"({delta_percent(old[metric], new[metric])})"
+                )
+    return lines
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Точка входа CLI."""
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарка")
+    parser.add_argument("before", type=Path)
+    parser.add_argument("after", type=Path)
+    args = parser.parse_args(argv)
+
+    print("\n".join(compare(load(args.before), load(args.after))))
+
+
+if __name__ == "__main__":
+    main()
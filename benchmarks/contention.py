@@ -0,0 +1,256 @@
+"""
+Бенчмарк конкуренции за слоты одного врача ("утренний выброс слотов").
+
+N клиентов одновременно отправляют POST /appointments к одному врачу
+на K слотов. Измеряются успешные бронирования в секунду, доля отказов
+после проверки доступности и после IntegrityError, время внутри
+`check_doctor_availability` (ожидание блокировки + проверка) и хвостовые
+задержки. В конце проверяется, что двойных записей нет.
+
+Пример:
+    python -m benchmarks.contention --clients 500 --slots 5
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+import app.crud.appointment as appointment_crud
+from app.main import app
+from app.models.appointment import Appointment
+from benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    benchmark_database,
+    iter_working_slots,
+    override_app_db,
+    quiet_logging,
+    seed_doctors,
+    summarize,
+    write_result,
+)
+
+API_LOGGER = "app.api.appointments"
+INTEGRITY_LOG_PREFIX = "Ошибка целостности"
+
+
+@dataclass(frozen=True)
+class ContentionConfig:
+    """Параметры запуска."""
+
+    clients: int = 200
+    slots: int = 5
+    database_url: str = DEFAULT_DATABASE_URL
+    pool_size: int = 20
+
+
+class IntegrityErrorCounter(logging.Handler):
+    """Считает отказы, пришедшие из IntegrityError (по логу API-слоя)."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Учесть запись лога."""
+        if record.getMessage().startswith(INTEGRITY_LOG_PREFIX):
+            self.count += 1
+
+
+@contextmanager
+def capture_integrity_errors() -> Iterator[IntegrityErrorCounter]:
+    """Подключить счетчик IntegrityError к логгеру API на время прогона."""
+    logger = logging.getLogger(API_LOGGER)
+    counter = IntegrityErrorCounter()
+    original_level, original_propagate = logger.level, logger.propagate
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+    logger.addHandler(counter)
+    try:
+        yield counter
+    finally:
+        logger.removeHandler(counter)
+        logger.setLevel(original_level)
+        logger.propagate = original_propagate
+
+
+@contextmanager
+def time_availability_checks() -> Iterator[list[tuple[float, bool]]]:
+    """Замерять каждый вызов check_doctor_availability: (длительность, свободно)."""
+    original = appointment_crud.check_doctor_availability
+    samples: list[tuple[float, bool]] = []
+
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        result = await original(*args, **kwargs)
+        samples.append((time.perf_counter() - started, result[0]))
+        return result
+
+    appointment_crud.check_doctor_availability = timed  # type: ignore[assignment]
+    try:
+        yield samples
+    finally:
+        appointment_crud.check_doctor_availability = original
+
+
+async def find_double_bookings(database: Any) -> list[tuple[int, Any, int]]:
+    """Пары (врач, время), на которые больше одной записи."""
+    async with database.sessionmaker() as session:
+        result = await session.execute(
+            select(Appointment.doctor_id, Appointment.start_time, func.count())
+            .group_by(Appointment.doctor_id, Appointment.start_time)
+            .having(func.count() > 1)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+async def count_appointments(database: Any) -> int:
+    """Общее число записей в БД."""
+    async with database.sessionmaker() as session:
+        total = await session.scalar(select(func.count()).select_from(Appointment))
+        return int(total or 0)
+
+
+async def race(
+    doctor_id: int, slots: list[str], clients: int
+) -> tuple[list[tuple[float, int]], float]:
+    """Одновременно выпустить всех клиентов и вернуть (латентность, статус)."""
+    start_gate = asyncio.Event()
+    results: list[tuple[float, int]] = []
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def patient(index: int) -> None:
+            payload = {
+                "doctor_id": doctor_id,
+                "patient_name": f"Пациент {index}",
+                "start_time": slots[index % len(slots)],
+            }
+            await start_gate.wait()
+            started = time.perf_counter()
+            response = await client.post("/appointments", json=payload)
+            results.append((time.perf_counter() - started, response.status_code))
+
+        tasks = [asyncio.create_task(patient(i)) for i in range(clients)]
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        start_gate.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return results, elapsed
+
+
+async def run_contention(config: ContentionConfig) -> dict[str, Any]:
+    """Подготовить БД, провести гонку и вернуть отчет."""
+    engine_kwargs: dict[str, Any] = {}
+    if not config.database_url.startswith("sqlite"):
+        engine_kwargs = {"pool_size": config.pool_size, "max_overflow": 0}
+
+    async with benchmark_database(config.database_url, **engine_kwargs) as database:
+        (doctor_id,) = await seed_doctors(database.sessionmaker, 1)
+        slot_iter = iter_working_slots(days=14)
+        slots = [next(slot_iter).isoformat() for _ in range(config.slots)]
+
+        with (
+            capture_integrity_errors() as integrity_errors,
+            time_availability_checks() as checks,
+        ):
+            async with override_app_db(app, database.sessionmaker):
+                results, elapsed = await race(doctor_id, slots, config.clients)
+
+        statuses: dict[str, int] = {}
+        for _, status in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        successes = statuses.get("201", 0)
+        rejected = statuses.get("400", 0)
+
+        double_bookings = await find_double_bookings(database)
+        stored = await count_appointments(database)
+
+        return {
+            "config": asdict(config),
+            "dialect": database.dialect,
+            "elapsed_s": round(elapsed, 3),
+            "bookings_per_second": round(successes / elapsed, 2) if elapsed else 0.0,
+            "outcomes": {
+                "booked": successes,
+                "rejected_by_availability_check": rejected - integrity_errors.count,
+                "rejected_by_integrity_error": integrity_errors.count,
+                "other": config.clients - successes - rejected,
+            },
+            "statuses": statuses,
+            "latency": summarize([latency for latency, _ in results], elapsed),
+            "availability_check": {
+                **summarize([duration for duration, _ in checks], elapsed),
+                "reported_free": sum(1 for _, free in checks if free),
+            },
+            "consistency": {
+                "stored_appointments": stored,
+                "double_bookings": len(double_bookings),
+                "ok": not double_bookings
+                and stored == successes
+                and successes <= config.slots,
+            },
+        }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=ContentionConfig.clients)
+    parser.add_argument("--slots", type=int, default=ContentionConfig.slots)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--pool-size", type=int, default=ContentionConfig.pool_size)
+    parser.add_argument("--output-dir", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Точка входа CLI."""
+    args = parse_args(argv)
+    quiet_logging()
+
+    config = ContentionConfig(
+        clients=args.clients,
+        slots=args.slots,
+        database_url=args.database_url,
+        pool_size=args.pool_size,
+    )
+    result = asyncio.run(run_contention(config))
+    path = write_result(f"contention-{result['dialect']}", result, args.output_dir)
+
+    latency = result["latency"]
+    check = result["availability_check"]
+    print(
+        f"{config.clients} клиентов -> {config.slots} слотов [{result['dialect']}]: "
+        f"{result['bookings_per_second']} бронирований/с"
+    )
+    print(f"  исходы: {result['outcomes']}")
+    print(
+        f"  латентность: p50={latency['p50_ms']} ms, p95={latency['p95_ms']} ms, "
+        f"p99={latency['p99_ms']} ms"
+    )
+    print(
+        f"  check_doctor_availability: p50={check['p50_ms']} ms, "
+        f"p99={check['p99_ms']} ms"
+    )
+    print(f"  консистентность: {result['consistency']}")
+    print(f"Результат сохранен: {path}")
+
+    if not result["consistency"]["ok"]:
+        sys.exit("Обнаружены двойные записи или расхождение счетчиков!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Микробенчмарки горячих функций (pytest-benchmark)."""
@@ -0,0 +1,51 @@
+"""
+Общие фикстуры микробенчмарков.
+
+Медиана каждого бенчмарка сравнивается с порогом из `thresholds.json`.
+Порог можно ослабить на медленной машине через BENCH_THRESHOLD_FACTOR.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+THRESHOLDS_FILE = Path(__file__).resolve().parent / "thresholds.json"
+THRESHOLD_FACTOR = float(os.getenv("BENCH_THRESHOLD_FACTOR", "1.0"))
+
+
+def load_thresholds() -> dict[str, dict[str, float]]:
+    """Прочитать пороги (медиана в микросекундах) по именам бенчмарков."""
+    data: dict[str, dict[str, float]] = json.loads(THRESHOLDS_FILE.read_text())
+    return data
+
+
+@pytest.fixture(scope="session")
+def thresholds() -> dict[str, dict[str, float]]:
+    """Пороги регрессии."""
+    return load_thresholds()
+
+
+@pytest.fixture
+def guarded_benchmark(
+    benchmark: Any, request: pytest.FixtureRequest, thresholds: dict
+) -> Callable[..., Any]:
+    """Запустить бенчмарк и упасть, если медиана превышает порог."""
+    name = request.node.name
+
+    def run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        result = benchmark(func, *args, **kwargs)
+        if benchmark.stats is None:  # --benchmark-disable
+            return result
+
+        assert name in thresholds, f"Нет порога для {name} в {THRESHOLDS_FILE.name}"
+        limit_us = thresholds[name]["median_us"] * THRESHOLD_FACTOR
+        median_us = benchmark.stats.stats.median * 1_000_000
+        assert (
+            median_us <= limit_us
+        ), f"{name}: медиана {median_us:.1f} мкс превышает порог {limit_us:.1f} мкс"
+        return result
+
+    return run
@@ -0,0 +1,75 @@
+"""Микробенчмарки горячих функций Telegram-бота."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("openai")
+
+from bot.ai.analyzer import SymptomAnalyzer  # noqa: E402
+from bot.ai.rules import Rule, RuleMatcher, get_rule_matcher  # noqa: E402
+from bot.api.clinic_client import parse_slots  # noqa: E402
+
+SYMPTOMS = {
+    "neurology": "Третий день сильная головная боль и головокружение по утрам",
+    "multi": "Болит горло, кашель, сыпь на руках и тошнота после еды",
+    "no_match": "Чувствую общую слабость, быстро устаю, плохо сплю",
+}
+
+
+@pytest.fixture(scope="module")
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Отдельный event loop для синхронного запуска корутин в бенчмарке."""
+    event_loop = asyncio.new_event_loop()
+    yield event_loop
+    event_loop.close()
+
+
+@pytest.mark.parametrize("case", sorted(SYMPTOMS))
+def test_analyze_with_rules(
+    guarded_benchmark: Any, loop: asyncio.AbstractEventLoop, case: str
+) -> None:
+    """Rule-based анализ симптомов (fallback при недоступности LLM)."""
+    analyzer = SymptomAnalyzer()
+
+    result = guarded_benchmark(
+        lambda: loop.run_until_complete(analyzer._analyze_with_rules(SYMPTOMS[case]))
+    )
+
+    assert 1 <= len(result) <= 3
+
+
+def test_rule_matcher_many_rules(guarded_benchmark: Any) -> None:
+    """Сопоставление с 500 дополнительными правилами: время не растет с их числом."""
+    rules = get_rule_matcher()
+    extra = [
+        Rule(f"Специальность {i}", 100 + i, 50, "", (f"симптом{i}", f"признак{i} боли"))
+        for i in range(500)
+    ]
+    matcher = RuleMatcher(extra + rules.rules, rules.fallback, rules.alternative)
+
+    result = guarded_benchmark(matcher.match, SYMPTOMS["multi"])
+
+    assert len(result) == 3
+
+
+def test_parse_slots(guarded_benchmark: Any) -> None:
+    """Разбор ответа GET /doctors/{id}/slots (неделя слотов врача)."""
+    first = datetime(2030, 3, 4, 6, 0, tzinfo=timezone.utc)
+    rows = [
+        {
+            "doctor_id": 1,
+            "doctor_name": "Доктор Иванов",
+            "specialization": "Терапевт",
+            "start_time": (first + timedelta(minutes=30 * i)).isoformat(),
+            "duration_minutes": 30,
+        }
+        for i in range(90)
+    ]
+
+    result = guarded_benchmark(parse_slots, rows)
+
+    assert len(result) == 90
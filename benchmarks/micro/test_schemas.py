@@ -0,0 +1,98 @@
+"""Микробенчмарки валидации и сериализации схем записей."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.settings import get_settings
+from app.models.appointment import Appointment
+from app.schemas.appointment import AppointmentCreate, AppointmentResponse
+
+
+def next_working_day_after(day: datetime) -> datetime:
+    """Ближайший рабочий день (пн-пт) не раньше заданного."""
+    while day.weekday() > 4:
+        day += timedelta(days=1)
+    return day
+
+
+def clinic_slot(day: datetime) -> datetime:
+    """10:00 по времени клиники в заданный день."""
+    clinic_tz = ZoneInfo(get_settings().timezone)
+    return datetime(day.year, day.month, day.day, 10, 0, tzinfo=clinic_tz)
+
+
+def us_dst_switch_day() -> datetime:
+    """Понедельник после перехода США на летнее время (второе вс марта) в след. году."""
+    year = datetime.now(timezone.utc).year + 1
+    march_first = datetime(year, 3, 1)
+    second_sunday = march_first + timedelta(days=(6 - march_first.weekday()) % 7 + 7)
+    return second_sunday + timedelta(days=1)
+
+
+def start_times() -> dict[str, str]:
+    """Одно и то же рабочее время клиники в разных записях timezone."""
+    regular = clinic_slot(next_working_day_after(datetime.now() + timedelta(days=14)))
+    dst = clinic_slot(us_dst_switch_day())
+    return {
+        "clinic_offset": regular.isoformat(),
+        "utc_z": regular.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "asia_offset": regular.astimezone(ZoneInfo("Asia/Tokyo")).isoformat(),
+        "us_dst_switch": dst.astimezone(ZoneInfo("America/New_York")).isoformat(),
+    }
+
+
+START_TIMES = start_times()
+
+
+@pytest.mark.parametrize("variant", sorted(START_TIMES))
+def test_appointment_create_valid(guarded_benchmark: Any, variant: str) -> None:
+    """Валидация корректной записи (validate_start_time по разным timezone)."""
+    payload = {
+        "doctor_id": 1,
+        "patient_name": "  Иван Иванов  ",
+        "start_time": START_TIMES[variant],
+    }
+
+    result = guarded_benchmark(AppointmentCreate.model_validate, payload)
+
+    assert result.start_time.tzinfo == timezone.utc
+
+
+def test_appointment_create_rejected(guarded_benchmark: Any) -> None:
+    """Стоимость отказа валидации (время не кратно 30 минутам)."""
+    start = datetime.fromisoformat(START_TIMES["clinic_offset"]) + timedelta(minutes=15)
+    payload = {"doctor_id": 1, "patient_name": "Иван", "start_time": start.isoformat()}
+
+    def validate() -> bool:
+        try:
+            AppointmentCreate.model_validate(payload)
+        except ValidationError:
+            return False
+        return True
+
+    assert guarded_benchmark(validate) is False
+
+
+def test_appointment_response_from_orm(guarded_benchmark: Any) -> None:
+    """Сериализация ответа из ORM-объекта (from_attributes)."""
+    now = datetime.now(timezone.utc)
+    appointment = Appointment(
+        id=1,
+        doctor_id=1,
+        patient_name="Иван Иванов",
+        start_time=now,
+        duration_minutes=30,
+        # Умолчания колонок заполняются только при flush, у загруженной
+        # из БД записи они уже есть
+        end_time=now + timedelta(minutes=30),
+        created_at=now,
+        updated_at=now,
+    )
+
+    result = guarded_benchmark(AppointmentResponse.model_validate, appointment)
+
+    assert result.id == 1
@@ -4,17 +4,22 @@
 ВНИМАНИЕ: Это STUB-реализация для демонстрации архитектуры!
 """
 
+import asyncio
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, cast
 
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
+from bot.ai.llm_client import CircuitBreaker, GovernedLLMClient
+from bot.ai.rules import get_rule_matcher, normalize_symptoms
 from bot.config.settings import bot_settings
+from bot.utils.ttl_cache import TTLCache
 
 
-@dataclass
+@dataclass(frozen=True)
 class DoctorRecommendation:
     """Рекомендация врача на основе анализа симптомов"""
 
@@ -24,18 +29,52 @@ class DoctorRecommendation:
     reasoning: Optional[str]  # Обоснование рекомендации
 
 
+AnalysisTask = asyncio.Task[tuple[tuple[DoctorRecommendation, ...], bool]]
+
+
 class SymptomAnalyzer:
     """
     STUB: Анализатор симптомов с использованием ИИ
 
     Демонстрирует архитектуру интеграции с OpenAI GPT-4
     и fallback на rule-based анализ.
+
+    Один объект на процесс бота (`get_symptom_analyzer()`): клиент OpenAI и
+    его пул соединений создаются один раз. Результаты анализа кэшируются по
+    нормализованному тексту (LRU с TTL), одинаковые сообщения в полете
+    ждут один запрос к LLM.
+
+    Вызовы LLM идут через GovernedLLMClient (лимит параллелизма, срок,
+    выключатель). В режиме hedge (`LLM_HEDGE_MS` > 0) правила отвечают, если
+    LLM молчит дольше порога; поздний ответ LLM сохраняется в кэш.
     """
 
-    def __init__(self) -> None:
-        self.client: Optional[AsyncOpenAI] = None
+    def __init__(
+        self, cache_size: int = 1024, cache_ttl_seconds: float = 3600.0
+    ) -> None:
+        self.llm: Optional[GovernedLLMClient] = None
         if bot_settings.openai_api_key:
-            self.client = AsyncOpenAI(api_key=bot_settings.openai_api_key)
+            self.llm = GovernedLLMClient(
+                # Повторы и срок задает GovernedLLMClient, а не клиент OpenAI
+                AsyncOpenAI(
+                    api_key=bot_settings.openai_api_key,
+                    base_url=bot_settings.openai_base_url,
+                    max_retries=0,
+                    timeout=bot_settings.llm_timeout_seconds,
+                ),
+                max_concurrency=bot_settings.llm_max_concurrency,
+                timeout_seconds=bot_settings.llm_timeout_seconds,
+                breaker=CircuitBreaker(
+                    bot_settings.llm_breaker_failures,
+                    bot_settings.llm_breaker_reset_seconds,
+                ),
+            )
+        self.hedge_seconds = bot_settings.llm_hedge_ms / 1000
+        self._late_answers: set["asyncio.Task[List[DoctorRecommendation]]"] = set()
+        self.cache: TTLCache[str, tuple[DoctorRecommendation, ...]] = TTLCache(
+            cache_size, cache_ttl_seconds
+        )
+        self._inflight: dict[str, AnalysisTask] = {}
 
         # STUB: Мапинг специальностей на ID врачей (в реальности будет из API)
         self.specialties_map = {
@@ -58,17 +97,76 @@ class SymptomAnalyzer:
         Returns:
             Список рекомендаций врачей, отсортированный по релевантности
         """
+        key = normalize_symptoms(symptoms)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._analyze(symptoms, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        result, _ = await asyncio.shield(task)
+        return list(result)
+
+    def _finish(self, key: str, task: "AnalysisTask") -> None:
+        """Снять анализ из полета и закэшировать удачный результат."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result, cacheable = task.result()
+        if cacheable:
+            self.cache.set(key, result)
+
+    async def _analyze(
+        self, symptoms: str, key: str
+    ) -> tuple[tuple[DoctorRecommendation, ...], bool]:
+        """Анализ без кэша; второй элемент - можно ли кэшировать результат."""
         print(f"STUB: Анализируем симптомы: {symptoms}")
 
+        if self.llm is None:
+            return tuple(await self._analyze_with_rules(symptoms)), True
+
+        llm_task = asyncio.create_task(self._analyze_with_openai(symptoms))
+        if self.hedge_seconds > 0:
+            done, _ = await asyncio.wait({llm_task}, timeout=self.hedge_seconds)
+            if not done:
+                # Пользователь не ждет LLM дольше порога; поздний ответ
+                # попадет в кэш для следующих таких же сообщений
+                self._late_answers.add(llm_task)
+                llm_task.add_done_callback(lambda task: self._late_answer(key, task))
+                print("STUB: LLM не ответил вовремя, отвечают правила")
+                return tuple(await self._analyze_with_rules(symptoms)), False
+
         try:
-            if self.client:
-                return await self._analyze_with_openai(symptoms)
-            else:
-                return await self._analyze_with_rules(symptoms)
+            recommendations = await llm_task
+            if recommendations:
+                return tuple(recommendations), True
         except Exception as e:
-            # Переключение на анализ по правилам при ошибках ИИ
             print(f"STUB: Ошибка ИИ-анализа: {str(e)}, переключаемся на rule-based")
-            return await self._analyze_with_rules(symptoms)
+        # Переключение на анализ по правилам при ошибках ИИ (и при открытом
+        # выключателе); такой ответ не кэшируется, чтобы следующий запрос
+        # снова попробовал LLM
+        return tuple(await self._analyze_with_rules(symptoms)), False
+
+    def _late_answer(
+        self, key: str, task: "asyncio.Task[List[DoctorRecommendation]]"
+    ) -> None:
+        """Закэшировать ответ LLM, пришедший после ответа правил."""
+        self._late_answers.discard(task)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result():
+            self.cache.set(key, tuple(task.result()))
+
+    async def close(self) -> None:
+        """Отменить поздние запросы и закрыть HTTP-клиент OpenAI."""
+        for task in list(self._late_answers):
+            task.cancel()
+        await asyncio.gather(*self._late_answers, return_exceptions=True)
+        if self.llm is not None:
+            await self.llm.close()
 
     async def _analyze_with_openai(self, symptoms: str) -> List[DoctorRecommendation]:
         """STUB: Анализ симптомов через OpenAI GPT"""
@@ -105,7 +203,7 @@ class SymptomAnalyzer:
 
         print("STUB: Отправляем запрос к OpenAI...")
 
-        if not self.client:
+        if not self.llm:
             return []
 
         # Формируем сообщения в корректном типе
@@ -117,129 +215,36 @@ class SymptomAnalyzer:
             ],
         )
 
-        response = await self.client.chat.completions.create(
+        content = await self.llm.complete(
             model=bot_settings.ai_model,
             messages=messages,
             temperature=bot_settings.ai_temperature,
             max_tokens=500,
         )
-
-        content = response.choices[0].message.content
-        return self._parse_openai_response(content or "")
+        return self._parse_openai_response(content)
 
     async def _analyze_with_rules(self, symptoms: str) -> List[DoctorRecommendation]:
-        """STUB: Fallback анализ на основе правил"""
+        """Fallback анализ по правилам bot/ai/rules.json (один проход по тексту)"""
 
         print("STUB: Используем rule-based анализ симптомов")
 
-        symptoms_lower = symptoms.lower()
-        recommendations = []
-
-        # Неврологические симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["головная боль", "головокружение", "мигрень", "невралгия"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=3,
-                    specialist_name="Невролог",
-                    confidence=85,
-                    reasoning="Симптомы указывают на неврологические проблемы",
-                )
-            )
-
-        # Кардиологические симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["боль в груди", "сердцебиение", "одышка", "аритмия"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=5,
-                    specialist_name="Кардиолог",
-                    confidence=90,
-                    reasoning="Симптомы могут указывать на проблемы с сердцем",
-                )
-            )
-
-        # Офтальмологические симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["зрение", "глаза", "слезотечение", "резь в глазах"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=6,
-                    specialist_name="Офтальмолог",
-                    confidence=95,
-                    reasoning="Проблемы со зрением требуют консультации офтальмолога",
-                )
-            )
-
-        # ЛОР симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["горло", "насморк", "кашель", "ухо", "слух"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=7,
-                    specialist_name="ЛОР",
-                    confidence=88,
-                    reasoning="Симптомы ЛОР-заболеваний",
-                )
-            )
-
-        # Дерматологические симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["сыпь", "зуд", "кожа", "пятна", "дерматит"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=8,
-                    specialist_name="Дерматолог",
-                    confidence=92,
-                    reasoning="Кожные проблемы требуют осмотра дерматолога",
-                )
-            )
-
-        # Гастроэнтерологические симптомы
-        if any(
-            keyword in symptoms_lower
-            for keyword in ["желудок", "тошнота", "рвота", "диарея", "запор"]
-        ):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=9,
-                    specialist_name="Гастроэнтеролог",
-                    confidence=87,
-                    reasoning="Проблемы с пищеварением",
-                )
-            )
-
+        matcher = get_rule_matcher()
         # Если ничего специфического не найдено - рекомендуем терапевта
-        if not recommendations:
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=1,
-                    specialist_name="Терапевт",
-                    confidence=70,
-                    reasoning="Общие симптомы, начните с консультации терапевта",
-                )
-            )
+        rules = matcher.match(symptoms) or [matcher.fallback]
 
         # Всегда добавляем терапевта как альтернативу
-        if not any(rec.specialist_name == "Терапевт" for rec in recommendations):
-            recommendations.append(
-                DoctorRecommendation(
-                    doctor_id=2,
-                    specialist_name="Терапевт",
-                    confidence=60,
-                    reasoning="Альтернативный вариант для общей консультации",
-                )
+        if not any(rule.specialty == matcher.alternative.specialty for rule in rules):
+            rules.append(matcher.alternative)
+
+        recommendations = [
+            DoctorRecommendation(
+                doctor_id=rule.doctor_id,
+                specialist_name=rule.specialty,
+                confidence=rule.confidence,
+                reasoning=rule.reasoning,
             )
+            for rule in rules
+        ]
 
         # Сортируем по уверенности
         recommendations.sort(key=lambda x: x.confidence or 0, reverse=True)
@@ -272,3 +277,12 @@ class SymptomAnalyzer:
             print(f"STUB: Ошибка парсинга ответа OpenAI: {str(e)}")
             # Переключение на анализ по правилам
             return []
+
+
+@lru_cache
+def get_symptom_analyzer() -> SymptomAnalyzer:
+    """Анализатор симптомов процесса бота."""
+    return SymptomAnalyzer(
+        cache_size=bot_settings.analysis_cache_size,
+        cache_ttl_seconds=bot_settings.analysis_cache_ttl_seconds,
+    )
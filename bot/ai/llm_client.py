@@ -0,0 +1,167 @@
+"""
+Управляемые вызовы LLM.
+
+Медленный провайдер не должен держать всех пользователей бота:
+- семафор ограничивает число одновременных запросов процесса;
+- у каждого вызова есть срок (ожидание семафора входит в него);
+- автоматический выключатель (circuit breaker) после серии отказов
+  провайдера на время перестает его вызывать - анализ сразу идет по
+  правилам, затем пропускает один пробный запрос.
+
+Клиент OpenAI создается без собственных повторов: повтор после таймаута
+только удлиняет хвост задержек.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUnavailableError(Exception):
+    """Вызов LLM не выполнялся или не уложился в срок."""
+
+
+class CircuitBreaker:
+    """
+    Выключатель по подряд идущим отказам.
+
+    closed - вызовы разрешены; после `failure_threshold` отказов подряд -
+    open на `reset_seconds`, вызовы отклоняются сразу; затем half-open -
+    разрешен один пробный вызов: успех закрывает выключатель, отказ снова
+    открывает.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """closed, open или half_open."""
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        """Можно ли вызывать провайдера сейчас."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Успешный вызов закрывает выключатель."""
+        if self._opened_at is not None:
+            logger.info("LLM снова отвечает, выключатель закрыт")
+        self.failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Отказ провайдера (ошибка или превышение срока)."""
+        self.failures += 1
+        if self._probe_in_flight or self.failures >= self.failure_threshold:
+            if self._opened_at is None or self._probe_in_flight:
+                logger.warning(
+                    f"LLM недоступен ({self.failures} отказов подряд), "
+                    f"анализ по правилам на {self.reset_seconds:g} с"
+                )
+            self._opened_at = self.clock()
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Пробный вызов не состоялся (например, отменен) - разрешить новый."""
+        self._probe_in_flight = False
+
+
+class GovernedLLMClient:
+    """Клиент chat completions с лимитом параллелизма, сроком и выключателем."""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        max_concurrency: int = 8,
+        timeout_seconds: float = 8.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.client = client
+        self.timeout_seconds = timeout_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _acquire(self, probe: bool) -> float:
+        """Занять слот семафора; возвращает остаток срока вызова."""
+        deadline = time.monotonic() + self.timeout_seconds
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # Очередь процесса, а не отказ провайдера: выключатель не трогаем
+            if probe:
+                self.breaker.release_probe()
+            raise LLMUnavailableError("все слоты LLM заняты") from None
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._semaphore.release()
+            if probe:
+                self.breaker.release_probe()
+            raise LLMUnavailableError("срок истек в очереди к LLM")
+        return remaining
+
+    async def complete(self, **request: Any) -> str:
+        """
+        Текст ответа chat completions.
+
+        Raises:
+            LLMUnavailableError: выключатель открыт, не дождались свободного
+                слота семафора или провайдер не ответил в срок
+        """
+        probe = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            raise LLMUnavailableError("выключатель LLM открыт")
+
+        remaining = await self._acquire(probe)
+        try:
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(**request), remaining
+            )
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise LLMUnavailableError(
+                f"LLM не ответил за {self.timeout_seconds:.1f} с"
+            ) from None
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.release_probe()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._semaphore.release()
+
+        self.breaker.record_success()
+        return response.choices[0].message.content or ""
+
+    async def close(self) -> None:
+        """Закрыть HTTP-клиент OpenAI."""
+        await self.client.close()
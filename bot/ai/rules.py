@@ -0,0 +1,155 @@
+"""
+Правила rule-based анализа симптомов.
+
+Правила (специальность, врач, ключевые слова, уверенность, обоснование)
+лежат в `rules.json` и компилируются один раз в префиксное дерево основ
+ключевых слов. Сообщение проходится один раз: каждое слово спускается по
+дереву символ за символом, и в узлах, где кончается основа первого слова
+фразы, проверяются остальные слова фразы. Стоимость растет с длиной
+сообщения, а не с числом правил. Ключевые слова сопоставляются по основе:
+окончание длинного слова отбрасывается, поэтому «болит горло» и «боли в
+горле» находят одно правило.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+RULES_FILE = Path(__file__).with_name("rules.json")
+
+# Все, кроме букв и цифр, при нормализации текста симптомов становится пробелом
+_NON_WORD = re.compile(r"[\W_]+")
+# Гласные и мягкие знаки окончаний, отбрасываемые при построении основы
+_ENDING = "аеиоуыэюяйь"
+# Короче этой длины основа не укорачивается, слово сравнивается целиком
+_MIN_STEM = 3
+
+
+def normalize_symptoms(symptoms: str) -> str:
+    """Регистр, «ё», пунктуация и лишние пробелы не различаются."""
+    text = symptoms.casefold().replace("ё", "е")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+@dataclass(frozen=True)
+class WordPattern:
+    """Слово ключевой фразы: основа и требование совпадения целиком."""
+
+    stem: str
+    exact: bool
+
+    @classmethod
+    def from_word(cls, word: str) -> "WordPattern":
+        """Основа слова (короткие слова сравниваются целиком)."""
+        if len(word) <= _MIN_STEM:
+            return cls(word, exact=True)
+        stem = word
+        while len(stem) > _MIN_STEM and stem[-1] in _ENDING:
+            stem = stem[:-1]
+        return cls(stem, exact=False)
+
+    def matches(self, word: str) -> bool:
+        """Слово текста подходит под шаблон."""
+        return word == self.stem if self.exact else word.startswith(self.stem)
+
+
+def keyword_patterns(keyword: str) -> tuple[WordPattern, ...]:
+    """Шаблоны слов нормализованной ключевой фразы."""
+    return tuple(
+        WordPattern.from_word(word) for word in normalize_symptoms(keyword).split()
+    )
+
+
+@dataclass
+class _Node:
+    """Узел префиксного дерева основ первых слов фраз."""
+
+    children: dict[str, "_Node"] = field(default_factory=dict)
+    # (индекс правила, шаблон первого слова, шаблоны остальных слов)
+    phrases: list[tuple[int, WordPattern, tuple[WordPattern, ...]]] = field(
+        default_factory=list
+    )
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Правило: специальность и ее ключевые слова."""
+
+    specialty: str
+    doctor_id: int
+    confidence: int
+    reasoning: str
+    keywords: tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Rule":
+        """Правило из записи JSON."""
+        return cls(
+            specialty=data["specialty"],
+            doctor_id=int(data["doctor_id"]),
+            confidence=int(data["confidence"]),
+            reasoning=data["reasoning"],
+            keywords=tuple(data.get("keywords", ())),
+        )
+
+
+class RuleMatcher:
+    """Скомпилированный набор правил."""
+
+    def __init__(self, rules: list[Rule], fallback: Rule, alternative: Rule) -> None:
+        self.rules = rules
+        self.fallback = fallback
+        self.alternative = alternative
+        self._root = _Node()
+        for index, rule in enumerate(rules):
+            for keyword in rule.keywords:
+                patterns = keyword_patterns(keyword)
+                if patterns:
+                    self._add(index, patterns)
+
+    def _add(self, index: int, patterns: tuple[WordPattern, ...]) -> None:
+        node = self._root
+        for char in patterns[0].stem:
+            node = node.children.setdefault(char, _Node())
+        node.phrases.append((index, patterns[0], patterns[1:]))
+
+    @classmethod
+    def load(cls, path: Path = RULES_FILE) -> "RuleMatcher":
+        """Загрузить и скомпилировать правила из JSON."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            [Rule.from_dict(rule) for rule in data["rules"]],
+            Rule.from_dict(data["fallback"]),
+            Rule.from_dict(data["alternative"]),
+        )
+
+    def match(self, symptoms: str) -> list[Rule]:
+        """Сработавшие правила в порядке файла, за один проход по тексту."""
+        words = normalize_symptoms(symptoms).split()
+        matched: set[int] = set()
+        for position, word in enumerate(words):
+            node = self._root
+            for char in word:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                node = child
+                for index, first, rest in node.phrases:
+                    if index in matched or not first.matches(word):
+                        continue
+                    following = words[position + 1 : position + 1 + len(rest)]
+                    if len(following) == len(rest) and all(
+                        pattern.matches(other)
+                        for pattern, other in zip(rest, following)
+                    ):
+                        matched.add(index)
+        return [self.rules[index] for index in sorted(matched)]
+
+
+@lru_cache
+def get_rule_matcher() -> RuleMatcher:
+    """Правила процесса (компилируются при первом обращении)."""
+    return RuleMatcher.load()
@@ -1,14 +1,23 @@
 """Клиент для взаимодействия с API клиники."""
 
+import asyncio
+import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Union
+from functools import lru_cache
+from types import TracebackType
+from typing import Any, List, Optional, Type, Union
 from zoneinfo import ZoneInfo
 
 import aiohttp
 from pydantic import BaseModel, field_validator
 
+from bot.api.doctor_directory import DoctorDirectory
+from bot.api.slot_pages import SlotPages
 from bot.config.settings import bot_settings
 
+logger = logging.getLogger(__name__)
+
 
 def get_clinic_timezone() -> ZoneInfo:
     """Получить timezone клиники."""
@@ -36,11 +45,30 @@ def to_clinic_timezone(dt: datetime) -> datetime:
     return dt.astimezone(get_clinic_timezone())
 
 
-class AvailableSlot(BaseModel):
-    """Доступный слот для записи."""
+# Слотов на экране выбора времени и горизонт поиска свободных слотов, дней
+SLOT_PAGE_SIZE = 5
+SLOT_SEARCH_DAYS = 14
+
+# Long-poll одного запроса заявки очереди бронирований, секунд (меньше
+# таймаута запроса клиента)
+TICKET_POLL_SECONDS = 5.0
+
+
+@dataclass(frozen=True, slots=True)
+class AvailableSlot:
+    """
+    Доступный слот для записи.
+
+    Легкая структура вместо pydantic-модели: страницы слотов разбираются
+    на каждое нажатие, валидация полей здесь не нужна.
+    """
 
     datetime_obj: datetime
-    datetime_str: str
+
+    @property
+    def datetime_str(self) -> str:
+        """Время слота в UTC (ISO 8601) для callback_data и API."""
+        return self.datetime_obj.isoformat()
 
     @property
     def date_str(self) -> str:
@@ -106,67 +134,159 @@ class AppointmentResponse(BaseModel):
         return to_clinic_timezone(self.created_at)
 
 
-class ClinicAPIClient:
-    """Клиент для работы с API клиники."""
+def parse_slots(rows: List[dict[str, Any]]) -> List[AvailableSlot]:
+    """Слоты из ответа API (время без timezone - UTC, как в API)."""
+    slots = []
+    for row in rows:
+        start_time = datetime.fromisoformat(row["start_time"])
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        slots.append(AvailableSlot(start_time))
+    return slots
+
 
-    def __init__(self, base_url: str):
+class ClinicAPIClient:
+    """
+    Клиент для работы с API клиники.
+
+    Долгоживущий объект процесса бота: владеет одной aiohttp-сессией с пулом
+    keep-alive соединений, поэтому запросы не платят за TCP/TLS handshake.
+    Сессия создается при первом запросе (нужен запущенный event loop) и
+    закрывается `close()` при остановке бота. Врачи отдаются из справочника
+    в памяти (`doctors`), который перечитывает GET /doctors в фоне; страницы
+    свободных слотов загружаются заранее (`slots`).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool_size: int = 100,
+        pool_size_per_host: int = 50,
+        keepalive_seconds: float = 30.0,
+        dns_cache_seconds: int = 300,
+        connect_timeout_seconds: float = 3.0,
+        timeout_seconds: float = 10.0,
+        doctors_ttl_seconds: float = 60.0,
+        doctors_max_stale_seconds: float = 3600.0,
+        ticket_wait_seconds: float = 20.0,
+    ):
         """Инициализация клиента."""
         self.base_url = base_url.rstrip("/")
-
-    async def get_doctors(self) -> List[Doctor]:
-        """STUB: Получить список врачей."""
-        # Заглушка - возвращаем тестовых врачей
-        return [
-            Doctor(id=1, name="Доктор Иванов", specialization="Терапевт"),
-            Doctor(id=2, name="Доктор Петров", specialization="Кардиолог"),
-            Doctor(id=3, name="Доктор Сидоров", specialization="Невролог"),
-        ]
+        # Сколько ждать обработки заявки, если API работает в режиме очереди
+        self.ticket_wait_seconds = ticket_wait_seconds
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_cache_seconds = dns_cache_seconds
+        # Таймаут на каждый запрос: общий и на установку соединения
+        self.timeout = aiohttp.ClientTimeout(
+            total=timeout_seconds, sock_connect=connect_timeout_seconds
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.doctors = DoctorDirectory(
+            self.fetch_doctors, doctors_ttl_seconds, doctors_max_stale_seconds
+        )
+        self.slots = SlotPages(self.get_available_slots, page_size=SLOT_PAGE_SIZE)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Общая сессия клиента (создается лениво)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                keepalive_timeout=self.keepalive_seconds,
+                ttl_dns_cache=self.dns_cache_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"Accept": "application/json"},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Закрыть сессию и соединения пула."""
+        await self.slots.close()
+        await self.doctors.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "ClinicAPIClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def fetch_doctors(self) -> List[Doctor]:
+        """Загрузить активных врачей из API (GET /doctors)."""
+        async with self._get_session().get(f"{self.base_url}/doctors") as response:
+            response.raise_for_status()
+            data = await response.json()
+        return [Doctor.model_validate(item) for item in data]
+
+    async def get_doctors(self, specialization: Optional[str] = None) -> List[Doctor]:
+        """Врачи из справочника (опционально одной специализации)."""
+        return await self.doctors.list_doctors(specialization)
 
     async def get_available_slots(
-        self, doctor_id: int, days_ahead: int = 7
+        self,
+        doctor_id: int,
+        after: Optional[datetime] = None,
+        limit: int = SLOT_PAGE_SIZE,
+        days_ahead: int = SLOT_SEARCH_DAYS,
     ) -> List[AvailableSlot]:
-        """STUB: Получить доступные слоты для записи."""
-        slots = []
-        # clinic_tz = get_clinic_timezone()
-
-        for day_offset in range(1, days_ahead + 1):
-            # Генерируем дату в timezone клиники
-            date = get_local_time() + timedelta(days=day_offset)
-
-            # Пропускаем выходные
-            if date.weekday() >= 5:
-                continue
-
-            # Генерируем слоты с 9:00 до 17:30 каждые 30 минут (по времени клиники)
-            for hour in range(9, 18):
-                for minute in [0, 30]:
-                    # Создаем время в timezone клиники
-                    slot_time_clinic = date.replace(
-                        hour=hour, minute=minute, second=0, microsecond=0
-                    )
-
-                    # Конвертируем в UTC для передачи в API
-                    slot_time_utc = to_utc(slot_time_clinic)
-
-                    slots.append(
-                        AvailableSlot(
-                            datetime_obj=slot_time_utc,
-                            datetime_str=slot_time_utc.isoformat(),
-                        )
-                    )
-
-        return slots
+        """
+        Свободные слоты врача из API (GET /doctors/{id}/slots).
+
+        Args:
+            doctor_id: ID врача
+            after: Курсор страницы - слоты строго позже этого времени
+            limit: Размер страницы
+            days_ahead: Горизонт поиска, дней от сегодняшнего дня клиники
+        """
+        params: dict[str, Any] = {
+            "limit": limit,
+            "date_to": (
+                get_local_time().date() + timedelta(days=days_ahead)
+            ).isoformat(),
+        }
+        if after is not None:
+            params["after"] = to_utc(after).isoformat()
+        async with self._get_session().get(
+            f"{self.base_url}/doctors/{doctor_id}/slots", params=params
+        ) as response:
+            if response.status == 404:
+                return []
+            response.raise_for_status()
+            data = await response.json()
+        return parse_slots(data)
 
     async def create_appointment(
-        self, doctor_id: int, patient_name: str, start_time: Union[str, datetime]
+        self,
+        doctor_id: int,
+        patient_name: str,
+        start_time: Union[str, datetime],
+        telegram_chat_id: Optional[int] = None,
     ) -> Optional[AppointmentResponse]:
         """
         Создать запись на прием.
 
+        В режиме очереди бронирований API отвечает 202 с заявкой; тогда
+        клиент дожидается ее обработки (`ticket_wait_seconds`) и возвращает
+        созданную запись.
+
         Args:
             doctor_id: ID врача
             patient_name: Имя пациента
             start_time: Время записи (строка с timezone или datetime)
+            telegram_chat_id: Чат для напоминания о приеме
         """
         # Приводим start_time к нужному формату для API
         if isinstance(start_time, datetime):
@@ -181,55 +301,107 @@ class ClinicAPIClient:
             "patient_name": patient_name,
             "start_time": start_time_api,
         }
+        if telegram_chat_id is not None:
+            appointment_data["telegram_chat_id"] = telegram_chat_id
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/appointments",
-                    json=appointment_data,
-                    headers={"Content-Type": "application/json"},
-                ) as response:
-                    if response.status == 201:
-                        data = await response.json()
-                        return AppointmentResponse.model_validate(data)
-                    else:
-                        print(f"Ошибка создания записи: {response.status}")
-                        error_text = await response.text()
-                        print(f"Детали ошибки: {error_text}")
-                        return None
+            async with self._get_session().post(
+                f"{self.base_url}/appointments", json=appointment_data
+            ) as response:
+                if response.status == 201:
+                    data = await response.json()
+                    return AppointmentResponse.model_validate(data)
+                if response.status == 202:
+                    ticket = await response.json()
+                else:
+                    error_text = await response.text()
+                    self._booking_rejected(doctor_id, response.status, error_text)
+                    return None
+            return await self._await_ticket(doctor_id, ticket["token"])
 
         except Exception as e:
-            print(f"Ошибка при создании записи: {e}")
+            logger.error(f"Ошибка при создании записи: {e}")
             return None
 
+    def _booking_rejected(self, doctor_id: int, status: int, error_text: str) -> None:
+        """Записать отказ в бронировании; неактивного врача убрать из справочника."""
+        logger.warning(f"Ошибка создания записи: {status}, {error_text}")
+        if "неактивен" in error_text:
+            # Врач выбыл из справочника: не предлагать его дальше
+            self.doctors.invalidate(doctor_id)
+
+    async def _await_ticket(
+        self, doctor_id: int, token: str
+    ) -> Optional[AppointmentResponse]:
+        """Дождаться обработки заявки очереди (long-poll GET /appointments/tickets)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.ticket_wait_seconds
+        while True:
+            wait = max(0.0, min(deadline - loop.time(), TICKET_POLL_SECONDS))
+            async with self._get_session().get(
+                f"{self.base_url}/appointments/tickets/{token}",
+                params={"wait": wait},
+            ) as response:
+                response.raise_for_status()
+                ticket = await response.json()
+
+            if ticket["status"] == "succeeded":
+                return await self.get_appointment(ticket["appointment_id"])
+            if ticket["status"] == "failed":
+                self._booking_rejected(doctor_id, 409, ticket.get("error") or "")
+                return None
+            if loop.time() >= deadline:
+                logger.warning(
+                    f"Заявка {token} не обработана за {self.ticket_wait_seconds:g} с"
+                )
+                return None
+
     async def get_appointment(
         self, appointment_id: int
     ) -> Optional[AppointmentResponse]:
         """Получить запись по ID."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/appointments/{appointment_id}"
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return AppointmentResponse.model_validate(data)
-                    else:
-                        return None
+            async with self._get_session().get(
+                f"{self.base_url}/appointments/{appointment_id}"
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return AppointmentResponse.model_validate(data)
+                else:
+                    return None
 
         except Exception as e:
-            print(f"Ошибка при получении записи: {e}")
+            logger.error(f"Ошибка при получении записи: {e}")
             return None
 
-    # STUB-методы, требуемые обработчиками Telegram-бота
     async def get_all_doctors(self) -> List[Doctor]:
-        """STUB: Возвращает всех врачей (эквивалент get_doctors)."""
+        """Все врачи (эквивалент get_doctors)."""
         return await self.get_doctors()
 
     async def get_doctor(self, doctor_id: int) -> Optional[Doctor]:
-        """STUB: Получить врача по ID."""
-        doctors = await self.get_doctors()
-        for d in doctors:
-            if d.id == doctor_id:
-                return d
-        return None
+        """Врач по ID из справочника (O(1))."""
+        return await self.doctors.get_doctor(doctor_id)
+
+
+@lru_cache
+def get_clinic_client() -> ClinicAPIClient:
+    """Общий клиент API клиники для всех обработчиков бота."""
+    return ClinicAPIClient(
+        bot_settings.clinic_api_url,
+        pool_size=bot_settings.clinic_api_pool_size,
+        pool_size_per_host=bot_settings.clinic_api_pool_size_per_host,
+        keepalive_seconds=bot_settings.clinic_api_keepalive_seconds,
+        dns_cache_seconds=bot_settings.clinic_api_dns_cache_seconds,
+        connect_timeout_seconds=bot_settings.clinic_api_connect_timeout_seconds,
+        timeout_seconds=bot_settings.clinic_api_timeout_seconds,
+        doctors_ttl_seconds=bot_settings.bot_doctors_ttl_seconds,
+        doctors_max_stale_seconds=bot_settings.bot_doctors_max_stale_seconds,
+        ticket_wait_seconds=bot_settings.clinic_api_ticket_wait_seconds,
+    )
+
+
+async def close_clinic_client() -> None:
+    """Закрыть общий клиент (при остановке бота)."""
+    if get_clinic_client.cache_info().currsize:
+        await get_clinic_client().close()
+        get_clinic_client.cache_clear()
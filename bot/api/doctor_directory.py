@@ -0,0 +1,172 @@
+"""
+Справочник врачей на стороне бота.
+
+Каждое нажатие кнопки ищет врача по ID или по специализации, а справочник
+меняется редко, поэтому ответы строятся из снимка в памяти: словарь по ID и
+индекс по нормализованной специализации (поиск за O(1)). Снимок загружается
+при старте бота и обновляется по схеме stale-while-revalidate: после TTL
+обработчики сразу получают старый снимок, а перечитывание идет в фоне одной
+задачей. Снимок старше `max_stale_seconds` перечитывается синхронно.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    from bot.api.clinic_client import Doctor
+
+logger = logging.getLogger(__name__)
+
+DoctorsLoader = Callable[[], Awaitable[Sequence["Doctor"]]]
+
+
+def normalize_specialization(specialization: str) -> str:
+    """Ключ специализации: без регистра и лишних пробелов."""
+    return " ".join(specialization.split()).casefold()
+
+
+@dataclass(frozen=True)
+class DirectorySnapshot:
+    """Неизменяемый снимок справочника с индексами."""
+
+    doctors: tuple["Doctor", ...]
+    by_id: dict[int, "Doctor"]
+    by_specialization: dict[str, tuple["Doctor", ...]]
+    loaded_at: float
+
+    @classmethod
+    def build(
+        cls, doctors: Sequence["Doctor"], loaded_at: Optional[float] = None
+    ) -> "DirectorySnapshot":
+        """Построить индексы по списку врачей."""
+        by_specialization: dict[str, list["Doctor"]] = {}
+        for doctor in doctors:
+            key = normalize_specialization(doctor.specialization)
+            by_specialization.setdefault(key, []).append(doctor)
+        return cls(
+            doctors=tuple(doctors),
+            by_id={doctor.id: doctor for doctor in doctors},
+            by_specialization={
+                key: tuple(group) for key, group in by_specialization.items()
+            },
+            loaded_at=time.monotonic() if loaded_at is None else loaded_at,
+        )
+
+    def without(self, doctor_id: int, loaded_at: float) -> "DirectorySnapshot":
+        """Снимок без врача с заданным временем загрузки."""
+        return DirectorySnapshot.build(
+            [doctor for doctor in self.doctors if doctor.id != doctor_id],
+            loaded_at=loaded_at,
+        )
+
+
+class DoctorDirectory:
+    """Кэш справочника врачей с TTL и фоновым обновлением."""
+
+    def __init__(
+        self,
+        loader: DoctorsLoader,
+        ttl_seconds: float = 60.0,
+        max_stale_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.clock = clock
+        self._snapshot: Optional[DirectorySnapshot] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+
+    async def warm(self) -> None:
+        """Загрузить справочник при старте (ошибка не мешает запуску бота)."""
+        try:
+            await self._reload()
+        except Exception as e:
+            logger.warning(f"Справочник врачей не загружен при старте: {e}")
+
+    def invalidate(self, doctor_id: Optional[int] = None) -> None:
+        """
+        Пометить снимок устаревшим (следующее обращение запустит фоновое
+        обновление); врач `doctor_id` (например, ставший неактивным) сразу
+        исключается из ответов.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        stale_at = min(snapshot.loaded_at, self.clock() - self.ttl_seconds)
+        if doctor_id is not None:
+            self._snapshot = snapshot.without(doctor_id, stale_at)
+        else:
+            self._snapshot = dataclasses.replace(snapshot, loaded_at=stale_at)
+
+    async def _reload(self) -> DirectorySnapshot:
+        """Перечитать справочник одним запросом на всех ожидающих."""
+        loaded_at = self.clock()
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.loaded_at >= loaded_at:
+                return snapshot
+            doctors = await self.loader()
+            snapshot = DirectorySnapshot.build(doctors, loaded_at=self.clock())
+            self._snapshot = snapshot
+            logger.info(f"Справочник врачей бота загружен: {len(doctors)} врачей")
+            return snapshot
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self._reload()
+        except Exception as e:
+            logger.warning(f"Фоновое обновление справочника врачей не удалось: {e}")
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def snapshot(self) -> DirectorySnapshot:
+        """Снимок: свежий, устаревший с фоновым обновлением или перечитанный."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self._reload()
+        age = self.clock() - snapshot.loaded_at
+        if age < self.ttl_seconds:
+            return snapshot
+        if age < self.ttl_seconds + self.max_stale_seconds:
+            self._schedule_refresh()
+            return snapshot
+        try:
+            return await self._reload()
+        except Exception as e:
+            # API недоступно: лучше старый справочник, чем ошибка
+            logger.warning(f"Справочник врачей не обновлен, используется старый: {e}")
+            return snapshot
+
+    async def list_doctors(
+        self, specialization: Optional[str] = None
+    ) -> list["Doctor"]:
+        """Врачи, опционально одной специализации."""
+        snapshot = await self.snapshot()
+        if specialization is None:
+            return list(snapshot.doctors)
+        key = normalize_specialization(specialization)
+        return list(snapshot.by_specialization.get(key, ()))
+
+    async def get_doctor(self, doctor_id: int) -> Optional["Doctor"]:
+        """Врач по ID или None."""
+        snapshot = await self.snapshot()
+        return snapshot.by_id.get(doctor_id)
+
+    async def close(self) -> None:
+        """Дождаться отмены фонового обновления."""
+        task = self._refresh_task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
@@ -0,0 +1,123 @@
+"""
+Страницы свободных слотов с упреждающей загрузкой.
+
+Экран выбора времени не должен ждать API: слоты рекомендованных врачей
+запрашиваются, пока пользователь читает рекомендации, а при показе страницы
+в фоне загружается следующая (кнопка «Другое время»). Загрузки - задачи
+asyncio в небольшом кэше с коротким TTL: свободные слоты быстро занимают,
+поэтому страницы живут секунды, а после записи сбрасываются для врача.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+if TYPE_CHECKING:
+    from bot.api.clinic_client import AvailableSlot
+
+logger = logging.getLogger(__name__)
+
+SlotsFetcher = Callable[
+    [int, Optional[datetime], int], Awaitable[list["AvailableSlot"]]
+]
+PageKey = tuple[int, Optional[datetime]]
+
+
+@dataclass(frozen=True, slots=True)
+class SlotPage:
+    """Страница слотов врача."""
+
+    slots: tuple["AvailableSlot", ...]
+    has_more: bool
+
+    @property
+    def next_after(self) -> Optional[datetime]:
+        """Курсор следующей страницы или None, если она пуста."""
+        if not self.has_more or not self.slots:
+            return None
+        return self.slots[-1].datetime_obj
+
+
+class SlotPages:
+    """Кэш загружаемых страниц слотов по (врач, курсор)."""
+
+    def __init__(
+        self,
+        fetch: SlotsFetcher,
+        page_size: int = 5,
+        ttl_seconds: float = 30.0,
+        max_pages: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.fetch = fetch
+        self.page_size = page_size
+        self.ttl_seconds = ttl_seconds
+        self.max_pages = max_pages
+        self.clock = clock
+        self._pages: OrderedDict[PageKey, tuple[float, "asyncio.Task[SlotPage]"]] = (
+            OrderedDict()
+        )
+
+    async def _load(self, doctor_id: int, after: Optional[datetime]) -> SlotPage:
+        # Один лишний слот показывает, есть ли следующая страница
+        slots = await self.fetch(doctor_id, after, self.page_size + 1)
+        return SlotPage(
+            slots=tuple(slots[: self.page_size]),
+            has_more=len(slots) > self.page_size,
+        )
+
+    def _forget_failed(self, key: PageKey, task: "asyncio.Task[SlotPage]") -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.warning(f"Слоты врача {key[0]} не загружены: {task.exception()}")
+        entry = self._pages.get(key)
+        if entry is not None and entry[1] is task:
+            del self._pages[key]
+
+    def _task(
+        self, doctor_id: int, after: Optional[datetime]
+    ) -> "asyncio.Task[SlotPage]":
+        key = (doctor_id, after)
+        now = self.clock()
+        entry = self._pages.get(key)
+        if entry is not None and now - entry[0] < self.ttl_seconds:
+            self._pages.move_to_end(key)
+            return entry[1]
+
+        task = asyncio.create_task(self._load(doctor_id, after))
+        task.add_done_callback(lambda done: self._forget_failed(key, done))
+        self._pages[key] = (now, task)
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return task
+
+    def prefetch(self, doctor_id: int, after: Optional[datetime] = None) -> None:
+        """Начать загрузку страницы, не дожидаясь ее."""
+        self._task(doctor_id, after)
+
+    async def get_page(
+        self, doctor_id: int, after: Optional[datetime] = None
+    ) -> SlotPage:
+        """Страница слотов (из кэша или загруженная); следующая - в фоне."""
+        page = await asyncio.shield(self._task(doctor_id, after))
+        if page.next_after is not None:
+            self.prefetch(doctor_id, page.next_after)
+        return page
+
+    def invalidate(self, doctor_id: int) -> None:
+        """Сбросить страницы врача (после записи или отказа в ней)."""
+        for key in [key for key in self._pages if key[0] == doctor_id]:
+            del self._pages[key]
+
+    async def close(self) -> None:
+        """Отменить незавершенные загрузки."""
+        tasks = [task for _, task in self._pages.values() if not task.done()]
+        self._pages.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,5 +1,7 @@
 """Настройки Telegram бота"""
 
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -9,16 +11,52 @@ class BotSettings(BaseSettings):
     # Токен Telegram бота
     telegram_bot_token: str
 
+    # Сервер Bot API (по умолчанию api.telegram.org); локальный Bot API или
+    # подставной сервер нагрузочного теста
+    telegram_api_url: Optional[str] = None
+
     # OpenAI API Key для ИИ-анализа симптомов
     openai_api_key: str
 
+    # Адрес OpenAI-совместимого API (по умолчанию api.openai.com)
+    openai_base_url: Optional[str] = None
+
     # URL API клиники
     clinic_api_url: str
 
+    # HTTP-пул клиента API клиники (одна сессия на процесс бота)
+    clinic_api_pool_size: int = 100
+    clinic_api_pool_size_per_host: int = 50
+    clinic_api_keepalive_seconds: float = 30.0
+    clinic_api_dns_cache_seconds: int = 300
+    clinic_api_connect_timeout_seconds: float = 3.0
+    clinic_api_timeout_seconds: float = 10.0
+    # Сколько ждать обработки заявки, если API клиники работает в режиме
+    # очереди бронирований (BOOKING_QUEUE_ENABLED, ответ 202)
+    clinic_api_ticket_wait_seconds: float = 20.0
+
+    # Справочник врачей бота: TTL снимка и сколько еще отдавать устаревший
+    # снимок, пока он обновляется в фоне
+    bot_doctors_ttl_seconds: float = 60.0
+    bot_doctors_max_stale_seconds: float = 3600.0
+
     # Настройки ИИ
     ai_model: str
     ai_temperature: float
 
+    # Вызовы LLM: одновременных запросов, срок вызова, выключатель после
+    # отказов подряд и время до пробного запроса; hedge - через сколько
+    # миллисекунд без ответа LLM отвечают правила (0 - не отвечают)
+    llm_max_concurrency: int = 8
+    llm_timeout_seconds: float = 8.0
+    llm_breaker_failures: int = 5
+    llm_breaker_reset_seconds: float = 30.0
+    llm_hedge_ms: int = 0
+
+    # Кэш результатов анализа по нормализованному тексту симптомов
+    analysis_cache_size: int = 1024
+    analysis_cache_ttl_seconds: float = 3600.0
+
     # Часовой пояс
     timezone: str
 
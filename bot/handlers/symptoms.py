@@ -4,6 +4,9 @@
 ВНИМАНИЕ: Это STUB-реализация для демонстрации архитектуры!
 """
 
+from datetime import datetime, timezone
+from typing import Optional
+
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
@@ -15,7 +18,8 @@ from aiogram.types import (
 )
 
 from bot.ai.analyzer import SymptomAnalyzer
-from bot.api.clinic_client import ClinicAPIClient
+from bot.api.clinic_client import get_clinic_client
+from bot.api.slot_pages import SlotPage
 from bot.config.settings import bot_settings
 
 router = Router()
@@ -29,10 +33,14 @@ class AppointmentStates(StatesGroup):
 
 
 @router.message(F.text & ~F.text.startswith("/"))
-async def handle_symptoms(message: Message, state: FSMContext) -> None:
+async def handle_symptoms(
+    message: Message, state: FSMContext, analyzer: SymptomAnalyzer
+) -> None:
     """
     Обработчик описания симптомов от пациента.
     STUB: Демонстрирует архитектуру ИИ-анализа и выбора врача.
+
+    `analyzer` - общий анализатор процесса из данных диспетчера (bot/main.py).
     """
     symptoms = message.text or ""
 
@@ -41,7 +49,6 @@ async def handle_symptoms(message: Message, state: FSMContext) -> None:
         await message.bot.send_chat_action(chat_id=message.chat.id, action="typing")
 
     try:
-        analyzer = SymptomAnalyzer()
         recommendations = await analyzer.analyze_symptoms(symptoms)
 
         if not recommendations:
@@ -51,6 +58,11 @@ async def handle_symptoms(message: Message, state: FSMContext) -> None:
             )
             return
 
+        # Слоты рекомендованных врачей грузятся, пока пользователь читает ответ
+        clinic_client = get_clinic_client()
+        for rec in recommendations[:3]:
+            clinic_client.slots.prefetch(rec.doctor_id)
+
         # Создание клавиатуры с рекомендациями врачей
         keyboard = []
         for rec in recommendations[:3]:  # Показываем топ-3 рекомендации
@@ -109,7 +121,7 @@ async def handle_symptoms(message: Message, state: FSMContext) -> None:
 @router.callback_query(F.data == "show_all_doctors")
 async def show_all_doctors(query: CallbackQuery, state: FSMContext) -> None:
     """STUB: Показать список всех доступных врачей"""
-    clinic_client = ClinicAPIClient(bot_settings.clinic_api_url)
+    clinic_client = get_clinic_client()
 
     try:
         doctors = await clinic_client.get_all_doctors()
@@ -151,11 +163,65 @@ async def handle_doctor_selection(query: CallbackQuery, state: FSMContext) -> No
         await show_available_slots(query, state, doctor_id)
 
 
+@router.callback_query(F.data.startswith("more_slots_"))
+async def handle_more_slots(query: CallbackQuery, state: FSMContext) -> None:
+    """Следующая страница слотов врача (курсор - время последнего слота)"""
+    if query.data:
+        _, _, doctor_id, after = query.data.split("_")
+        await show_available_slots(
+            query,
+            state,
+            int(doctor_id),
+            after=datetime.fromtimestamp(int(after), timezone.utc),
+        )
+
+
+def build_slots_keyboard(doctor_id: int, page: SlotPage) -> InlineKeyboardMarkup:
+    """Клавиатура страницы слотов: время, «Другое время», возврат к врачам"""
+    keyboard = []
+    for slot in page.slots:
+        slot_text = f"{slot.date_str} в {slot.time_str}"
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text=slot_text,
+                    callback_data=f"book_{doctor_id}_{slot.datetime_str}",
+                )
+            ]
+        )
+
+    if page.next_after is not None:
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text="🕒 Другое время",
+                    callback_data=(
+                        f"more_slots_{doctor_id}_{int(page.next_after.timestamp())}"
+                    ),
+                )
+            ]
+        )
+
+    # Кнопка "Назад к выбору врача"
+    keyboard.append(
+        [
+            InlineKeyboardButton(
+                text="⬅️ Назад к выбору врача", callback_data="back_to_doctors"
+            )
+        ]
+    )
+
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
 async def show_available_slots(
-    query: CallbackQuery, state: FSMContext, doctor_id: int
+    query: CallbackQuery,
+    state: FSMContext,
+    doctor_id: int,
+    after: Optional[datetime] = None,
 ) -> None:
-    """STUB: Показать доступные слоты времени для выбранного врача"""
-    clinic_client = ClinicAPIClient(bot_settings.clinic_api_url)
+    """Показать страницу свободных слотов выбранного врача"""
+    clinic_client = get_clinic_client()
 
     try:
         # Получаем информацию о враче
@@ -166,46 +232,22 @@ async def show_available_slots(
                 await query.message.edit_text("❌ STUB: Врач не найден")
             return
 
-        # STUB: Получаем свободные слоты
-        available_slots = await clinic_client.get_available_slots(
-            doctor_id, days_ahead=7
-        )
+        # Страница обычно уже загружена заранее; следующая грузится в фоне
+        page = await clinic_client.slots.get_page(doctor_id, after)
 
-        if not available_slots:
+        if not page.slots:
             if query.message and hasattr(query.message, "edit_text"):
                 await query.message.edit_text(
-                    f"😕 STUB: У врача {doctor.name} нет свободных слотов "
-                    "на ближайшую неделю.\n\n"
-                    "В реальной реализации здесь будет интеграция с календарём."
+                    f"😕 У врача {doctor.name} нет свободных слотов "
+                    "на ближайшие две недели."
                 )
             await query.answer()
             return
 
-        keyboard = []
-        for slot in available_slots[:5]:  # Показываем максимум 5 слотов в STUB
-            slot_text = f"{slot.date_str} в {slot.time_str}"
-            keyboard.append(
-                [
-                    InlineKeyboardButton(
-                        text=slot_text,
-                        callback_data=f"book_{doctor_id}_{slot.datetime_str}",
-                    )
-                ]
-            )
-
-        # Кнопка "Назад к выбору врача"
-        keyboard.append(
-            [
-                InlineKeyboardButton(
-                    text="⬅️ Назад к выбору врача", callback_data="back_to_doctors"
-                )
-            ]
-        )
-
-        reply_markup = InlineKeyboardMarkup(inline_keyboard=keyboard)
+        reply_markup = build_slots_keyboard(doctor_id, page)
 
         message_text = (
-            f"📅 *STUB: Доступное время у {doctor.name}*\n"
+            f"📅 *Доступное время у {doctor.name}*\n"
             f"_{doctor.specialty}_\n\n"
             "Выберите удобное время:"
         )
@@ -238,7 +280,7 @@ async def handle_appointment_booking(query: CallbackQuery, state: FSMContext) ->
     doctor_id = int(parts[1])
     datetime_str = parts[2]
 
-    clinic_client = ClinicAPIClient(bot_settings.clinic_api_url)
+    clinic_client = get_clinic_client()
 
     try:
         # Получаем имя пользователя как имя пациента
@@ -260,7 +302,11 @@ async def handle_appointment_booking(query: CallbackQuery, state: FSMContext) ->
             doctor_id=doctor_id,
             patient_name=patient_name,
             start_time=datetime_str,  # Передаем строку как есть
+            # Личный чат с ботом: напоминание о приеме придет сюда
+            telegram_chat_id=query.from_user.id,
         )
+        # Занятость врача изменилась (или слот оказался занят) - страницы устарели
+        clinic_client.slots.invalidate(doctor_id)
 
         if appointment:
             # Успешное создание записи
@@ -10,9 +10,13 @@ import asyncio
 import logging
 
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.filters import CommandStart
 from aiogram.types import Message
 
+from bot.ai.analyzer import SymptomAnalyzer, get_symptom_analyzer
+from bot.api.clinic_client import close_clinic_client, get_clinic_client
 from bot.config.settings import bot_settings
 from bot.handlers.symptoms import router as symptoms_router
 
@@ -39,25 +43,56 @@ async def start_command(message: Message) -> None:
     await message.answer(welcome_message.strip())
 
 
-async def main() -> None:
-    """Главная функция запуска бота"""
-    if not bot_settings.telegram_bot_token:
-        logger.error("TELEGRAM_BOT_TOKEN не найден в переменных окружения!")
-        return
+def create_bot() -> Bot:
+    """Бот; TELEGRAM_API_URL направляет запросы на другой сервер Bot API."""
+    session = None
+    if bot_settings.telegram_api_url:
+        session = AiohttpSession(
+            api=TelegramAPIServer.from_base(bot_settings.telegram_api_url)
+        )
+    return Bot(token=bot_settings.telegram_bot_token, session=session)
 
-    # Создание бота и диспетчера
-    bot = Bot(token=bot_settings.telegram_bot_token)
+
+def create_dispatcher(analyzer: SymptomAnalyzer) -> Dispatcher:
+    """
+    Диспетчер со всеми обработчиками.
+
+    Роутер симптомов подключается к одному диспетчеру на процесс.
+    """
     dp = Dispatcher()
+    # Общий анализатор симптомов передается обработчикам аргументом `analyzer`
+    dp["analyzer"] = analyzer
 
     # Регистрация обработчиков
     dp.message.register(start_command, CommandStart())
 
     # Подключение роутеров
     dp.include_router(symptoms_router)
+    return dp
+
+
+async def main() -> None:
+    """Главная функция запуска бота"""
+    if not bot_settings.telegram_bot_token:
+        logger.error("TELEGRAM_BOT_TOKEN не найден в переменных окружения!")
+        return
+
+    # Создание бота и диспетчера
+    bot = create_bot()
+    analyzer = get_symptom_analyzer()
+    dp = create_dispatcher(analyzer)
+
+    # Справочник врачей загружается до первого сообщения пользователя
+    await get_clinic_client().doctors.warm()
 
     # Запуск бота
     logger.info("Запуск Telegram бота (STUB версия)...")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        # Пулы соединений клиентов API клиники и OpenAI закрываются при остановке
+        await close_clinic_client()
+        await analyzer.close()
 
 
 if __name__ == "__main__":
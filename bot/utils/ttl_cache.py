@@ -0,0 +1,60 @@
+"""LRU-кэш с временем жизни записей."""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Кэш на `maxsize` записей: при переполнении вытесняется давно не
+    использованная, запись старше `ttl_seconds` считается отсутствующей.
+    Все операции O(1).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> Optional[V]:
+        """Значение или None (нет записи или она истекла)."""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        stored_at, value = item
+        if self.clock() - stored_at >= self.ttl_seconds:
+            del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Сохранить значение; вытеснить самую старую запись при переполнении."""
+        if self.maxsize <= 0:
+            return
+        self._items[key] = (self.clock(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        self._items.clear()
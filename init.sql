@@ -7,6 +7,9 @@
 -- Гарантируем, что сессия работает в UTC
 SET TIME ZONE 'UTC';
 
+-- GiST по (doctor_id, tstzrange) для ограничения исключения пересечений приемов
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
 -- Создание таблицы врачей
 CREATE TABLE IF NOT EXISTS doctors (
     id SERIAL PRIMARY KEY,
@@ -24,9 +27,97 @@ CREATE TABLE IF NOT EXISTS appointments (
     patient_name VARCHAR(255) NOT NULL,
     start_time TIMESTAMPTZ NOT NULL,
     created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    telegram_chat_id BIGINT,
+    reminder_sent_at TIMESTAMPTZ,
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    end_time TIMESTAMPTZ NOT NULL,
+    reminder_attempts SMALLINT NOT NULL DEFAULT 0
+);
+
+-- Колонки напоминаний для баз, созданных до их появления (make migrate)
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS telegram_chat_id BIGINT;
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS reminder_sent_at TIMESTAMPTZ;
+
+-- Длительность приема (15/30/60 минут); старые записи - по 30 минут
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS duration_minutes SMALLINT NOT NULL DEFAULT 30;
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS end_time TIMESTAMPTZ;
+UPDATE appointments
+SET end_time = start_time + make_interval(mins => duration_minutes)
+WHERE end_time IS NULL;
+ALTER TABLE appointments ALTER COLUMN end_time SET NOT NULL;
+
+-- Число неудачных отправок напоминания (REMINDER_MAX_ATTEMPTS)
+ALTER TABLE appointments ADD COLUMN IF NOT EXISTS reminder_attempts SMALLINT NOT NULL DEFAULT 0;
+
+-- Архив прошедших записей (app/maintenance/archive.py).
+-- ID сохраняется из appointments; внешнего ключа нет, архив переживает врача.
+CREATE TABLE IF NOT EXISTS appointments_archive (
+    id INTEGER PRIMARY KEY,
+    doctor_id INTEGER NOT NULL,
+    patient_name VARCHAR(255) NOT NULL,
+    start_time TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    end_time TIMESTAMPTZ NOT NULL
+);
+
+ALTER TABLE appointments_archive ADD COLUMN IF NOT EXISTS duration_minutes SMALLINT NOT NULL DEFAULT 30;
+ALTER TABLE appointments_archive ADD COLUMN IF NOT EXISTS end_time TIMESTAMPTZ;
+UPDATE appointments_archive
+SET end_time = start_time + make_interval(mins => duration_minutes)
+WHERE end_time IS NULL;
+ALTER TABLE appointments_archive ALTER COLUMN end_time SET NOT NULL;
+
+-- Очередь бронирований (режим BOOKING_QUEUE_ENABLED)
+CREATE TABLE IF NOT EXISTS booking_tickets (
+    id SERIAL PRIMARY KEY,
+    token VARCHAR(32) NOT NULL UNIQUE,
+    doctor_id INTEGER NOT NULL,
+    patient_name VARCHAR(255) NOT NULL,
+    start_time TIMESTAMPTZ NOT NULL,
+    duration_minutes SMALLINT NOT NULL DEFAULT 30,
+    hold_token VARCHAR(32),
+    telegram_chat_id BIGINT,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    appointment_id INTEGER,
+    error VARCHAR(255),
+    attempts SMALLINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMPTZ
+);
+
+ALTER TABLE booking_tickets ADD COLUMN IF NOT EXISTS telegram_chat_id BIGINT;
+ALTER TABLE booking_tickets ADD COLUMN IF NOT EXISTS duration_minutes SMALLINT NOT NULL DEFAULT 30;
+ALTER TABLE booking_tickets ADD COLUMN IF NOT EXISTS attempts SMALLINT NOT NULL DEFAULT 0;
+
+-- Временные удержания слотов (POST /holds); истекшие строки считаются пустыми
+CREATE TABLE IF NOT EXISTS slot_holds (
+    doctor_id INTEGER NOT NULL REFERENCES doctors(id) ON DELETE CASCADE,
+    start_time TIMESTAMPTZ NOT NULL,
+    token VARCHAR(32) NOT NULL UNIQUE,
+    expires_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (doctor_id, start_time)
+);
+
+-- Агрегаты загрузки: число записей и занятые минуты врача за день
+-- (день - по времени клиники)
+CREATE TABLE IF NOT EXISTS doctor_daily_stats (
+    doctor_id INTEGER NOT NULL REFERENCES doctors(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    appointments_count INTEGER NOT NULL DEFAULT 0,
+    booked_minutes INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (doctor_id, day)
 );
 
+-- Миграция существующих баз: точные минуты дает пересчет
+-- (python -m app.maintenance.stats)
+ALTER TABLE doctor_daily_stats ADD COLUMN IF NOT EXISTS booked_minutes INTEGER NOT NULL DEFAULT 0;
+
 -- Создание функции для автоматического обновления поля updated_at
 -- CURRENT_TIMESTAMP будет использовать часовой пояс сессии (PGTZ).
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -54,11 +145,38 @@ ALTER TABLE appointments
 ADD CONSTRAINT unique_doctor_time
 UNIQUE (doctor_id, start_time);
 
+-- Приемы одного врача не пересекаются: [start_time, end_time) разных записей
+-- не имеют общих точек. Проверка - по GiST-индексу за O(log n).
+-- На секционированной таблице (sql/partition_appointments.sql) ограничение
+-- создается в каждой секции: прием не пересекает границу месяца.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'appointments_no_overlap'
+    ) AND NOT EXISTS (
+        SELECT 1 FROM pg_partitioned_table
+        WHERE partrelid = 'appointments'::regclass
+    ) THEN
+        ALTER TABLE appointments
+        ADD CONSTRAINT appointments_no_overlap
+        EXCLUDE USING gist (doctor_id WITH =, tstzrange(start_time, end_time) WITH &&);
+    END IF;
+END
+$$;
+
 -- Создание индексов для ускорения запросов
 CREATE INDEX IF NOT EXISTS idx_doctors_is_active ON doctors(is_active);
+DROP INDEX IF EXISTS idx_doctors_specialization_lower;
+CREATE INDEX IF NOT EXISTS idx_doctors_specialization ON doctors(specialization);
 CREATE INDEX IF NOT EXISTS idx_appointments_doctor_id ON appointments(doctor_id);
 CREATE INDEX IF NOT EXISTS idx_appointments_start_time ON appointments(start_time);
 CREATE INDEX IF NOT EXISTS idx_appointments_created_at ON appointments(created_at);
+CREATE INDEX IF NOT EXISTS idx_appointments_archive_doctor_id ON appointments_archive(doctor_id);
+CREATE INDEX IF NOT EXISTS idx_appointments_archive_start_time ON appointments_archive(start_time);
+CREATE INDEX IF NOT EXISTS idx_doctor_daily_stats_day ON doctor_daily_stats(day);
+CREATE INDEX IF NOT EXISTS idx_booking_tickets_status_doctor ON booking_tickets(status, doctor_id);
+CREATE INDEX IF NOT EXISTS idx_booking_tickets_processed_at ON booking_tickets(processed_at);
+CREATE INDEX IF NOT EXISTS idx_slot_holds_expires_at ON slot_holds(expires_at);
 
 -- Заполнение таблицы врачей базовыми данными
 INSERT INTO doctors (id, name, specialization, is_active) VALUES
@@ -73,4 +191,4 @@ ON CONFLICT (id) DO NOTHING;
 SELECT setval('doctors_id_seq', (SELECT GREATEST(MAX(id), 5) FROM doctors));
 
 -- Вывод информации о созданных таблицах
-\echo 'Таблицы "doctors" и "appointments" и связанные объекты успешно созданы.' 
\ No newline at end of file
+\echo 'Таблицы "doctors", "appointments", "appointments_archive", "doctor_daily_stats", "booking_tickets", "slot_holds" и связанные объекты успешно созданы.' 
\ No newline at end of file
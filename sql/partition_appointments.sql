@@ -0,0 +1,148 @@
+-- =================================================================
+-- Помесячное секционирование таблицы appointments по start_time.
+--
+-- Опциональная миграция поверх init.sql (PostgreSQL 13+):
+--   make migrate-partitioning
+-- После миграции включите APPOINTMENTS_PARTITIONING=true, чтобы приложение
+-- создавало секции на будущие месяцы (ensure_appointments_partitions).
+-- =================================================================
+
+SET TIME ZONE 'UTC';
+
+-- Создать секции с месяца from_month по месяц (текущий + months_ahead)
+-- включительно. Строки, попавшие в секцию по умолчанию, переносятся в новую
+-- секцию. Возвращает имена созданных секций.
+-- Ограничение исключения пересечений приемов создается в каждой секции:
+-- на секционированной таблице оно допустимо только с ключом секционирования
+-- через "=", а прием не пересекает границу месяца.
+CREATE OR REPLACE FUNCTION ensure_appointments_partitions(
+    months_ahead INTEGER,
+    from_month TIMESTAMPTZ DEFAULT date_trunc('month', now())
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', from_month);
+    last_month TIMESTAMPTZ := date_trunc('month', now()) + make_interval(months => months_ahead);
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+    has_default_rows BOOLEAN;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        month_end := month_start + INTERVAL '1 month';
+        partition_name := 'appointments_' || to_char(month_start, '"y"YYYY"m"MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'SELECT EXISTS (SELECT 1 FROM appointments_default '
+                'WHERE start_time >= %L AND start_time < %L)',
+                month_start, month_end
+            ) INTO has_default_rows;
+
+            IF has_default_rows THEN
+                EXECUTE format(
+                    'CREATE TEMP TABLE appointments_moving ON COMMIT DROP AS '
+                    'WITH moved AS (DELETE FROM appointments_default '
+                    'WHERE start_time >= %L AND start_time < %L RETURNING *) '
+                    'SELECT * FROM moved',
+                    month_start, month_end
+                );
+            END IF;
+
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF appointments '
+                'FOR VALUES FROM (%L) TO (%L)',
+                partition_name, month_start, month_end
+            );
+            EXECUTE format(
+                'ALTER TABLE %I ADD CONSTRAINT %I EXCLUDE USING gist '
+                '(doctor_id WITH =, tstzrange(start_time, end_time) WITH &&)',
+                partition_name, partition_name || '_no_overlap'
+            );
+
+            IF has_default_rows THEN
+                INSERT INTO appointments SELECT * FROM appointments_moving;
+                DROP TABLE appointments_moving;
+            END IF;
+
+            RETURN NEXT partition_name;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql
+SET timezone TO 'UTC';  -- Границы месяцев не зависят от timezone сессии
+
+DO $$
+BEGIN
+    -- Миграция идемпотентна: повторный запуск ничего не делает
+    IF (SELECT relkind FROM pg_class WHERE oid = 'appointments'::regclass) = 'p' THEN
+        RAISE NOTICE 'appointments уже секционирована';
+        RETURN;
+    END IF;
+
+    ALTER TABLE appointments RENAME TO appointments_unpartitioned;
+    ALTER TABLE appointments_unpartitioned
+        RENAME CONSTRAINT unique_doctor_time TO unique_doctor_time_unpartitioned;
+    ALTER TABLE appointments_unpartitioned
+        RENAME CONSTRAINT appointments_pkey TO appointments_unpartitioned_pkey;
+    ALTER TABLE appointments_unpartitioned
+        RENAME CONSTRAINT appointments_no_overlap TO appointments_no_overlap_unpartitioned;
+    ALTER INDEX idx_appointments_doctor_id RENAME TO idx_appointments_doctor_id_unpartitioned;
+    ALTER INDEX idx_appointments_start_time RENAME TO idx_appointments_start_time_unpartitioned;
+    ALTER INDEX idx_appointments_created_at RENAME TO idx_appointments_created_at_unpartitioned;
+    DROP TRIGGER update_appointments_updated_at ON appointments_unpartitioned;
+    ALTER SEQUENCE appointments_id_seq OWNED BY NONE;
+
+    -- Ключ секционирования входит в первичный ключ и в unique_doctor_time,
+    -- поэтому уникальность (doctor_id, start_time) сохраняется глобально.
+    CREATE TABLE appointments (
+        id INTEGER NOT NULL DEFAULT nextval('appointments_id_seq'),
+        doctor_id INTEGER NOT NULL REFERENCES doctors(id) ON DELETE CASCADE,
+        patient_name VARCHAR(255) NOT NULL,
+        start_time TIMESTAMPTZ NOT NULL,
+        created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+        telegram_chat_id BIGINT,
+        reminder_sent_at TIMESTAMPTZ,
+        duration_minutes SMALLINT NOT NULL DEFAULT 30,
+        end_time TIMESTAMPTZ NOT NULL,
+        reminder_attempts SMALLINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (id, start_time),
+        CONSTRAINT unique_doctor_time UNIQUE (doctor_id, start_time)
+    ) PARTITION BY RANGE (start_time);
+
+    ALTER SEQUENCE appointments_id_seq OWNED BY appointments.id;
+
+    -- Индексы на родительской таблице создаются в каждой секции
+    CREATE INDEX idx_appointments_doctor_id ON appointments(doctor_id);
+    CREATE INDEX idx_appointments_start_time ON appointments(start_time);
+    CREATE INDEX idx_appointments_created_at ON appointments(created_at);
+
+    CREATE TRIGGER update_appointments_updated_at
+        BEFORE UPDATE ON appointments
+        FOR EACH ROW
+        EXECUTE FUNCTION update_updated_at_column();
+
+    -- Секция по умолчанию: вставка не падает, если секция месяца еще не создана
+    CREATE TABLE appointments_default PARTITION OF appointments DEFAULT;
+    ALTER TABLE appointments_default
+        ADD CONSTRAINT appointments_default_no_overlap
+        EXCLUDE USING gist (doctor_id WITH =, tstzrange(start_time, end_time) WITH &&);
+
+    PERFORM ensure_appointments_partitions(
+        3,
+        COALESCE(
+            (SELECT min(start_time) FROM appointments_unpartitioned),
+            now()
+        )
+    );
+
+    INSERT INTO appointments SELECT * FROM appointments_unpartitioned;
+    DROP TABLE appointments_unpartitioned;
+END;
+$$;
+
+ANALYZE appointments;
+
+\echo 'Таблица appointments секционирована по месяцам start_time.'
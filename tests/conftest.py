@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from app.db.database import Base, get_db
 from app.main import app
+from app.services.doctor_directory import get_doctor_directory
 
 # Тестовая база данных SQLite
 SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -31,6 +32,8 @@ def setup_teardown_app():
     # Настройка перед тестом
     original_overrides = app.dependency_overrides.copy()
     app.dependency_overrides[get_db] = override_get_db
+    # Схема пересоздается в каждом тесте - справочник не должен переживать тест
+    get_doctor_directory().invalidate()
 
     yield
 
@@ -0,0 +1,210 @@
+"""Тесты контроля допуска запросов."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import AdmissionController, AdmissionControlMiddleware
+from app.core.settings import Settings, get_settings
+from app.db.pool_wait import (
+    PoolWaitTracker,
+    install_pool_wait_tracking,
+    pool_wait_tracker,
+)
+from app.main import create_app
+
+
+def make_controller(**overrides: object) -> AdmissionController:
+    """Контроллер с щедрыми лимитами по умолчанию."""
+    options: dict = {
+        "max_in_flight": 10,
+        "route_limits": {},
+        "client_rate": 100.0,
+        "client_burst": 100,
+        "max_pool_wait_seconds": 0.2,
+        "priority": "read",
+        "reserved_share": 0.2,
+        "retry_after_seconds": 1.0,
+        "pool_wait": PoolWaitTracker(),
+    }
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_client_token_bucket_returns_429() -> None:
+    """Клиент сверх burst получает 429, другой клиент - нет."""
+    controller = make_controller(client_rate=1.0, client_burst=2)
+
+    for _ in range(2):
+        rejection, route = controller.admit("GET", "/doctors", "10.0.0.1")
+        assert rejection is None
+        controller.release(route)
+
+    rejection, _ = controller.admit("GET", "/doctors", "10.0.0.1")
+    assert rejection is not None
+    assert rejection.status_code == 429
+    assert 0 < rejection.retry_after <= 1
+    assert controller.admit("GET", "/doctors", "10.0.0.2")[0] is None
+
+
+def test_zero_client_rate_is_rejected_by_settings() -> None:
+    """ADMISSION_CLIENT_RATE=0 - ошибка конфигурации, а не 500 на каждый запрос."""
+    with pytest.raises(ValidationError, match="admission_client_rate"):
+        Settings(admission_client_rate=0)
+
+
+def test_reserved_capacity_for_priority_class() -> None:
+    """Неприоритетным бронированиям недоступен резерв чтений."""
+    controller = make_controller(max_in_flight=5, reserved_share=0.4)
+
+    for _ in range(3):
+        assert controller.admit("POST", "/appointments", "c")[0] is None
+    rejection, _ = controller.admit("POST", "/appointments", "c")
+    assert rejection is not None and rejection.status_code == 503
+
+    for _ in range(2):
+        assert controller.admit("GET", "/doctors", "c")[0] is None
+    assert controller.admit("GET", "/doctors", "c")[0] is not None
+    assert controller.rejected == {"in_flight": 2}
+
+
+def test_priority_can_favor_bookings() -> None:
+    """При приоритете бронирований резерв достается им."""
+    controller = make_controller(
+        max_in_flight=2, reserved_share=0.5, priority="booking"
+    )
+
+    assert controller.admit("GET", "/doctors", "c")[0] is None
+    assert controller.admit("GET", "/doctors", "c")[0] is not None
+    assert controller.admit("POST", "/appointments", "c")[0] is None
+
+
+def test_pool_saturation_sheds_secondary_class() -> None:
+    """При долгом ожидании пула отбрасывается только неприоритетный класс."""
+    pool_wait = PoolWaitTracker()
+    pool_wait.record(0.5)
+    controller = make_controller(pool_wait=pool_wait)
+
+    rejection, _ = controller.admit("POST", "/appointments", "c")
+    assert rejection is not None and rejection.reason == "pool_saturated"
+    assert controller.admit("GET", "/appointments/1", "c")[0] is None
+
+
+def test_pool_wait_decays_without_new_samples() -> None:
+    """После всплеска ожидания допуск восстанавливается и без новых замеров."""
+    now = [0.0]
+    pool_wait = PoolWaitTracker(half_life_seconds=1.0, clock=lambda: now[0])
+    pool_wait.record(0.8)
+    controller = make_controller(pool_wait=pool_wait)
+    assert controller.admit("POST", "/appointments", "c")[0] is not None
+
+    now[0] = 1.0
+    assert pool_wait.value == pytest.approx(0.4)
+    assert controller.admit("POST", "/appointments", "c")[0] is not None
+
+    now[0] = 3.0
+    assert pool_wait.value == pytest.approx(0.1)
+    assert controller.admit("POST", "/appointments", "c")[0] is None
+    assert pool_wait.samples == 1
+
+
+def test_route_limit_uses_longest_matching_key() -> None:
+    """Лимит маршрута выбирается по самому длинному префиксу."""
+    controller = make_controller(
+        route_limits={"* /": 100, "POST /appointments": 1}, priority="booking"
+    )
+
+    rejection, route = controller.admit("POST", "/appointments", "c")
+    assert rejection is None and route == "POST /appointments"
+    rejection, _ = controller.admit("POST", "/appointments", "c")
+    assert rejection is not None and rejection.reason == "route_limit"
+
+    controller.release(route)
+    assert controller.admit("POST", "/appointments", "c")[0] is None
+
+
+def test_route_limit_matches_whole_path_segments() -> None:
+    """Префикс лимита совпадает только по целым сегментам пути."""
+    controller = make_controller(route_limits={"POST /appointments": 1})
+
+    assert controller.route_key("POST", "/appointments") == "POST /appointments"
+    assert controller.route_key("POST", "/appointments/") == "POST /appointments"
+    assert controller.route_key("POST", "/appointmentsX") is None
+
+    controller.route_limits["POST /appointments/series"] = 1
+    assert (
+        controller.route_key("POST", "/appointments/series")
+        == "POST /appointments/series"
+    )
+    assert controller.route_key("POST", "/appointments/series2") == (
+        "POST /appointments"
+    )
+
+
+async def test_middleware_fails_fast_with_retry_after() -> None:
+    """Запрос сверх емкости сразу получает 503 с Retry-After."""
+    release = asyncio.Event()
+    inner = FastAPI()
+
+    @inner.get("/slow")
+    async def slow() -> dict[str, str]:
+        await release.wait()
+        return {"status": "ok"}
+
+    @inner.get("/health")
+    async def health_check() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    controller = make_controller(max_in_flight=1, reserved_share=0.0)
+    app = AdmissionControlMiddleware(inner, controller)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        first = asyncio.create_task(ac.get("/slow"))
+        while controller.in_flight == 0:
+            await asyncio.sleep(0)
+
+        rejected = await ac.get("/slow")
+        health = await ac.get("/health")
+        release.set()
+        admitted = await first
+
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert admitted.status_code == 200
+    assert controller.in_flight == 0
+
+
+def test_create_app_installs_middleware_when_enabled() -> None:
+    """Middleware подключается только при ADMISSION_ENABLED."""
+    settings = get_settings()
+    enabled = settings.model_copy(update={"admission_enabled": True})
+
+    assert not any(
+        m.cls is AdmissionControlMiddleware
+        for m in create_app(settings).user_middleware
+    )
+    assert any(
+        m.cls is AdmissionControlMiddleware for m in create_app(enabled).user_middleware
+    )
+
+
+async def test_pool_wait_tracking_records_connection_checkout(
+    test_db: AsyncSession,
+) -> None:
+    """Первый запрос сессии учитывается как ожидание соединения."""
+    install_pool_wait_tracking()
+    pool_wait_tracker.reset()
+
+    await test_db.execute(text("SELECT 1"))
+    await test_db.execute(text("SELECT 1"))
+
+    assert pool_wait_tracker.samples == 1
+    assert pool_wait_tracker.value >= 0
@@ -0,0 +1,109 @@
+"""Тесты архивации прошедших записей."""
+
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.main import app
+from app.maintenance.archive import archive_old_appointments
+from app.models.appointment import Appointment, AppointmentArchive
+from app.models.doctor import Doctor
+from tests.conftest import TestingSessionLocal, engine
+
+
+async def create_history(test_db: AsyncSession) -> tuple[list[int], list[int]]:
+    """Создать врача, 5 старых и 2 свежие записи; вернуть их ID."""
+    doctor = Doctor(name="Тестовый врач", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    old = [
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name=f"Старый пациент {i}",
+            start_time=now - timedelta(days=400 + i),
+        )
+        for i in range(5)
+    ]
+    recent = [
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name=f"Новый пациент {i}",
+            start_time=now - timedelta(days=i + 1),
+        )
+        for i in range(2)
+    ]
+    test_db.add_all(old + recent)
+    await test_db.commit()
+    return [a.id for a in old], [a.id for a in recent]
+
+
+async def count(test_db: AsyncSession, model: type) -> int:
+    """Число строк в таблице модели."""
+    return int(await test_db.scalar(select(func.count()).select_from(model)) or 0)
+
+
+async def test_archive_moves_old_appointments_in_batches(
+    test_db: AsyncSession,
+) -> None:
+    """Старые записи переносятся пачками, свежие остаются."""
+    old_ids, recent_ids = await create_history(test_db)
+
+    archived = await archive_old_appointments(
+        TestingSessionLocal, older_than_days=365, batch_size=2
+    )
+
+    assert archived == len(old_ids)
+    assert await count(test_db, Appointment) == len(recent_ids)
+    assert await count(test_db, AppointmentArchive) == len(old_ids)
+    archived_ids = (await test_db.execute(select(AppointmentArchive.id))).scalars()
+    assert sorted(archived_ids) == sorted(old_ids)
+
+
+async def test_archive_respects_max_batches(test_db: AsyncSession) -> None:
+    """Ограничение числа пачек за запуск."""
+    await create_history(test_db)
+
+    archived = await archive_old_appointments(
+        TestingSessionLocal, older_than_days=365, batch_size=2, max_batches=1
+    )
+
+    assert archived == 2
+    assert await count(test_db, AppointmentArchive) == 2
+
+
+async def test_archive_works_with_per_model_binds(test_db: AsyncSession) -> None:
+    """Сессии с binds= (без общего db.bind) архивируют и выполняют ANALYZE."""
+    old_ids, _ = await create_history(test_db)
+    sessionmaker = async_sessionmaker(
+        binds={Appointment: engine, AppointmentArchive: engine, Doctor: engine}
+    )
+
+    archived = await archive_old_appointments(
+        sessionmaker, older_than_days=365, batch_size=10
+    )
+
+    assert archived == len(old_ids)
+
+
+async def test_get_appointment_falls_back_to_archive(test_db: AsyncSession) -> None:
+    """GET /appointments/{id} прозрачно отдает архивную запись."""
+    old_ids, _ = await create_history(test_db)
+    await archive_old_appointments(
+        TestingSessionLocal, older_than_days=365, batch_size=100
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get(f"/appointments/{old_ids[0]}")
+        missing = await ac.get("/appointments/999999")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == old_ids[0]
+    assert data["patient_name"] == "Старый пациент 0"
+    assert missing.status_code == 404
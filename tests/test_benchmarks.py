@@ -0,0 +1,160 @@
+"""Смоук-тесты инструментов бенчмарков."""
+
+import os
+from dataclasses import replace
+from datetime import timezone
+from pathlib import Path
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.settings import settings
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.stats import DoctorDailyStats
+from benchmarks.common import percentile, summarize
+from benchmarks.contention import ContentionConfig, run_contention
+from benchmarks.datagen import DatagenConfig, load_dataset
+from benchmarks.http_load import SCENARIOS, LoadConfig, run_load
+
+
+def test_percentile_nearest_rank() -> None:
+    """Тест перцентилей методом ближайшего ранга."""
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_reports_throughput() -> None:
+    """Тест сводки латентностей."""
+    summary = summarize([0.01, 0.02, 0.03, 0.04], elapsed=2.0)
+
+    assert summary["count"] == 4
+    assert summary["throughput_rps"] == 2.0
+    assert summary["p50_ms"] == 20.0
+    assert summary["max_ms"] == 40.0
+
+
+async def test_http_load_scenarios_smoke(tmp_path: Path) -> None:
+    """Каждый сценарий проходит на SQLite и дает ожидаемые статусы."""
+    for name in SCENARIOS:
+        config = LoadConfig(
+            scenario=name,
+            requests=40,
+            concurrency=4,
+            doctors=2,
+            seed_appointments=10,
+            database_url=f"sqlite+aiosqlite:///{tmp_path / name}.db",
+        )
+
+        result = await run_load(config)
+
+        assert result["dialect"] == "sqlite"
+        assert result["total"]["count"] == 40
+        operations = result["operations"]
+        assert set(operations.get("read", {}).get("statuses", {})) <= {"200"}
+        assert set(operations.get("book", {}).get("statuses", {})) <= {"201"}
+        assert set(operations.get("conflict", {}).get("statuses", {})) <= {"400"}
+
+
+async def test_contention_never_double_books(tmp_path: Path) -> None:
+    """Гонка за слоты одного врача не приводит к двойным записям."""
+    config = ContentionConfig(
+        clients=30,
+        slots=3,
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'contention'}.db",
+    )
+
+    result = await run_contention(config)
+
+    outcomes = result["outcomes"]
+    assert outcomes["booked"] == 3
+    assert outcomes["other"] == 0
+    assert sum(outcomes.values()) == 30
+    assert result["consistency"]["double_bookings"] == 0
+    assert result["consistency"]["ok"]
+
+
+async def test_datagen_loads_unique_working_slots(tmp_path: Path) -> None:
+    """Генератор дает уникальные рабочие слоты и ровно заданный объем."""
+    config = DatagenConfig(doctors=30, appointments=3000, years=0.25, batch_size=500)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'datagen'}.db")
+
+    try:
+        stats = await load_dataset(engine, config, reset=True)
+        async with engine.connect() as conn:
+            stored = await conn.scalar(select(func.count()).select_from(Appointment))
+            distinct = await conn.scalar(
+                select(func.count()).select_from(
+                    select(Appointment.doctor_id, Appointment.start_time)
+                    .distinct()
+                    .subquery()
+                )
+            )
+            start_times = (await conn.execute(select(Appointment.start_time))).scalars()
+            clinic_tz = ZoneInfo(settings.timezone)
+            local_times = [
+                start.replace(tzinfo=timezone.utc).astimezone(clinic_tz)
+                for start in start_times
+            ]
+    finally:
+        await engine.dispose()
+
+    assert stats.doctors == 30
+    assert stats.appointments == stored == distinct == 3000
+    assert all(local.weekday() < 5 for local in local_times)
+    assert all(
+        (9, 0) <= (local.hour, local.minute) <= (17, 30) for local in local_times
+    )
+
+
+async def test_bot_load_conversations_complete() -> None:
+    """Диалоги проходят через роутер бота на подставных серверах до записи."""
+    pytest.importorskip("aiogram")
+    pytest.importorskip("openai")
+    from benchmarks.bot.load import BotLoadConfig, run_bot_load
+
+    config = BotLoadConfig(
+        conversations=20, concurrency=5, openai_latency_ms=5, step_timeout_seconds=10
+    )
+    # Окружение бота направляется на подставные серверы только на время теста
+    with patch.dict(os.environ):
+        result = await run_bot_load(config)
+
+    outcomes = result["conversations"]["outcomes"]
+    assert sum(outcomes.values()) == 20
+    assert set(outcomes) <= {"booked", "rejected"}
+    assert result["steps"]["symptoms"]["statuses"] == {"ok": 20}
+    assert result["api_calls"]["telegram"]["sendMessage"] == 20
+    assert result["api_calls"]["clinic_api"]["POST /appointments"] == 20
+
+
+async def test_datagen_appends_without_reset(tmp_path: Path) -> None:
+    """Повторная загрузка без --reset продолжает ID и пересчитывает статистику."""
+    config = DatagenConfig(doctors=5, appointments=200, years=0.1, batch_size=50)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'append'}.db")
+
+    try:
+        first = await load_dataset(engine, config, reset=True)
+        second = await load_dataset(engine, replace(config, seed=7))
+        async with engine.connect() as conn:
+            doctors = await conn.scalar(select(func.count()).select_from(Doctor))
+            appointments = await conn.scalar(
+                select(func.count()).select_from(Appointment)
+            )
+            counted = await conn.scalar(
+                select(func.sum(DoctorDailyStats.appointments_count))
+            )
+    finally:
+        await engine.dispose()
+
+    assert doctors == 10
+    assert appointments == first.appointments + second.appointments == 400
+    assert second.daily_stats > 0
+    assert counted == 400
@@ -0,0 +1,215 @@
+"""Тесты режима очереди бронирований."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import clinic_timezone
+from app.core.settings import get_settings
+from app.crud.doctor import check_doctor_availability
+from app.crud.stats import DailyLoad, get_doctor_daily_stats
+from app.main import app, start_background_tasks, stop_background_tasks
+from app.models.appointment import Appointment
+from app.models.booking_ticket import BookingTicket
+from app.models.doctor import Doctor
+from app.services.booking_queue import process_shard
+from tests.conftest import TestingSessionLocal
+
+SHARDS = 4
+
+
+@pytest.fixture
+def queue_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Включить режим очереди."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "booking_queue_enabled", True)
+    monkeypatch.setattr(settings, "booking_queue_shards", SHARDS)
+
+
+def next_workday_slot(hour: int = 10) -> datetime:
+    """Слот ближайшего будущего рабочего дня клиники."""
+    day: date = datetime.now(clinic_timezone()).date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime(day.year, day.month, day.day, hour, tzinfo=clinic_timezone())
+
+
+async def create_doctor(test_db: AsyncSession) -> Doctor:
+    """Активный врач."""
+    doctor = Doctor(name="Тестовый врач", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+    return doctor
+
+
+async def book(ac: AsyncClient, doctor_id: int, start_time: datetime) -> dict:
+    """POST /appointments в режиме очереди."""
+    response = await ac.post(
+        "/appointments",
+        json={
+            "doctor_id": doctor_id,
+            "patient_name": "Тестовый пациент",
+            "start_time": start_time.isoformat(),
+        },
+    )
+    assert response.status_code == 202
+    assert response.headers["Location"].endswith(response.json()["token"])
+    return response.json()
+
+
+async def drain(doctor_id: int) -> int:
+    """Обработать заявки шарда врача."""
+    return await process_shard(
+        TestingSessionLocal, doctor_id % SHARDS, SHARDS, batch_size=50, max_attempts=3
+    )
+
+
+async def test_queued_booking_is_processed_by_shard_worker(
+    test_db: AsyncSession, queue_mode: None
+) -> None:
+    """202 с токеном, после обработки шарда - запись и агрегат."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        ticket = await book(ac, doctor.id, start_time)
+        assert ticket["status"] == "pending"
+        assert await test_db.scalar(select(Appointment.id)) is None
+
+        assert await drain(doctor.id) == 1
+        response = await ac.get(f"/appointments/tickets/{ticket['token']}")
+
+    result = response.json()
+    assert result["status"] == "succeeded"
+    appointment = await test_db.get(Appointment, result["appointment_id"])
+    assert appointment is not None
+    stats = await get_doctor_daily_stats(test_db, start_time.date(), start_time.date())
+    assert stats == {(doctor.id, start_time.date()): DailyLoad(1, 30)}
+
+
+async def test_conflicting_tickets_are_processed_in_order(
+    test_db: AsyncSession, queue_mode: None
+) -> None:
+    """Из двух заявок на один слот выигрывает первая."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        first = await book(ac, doctor.id, start_time)
+        second = await book(ac, doctor.id, start_time)
+        await drain(doctor.id)
+        first_result = (await ac.get(f"/appointments/tickets/{first['token']}")).json()
+        second_result = (
+            await ac.get(f"/appointments/tickets/{second['token']}")
+        ).json()
+
+    assert first_result["status"] == "succeeded"
+    assert second_result["status"] == "failed"
+    assert second_result["error"] == "Врач уже занят в это время"
+
+
+async def test_unexpected_error_fails_ticket_after_max_attempts(
+    test_db: AsyncSession, queue_mode: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Неожиданная ошибка не обрывает пачку, а после 3 попыток отклоняет заявку."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+    monkeypatch.setattr(
+        "app.services.booking_queue.increment_doctor_daily_stats",
+        AsyncMock(side_effect=OperationalError("UPDATE", {}, Exception("gone"))),
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        ticket = await book(ac, doctor.id, start_time)
+        url = f"/appointments/tickets/{ticket['token']}"
+        for _ in range(2):
+            assert await drain(doctor.id) == 1
+            assert (await ac.get(url)).json()["status"] == "pending"
+        assert await drain(doctor.id) == 1
+        result = (await ac.get(url)).json()
+        assert await drain(doctor.id) == 0
+
+    assert result["status"] == "failed"
+    assert result["error"] == "Не удалось обработать заявку"
+    assert await test_db.scalar(select(Appointment.id)) is None
+    attempts = await test_db.scalar(
+        select(BookingTicket.attempts).where(BookingTicket.token == ticket["token"])
+    )
+    assert attempts == 3
+
+
+async def test_unknown_doctor_is_rejected_before_queueing(
+    test_db: AsyncSession, queue_mode: None
+) -> None:
+    """Неизвестный врач - 400 сразу, без заявки."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.post(
+            "/appointments",
+            json={
+                "doctor_id": 999,
+                "patient_name": "Тестовый пациент",
+                "start_time": next_workday_slot().isoformat(),
+            },
+        )
+
+    assert response.status_code == 400
+
+
+async def test_ticket_long_poll_returns_when_processed(
+    test_db: AsyncSession, queue_mode: None
+) -> None:
+    """GET с wait возвращается сразу после обработки заявки."""
+    doctor = await create_doctor(test_db)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        ticket = await book(ac, doctor.id, next_workday_slot())
+        poll = asyncio.create_task(
+            ac.get(f"/appointments/tickets/{ticket['token']}", params={"wait": 10})
+        )
+        await asyncio.sleep(0.05)
+        assert not poll.done()
+        await drain(doctor.id)
+        response = await asyncio.wait_for(poll, timeout=2)
+        missing = await ac.get("/appointments/tickets/unknown")
+
+    assert response.json()["status"] == "succeeded"
+    assert missing.status_code == 404
+
+
+async def test_availability_check_without_lock() -> None:
+    """lock=False не добавляет FOR UPDATE."""
+    db_mock = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = None
+    db_mock.execute.return_value = result
+
+    await check_doctor_availability(db_mock, 1, next_workday_slot(), lock=False)
+
+    statement = db_mock.execute.call_args.args[0]
+    assert statement._for_update_arg is None
+
+
+async def test_background_workers_started_per_shard(queue_mode: None) -> None:
+    """В режиме очереди запускается воркер на каждый шард."""
+    tasks = start_background_tasks(get_settings())
+    try:
+        names = {task.get_name() for task in tasks}
+        assert {f"booking-worker-{shard}" for shard in range(SHARDS)} <= names
+    finally:
+        await stop_background_tasks(tasks)
@@ -0,0 +1,190 @@
+"""Тесты кэша анализа симптомов бота с подставным LLM."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+
+pytest.importorskip("openai")
+
+from bot.ai import analyzer as analyzer_module  # noqa: E402
+from bot.ai.analyzer import SymptomAnalyzer  # noqa: E402
+from bot.ai.llm_client import CircuitBreaker, GovernedLLMClient  # noqa: E402
+from bot.utils.ttl_cache import TTLCache  # noqa: E402
+
+LLM_ANSWER = json.dumps(
+    {
+        "recommendations": [
+            {"specialty": "Невролог", "confidence": 90, "reasoning": "Головная боль"}
+        ]
+    },
+    ensure_ascii=False,
+)
+
+
+class FakeClock:
+    """Управляемые часы вместо time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeOpenAI:
+    """
+    Подставной AsyncOpenAI: chat.completions.create отвечает `answer`.
+
+    Ответ ждет `release` (по умолчанию разрешен); `error` - исключение
+    вместо ответа.
+    """
+
+    def __init__(self, answer: str = LLM_ANSWER) -> None:
+        self.answer = answer
+        self.error: Optional[Exception] = None
+        self.calls = 0
+        self.active = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request: Any) -> Any:
+        """Ответ chat completions."""
+        self.calls += 1
+        self.active += 1
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        if self.error is not None:
+            raise self.error
+        message = SimpleNamespace(content=self.answer)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self) -> None:
+        """Закрыть клиент."""
+        self.closed = True
+
+
+def make_analyzer(
+    monkeypatch: pytest.MonkeyPatch,
+    openai: Optional[FakeOpenAI] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    hedge_seconds: float = 0.0,
+) -> SymptomAnalyzer:
+    """Анализатор без настоящего клиента OpenAI, с подставным LLM."""
+    monkeypatch.setattr(analyzer_module.bot_settings, "openai_api_key", "")
+    analyzer = SymptomAnalyzer()
+    if openai is not None:
+        analyzer.llm = GovernedLLMClient(
+            openai,  # type: ignore[arg-type]
+            max_concurrency=4,
+            timeout_seconds=5.0,
+            breaker=breaker,
+        )
+    analyzer.hedge_seconds = hedge_seconds
+    return analyzer
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """При переполнении вытесняется давно не использованная запись."""
+    cache: TTLCache[str, int] = TTLCache(2, 60.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries() -> None:
+    """Запись старше TTL считается отсутствующей и удаляется."""
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(10, 60.0, clock=clock)
+    cache.set("a", 1)
+
+    clock.now += 59.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    disabled: TTLCache[str, int] = TTLCache(0, 60.0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+async def test_identical_requests_in_flight_share_one_llm_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Одинаковые (после нормализации) сообщения ждут один запрос к LLM."""
+    openai = FakeOpenAI()
+    analyzer = make_analyzer(monkeypatch, openai)
+    openai.release.clear()
+
+    waiters = [
+        asyncio.create_task(analyzer.analyze_symptoms(text))
+        for text in ("Болит голова", "болит  голова!", "БОЛИТ ГОЛОВА")
+    ]
+    await asyncio.sleep(0.01)
+    assert openai.calls == 1 and len(analyzer._inflight) == 1
+    openai.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert all(result == results[0] for result in results)
+    assert results[0][0].specialist_name == "Невролог"
+    assert not analyzer._inflight
+
+    # Ответ LLM закэширован: повтор не вызывает LLM
+    assert await analyzer.analyze_symptoms("Болит голова.") == results[0]
+    assert openai.calls == 1 and analyzer.cache.hits == 1
+
+
+async def test_fallback_answer_is_not_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ответ правил после ошибки LLM не кэшируется: следующий запрос пробует LLM."""
+    openai = FakeOpenAI()
+    openai.error = RuntimeError("провайдер недоступен")
+    analyzer = make_analyzer(monkeypatch, openai)
+
+    fallback = await analyzer.analyze_symptoms("Болит голова")
+
+    assert fallback == await analyzer._analyze_with_rules("Болит голова")
+    assert len(analyzer.cache) == 0
+
+    openai.error = None
+    recovered = await analyzer.analyze_symptoms("Болит голова")
+    assert openai.calls == 2
+    assert recovered[0].specialist_name == "Невролог"
+    assert len(analyzer.cache) == 1
+
+
+async def test_empty_llm_answer_falls_back_without_caching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Пустой или нераспознанный ответ LLM - ответ правил без кэширования."""
+    analyzer = make_analyzer(monkeypatch, FakeOpenAI(answer="не JSON"))
+
+    recommendations = await analyzer.analyze_symptoms("Сыпь на руках")
+
+    assert recommendations
+    assert len(analyzer.cache) == 0
+
+
+async def test_rules_only_answer_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Без LLM правила - основной ответ, и он кэшируется."""
+    analyzer = make_analyzer(monkeypatch)
+    assert analyzer.llm is None
+
+    first = await analyzer.analyze_symptoms("Сыпь на руках")
+
+    assert await analyzer.analyze_symptoms("сыпь на руках") == first
+    assert analyzer.cache.hits == 1
@@ -0,0 +1,236 @@
+"""Тесты пула соединений клиента API клиники (бот)."""
+
+import asyncio
+import json
+import logging
+from functools import partial
+from typing import AsyncIterator, Optional
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp import web  # noqa: E402
+
+from bot.api import clinic_client  # noqa: E402
+from bot.api.clinic_client import (  # noqa: E402
+    ClinicAPIClient,
+    close_clinic_client,
+    get_clinic_client,
+)
+from bot.api.doctor_directory import DirectorySnapshot  # noqa: E402
+
+DOCTORS = [
+    {"id": 1, "name": "Доктор Петров", "specialization": "Терапевт"},
+    {"id": 2, "name": "Доктор Сидорова", "specialization": "Кардиолог"},
+]
+START_TIME = "2030-03-04T10:00:00+00:00"
+APPOINTMENT = {
+    "id": 7,
+    "doctor_id": 1,
+    "patient_name": "Пациент",
+    "start_time": START_TIME,
+    "created_at": "2030-03-01T12:00:00+00:00",
+}
+
+
+class ClinicServer:
+    """
+    API клиники на aiohttp: запоминает клиентские порты соединений.
+
+    С `ticket_status` бронирование работает в режиме очереди: POST отвечает
+    202 с заявкой, опрос заявки возвращает этот статус.
+    """
+
+    def __init__(self) -> None:
+        self.peers: list[int] = []
+        self.url = ""
+        self.ticket_status: Optional[str] = None
+        self.ticket_error: Optional[str] = None
+        self.ticket_waits: list[float] = []
+
+    def app(self) -> web.Application:
+        """aiohttp-приложение сервера."""
+        app = web.Application()
+        app.router.add_get("/doctors", self.list_doctors)
+        app.router.add_post("/appointments", self.create_appointment)
+        app.router.add_get("/appointments/tickets/{token}", self.read_ticket)
+        app.router.add_get("/appointments/{appointment_id}", self.read_appointment)
+        return app
+
+    def ticket(self, status: str) -> dict:
+        """Тело заявки очереди бронирований."""
+        return {
+            "token": "t" * 32,
+            "status": status,
+            "doctor_id": 1,
+            "start_time": START_TIME,
+            "appointment_id": APPOINTMENT["id"] if status == "succeeded" else None,
+            "error": self.ticket_error if status == "failed" else None,
+            "created_at": "2030-03-01T12:00:00+00:00",
+        }
+
+    def _remember_peer(self, request: web.Request) -> None:
+        peername = request.transport.get_extra_info("peername")  # type: ignore
+        self.peers.append(peername[1])
+
+    async def list_doctors(self, request: web.Request) -> web.Response:
+        """GET /doctors."""
+        self._remember_peer(request)
+        return web.json_response(DOCTORS)
+
+    async def create_appointment(self, request: web.Request) -> web.Response:
+        """POST /appointments: врач стал неактивным или заявка в очереди."""
+        self._remember_peer(request)
+        if self.ticket_status is not None:
+            return web.json_response(self.ticket("pending"), status=202)
+        # FastAPI отдает JSON без экранирования кириллицы
+        return web.json_response(
+            {"detail": "Врач с ID 1 не найден или неактивен"},
+            status=400,
+            dumps=partial(json.dumps, ensure_ascii=False),
+        )
+
+    async def read_ticket(self, request: web.Request) -> web.Response:
+        """GET /appointments/tickets/{token}?wait=..."""
+        wait = float(request.query["wait"])
+        self.ticket_waits.append(wait)
+        assert self.ticket_status is not None
+        if self.ticket_status == "pending":
+            await asyncio.sleep(wait)  # long-poll до срока
+        return web.json_response(
+            self.ticket(self.ticket_status),
+            dumps=partial(json.dumps, ensure_ascii=False),
+        )
+
+    async def read_appointment(self, request: web.Request) -> web.Response:
+        """GET /appointments/{id}."""
+        return web.json_response(APPOINTMENT)
+
+
+@pytest.fixture
+async def server() -> AsyncIterator[ClinicServer]:
+    """Запущенный сервер на свободном порту."""
+    clinic = ClinicServer()
+    runner = web.AppRunner(clinic.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    clinic.url = f"http://{host}:{port}"
+    yield clinic
+    await runner.cleanup()
+
+
+async def test_session_is_created_lazily_and_reused(server: ClinicServer) -> None:
+    """Сессия создается первым запросом, дальше запросы идут по keep-alive."""
+    client = ClinicAPIClient(server.url)
+    assert client._session is None
+
+    try:
+        await client.fetch_doctors()
+        session = client._session
+        assert session is not None
+        await client.fetch_doctors()
+
+        assert client._session is session
+        # Оба запроса прошли по одному соединению пула
+        assert len(server.peers) == 2 and server.peers[0] == server.peers[1]
+    finally:
+        await client.close()
+
+
+async def test_session_is_recreated_after_close(server: ClinicServer) -> None:
+    """close() закрывает сессию, следующий запрос открывает новую."""
+    client = ClinicAPIClient(server.url)
+    await client.fetch_doctors()
+    first = client._session
+    assert first is not None
+
+    await client.close()
+    assert first.closed and client._session is None
+
+    async with client:
+        assert [doctor.id for doctor in await client.fetch_doctors()] == [1, 2]
+        second = client._session
+        assert second is not None and second is not first
+    assert second.closed and client._session is None
+
+
+async def test_shared_client_is_closed_and_recreated(
+    server: ClinicServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """get_clinic_client - один клиент процесса; close_clinic_client его сбрасывает."""
+    monkeypatch.setattr(clinic_client.bot_settings, "clinic_api_url", server.url)
+    get_clinic_client.cache_clear()
+
+    try:
+        client = get_clinic_client()
+        assert get_clinic_client() is client
+        await client.fetch_doctors()
+        session = client._session
+        assert session is not None
+
+        await close_clinic_client()
+        assert session.closed
+        assert get_clinic_client.cache_info().currsize == 0
+        assert get_clinic_client() is not client
+    finally:
+        await close_clinic_client()
+    # Повторное закрытие без клиента ничего не делает
+    await close_clinic_client()
+
+
+async def test_inactive_doctor_is_logged_and_dropped(
+    server: ClinicServer, caplog: pytest.LogCaptureFixture
+) -> None:
+    """400 «неактивен» пишется в лог и исключает врача из справочника."""
+    async with ClinicAPIClient(server.url) as client:
+        client.doctors._snapshot = DirectorySnapshot.build(
+            [clinic_client.Doctor.model_validate(doctor) for doctor in DOCTORS]
+        )
+        with caplog.at_level(logging.WARNING, logger=clinic_client.__name__):
+            result = await client.create_appointment(1, "Пациент", START_TIME)
+
+        assert result is None
+        assert "Ошибка создания записи: 400" in caplog.text
+        assert client.doctors._snapshot is not None
+        assert 1 not in client.doctors._snapshot.by_id
+
+
+async def test_queued_booking_waits_for_ticket(server: ClinicServer) -> None:
+    """202 с заявкой: клиент опрашивает заявку и возвращает созданную запись."""
+    server.ticket_status = "succeeded"
+
+    async with ClinicAPIClient(server.url) as client:
+        result = await client.create_appointment(1, "Пациент", START_TIME)
+
+    assert result is not None and result.id == APPOINTMENT["id"]
+    assert len(server.ticket_waits) == 1 and server.ticket_waits[0] > 0
+
+
+async def test_failed_ticket_drops_inactive_doctor(server: ClinicServer) -> None:
+    """Отклоненная заявка - неудача; врач «неактивен» исключается из справочника."""
+    server.ticket_status = "failed"
+    server.ticket_error = "Врач с ID 1 не найден или неактивен"
+
+    async with ClinicAPIClient(server.url) as client:
+        client.doctors._snapshot = DirectorySnapshot.build(
+            [clinic_client.Doctor.model_validate(doctor) for doctor in DOCTORS]
+        )
+        result = await client.create_appointment(1, "Пациент", START_TIME)
+
+        assert result is None
+        assert client.doctors._snapshot is not None
+        assert 1 not in client.doctors._snapshot.by_id
+
+
+async def test_pending_ticket_gives_up_after_wait(server: ClinicServer) -> None:
+    """Необработанная в срок заявка - неудача после ticket_wait_seconds."""
+    server.ticket_status = "pending"
+
+    async with ClinicAPIClient(server.url, ticket_wait_seconds=0.05) as client:
+        result = await client.create_appointment(1, "Пациент", START_TIME)
+
+    assert result is None
+    assert server.ticket_waits[0] == pytest.approx(0.05, abs=0.01)
+    assert all(wait <= 0.05 for wait in server.ticket_waits)
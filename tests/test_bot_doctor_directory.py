@@ -0,0 +1,168 @@
+"""Тесты справочника врачей бота (stale-while-revalidate)."""
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from bot.api.clinic_client import Doctor  # noqa: E402
+from bot.api.doctor_directory import DoctorDirectory  # noqa: E402
+
+TTL = 60.0
+MAX_STALE = 600.0
+
+
+class FakeClock:
+    """Управляемые часы вместо time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLoader:
+    """Загрузчик врачей: считает вызовы, может ждать разрешения или падать."""
+
+    def __init__(self) -> None:
+        self.doctors = [
+            Doctor(id=1, name="Доктор Петров", specialization="Терапевт"),
+            Doctor(id=2, name="Доктор Сидорова", specialization="Кардиолог"),
+        ]
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+        self.error: Optional[Exception] = None
+
+    async def __call__(self) -> list[Doctor]:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return list(self.doctors)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Часы справочника."""
+    return FakeClock()
+
+
+@pytest.fixture
+def loader() -> FakeLoader:
+    """Загрузчик справочника."""
+    return FakeLoader()
+
+
+@pytest.fixture
+def directory(clock: FakeClock, loader: FakeLoader) -> DoctorDirectory:
+    """Справочник с TTL минута и допустимой устарелостью 10 минут."""
+    return DoctorDirectory(loader, TTL, MAX_STALE, clock=clock)
+
+
+def names(doctors: list[Doctor]) -> list[str]:
+    """Имена врачей."""
+    return [doctor.name for doctor in doctors]
+
+
+async def test_concurrent_cold_start_loads_once(
+    directory: DoctorDirectory, loader: FakeLoader
+) -> None:
+    """Одновременные первые обращения ждут одну загрузку."""
+    loader.release.clear()
+    waiters = [asyncio.create_task(directory.list_doctors()) for _ in range(5)]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    results = await asyncio.gather(*waiters)
+
+    assert loader.calls == 1
+    assert all(len(doctors) == 2 for doctors in results)
+
+
+async def test_stale_snapshot_is_served_while_refreshing(
+    directory: DoctorDirectory, clock: FakeClock, loader: FakeLoader
+) -> None:
+    """После TTL сразу отдается старый снимок, обновление идет в фоне."""
+    await directory.warm()
+    loader.doctors.append(Doctor(id=3, name="Доктор Новиков", specialization="ЛОР"))
+    clock.now += TTL + 1
+
+    assert await directory.get_doctor(3) is None
+    task = directory._refresh_task
+    assert task is not None
+    await task
+
+    assert loader.calls == 2
+    assert await directory.get_doctor(3) is not None
+    assert names(await directory.list_doctors("лор")) == ["Доктор Новиков"]
+
+
+async def test_background_refresh_is_deduplicated(
+    directory: DoctorDirectory, clock: FakeClock, loader: FakeLoader
+) -> None:
+    """Много обращений к устаревшему снимку - одно фоновое обновление."""
+    await directory.warm()
+    clock.now += TTL + 1
+    loader.release.clear()
+
+    results = await asyncio.gather(*(directory.list_doctors() for _ in range(10)))
+    await asyncio.sleep(0)
+
+    assert all(len(doctors) == 2 for doctors in results)
+    assert loader.calls == 2
+    loader.release.set()
+    task = directory._refresh_task
+    assert task is not None
+    await task
+
+    # Свежий снимок: обращения больше не запускают загрузку
+    await directory.list_doctors()
+    assert loader.calls == 2
+
+
+async def test_too_stale_snapshot_is_reloaded_synchronously(
+    directory: DoctorDirectory, clock: FakeClock, loader: FakeLoader
+) -> None:
+    """Снимок старше TTL + max_stale перечитывается до ответа."""
+    await directory.warm()
+    loader.doctors.pop()
+    clock.now += TTL + MAX_STALE + 1
+
+    assert names(await directory.list_doctors()) == ["Доктор Петров"]
+    assert loader.calls == 2
+    assert directory._refresh_task is None
+
+
+async def test_too_stale_snapshot_survives_failed_reload(
+    directory: DoctorDirectory, clock: FakeClock, loader: FakeLoader
+) -> None:
+    """Если API недоступно, отдается старый справочник, а не ошибка."""
+    await directory.warm()
+    clock.now += TTL + MAX_STALE + 1
+    loader.error = RuntimeError("API клиники недоступно")
+
+    assert len(await directory.list_doctors()) == 2
+    assert loader.calls == 2
+
+
+async def test_invalidate_drops_inactive_doctor_immediately(
+    directory: DoctorDirectory, loader: FakeLoader
+) -> None:
+    """invalidate(doctor_id) после 400 «неактивен» убирает врача сразу."""
+    await directory.warm()
+    loader.doctors = loader.doctors[1:]
+
+    directory.invalidate(1)
+
+    assert await directory.get_doctor(1) is None
+    assert await directory.list_doctors("терапевт") == []
+    # Снимок помечен устаревшим: обращение запустило фоновое обновление
+    task = directory._refresh_task
+    assert task is not None
+    await task
+    assert loader.calls == 2
+    assert names(await directory.list_doctors()) == ["Доктор Сидорова"]
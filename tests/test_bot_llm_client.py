@@ -0,0 +1,168 @@
+"""Тесты управляемых вызовов LLM бота: выключатель, семафор, hedge."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("openai")
+
+from bot.ai.llm_client import (  # noqa: E402
+    CircuitBreaker,
+    GovernedLLMClient,
+    LLMUnavailableError,
+)
+from tests.test_bot_analyzer import FakeClock, FakeOpenAI, make_analyzer  # noqa: E402
+
+RESET = 30.0
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset() -> None:
+    """closed -> open после серии отказов -> half_open с одним пробным вызовом."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=RESET, clock=clock)
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now += RESET - 1
+    assert breaker.state == "open"
+    clock.now += 1
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # второй пробный вызов не пропускается
+
+    # Неудачная проба снова открывает выключатель на полный срок
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += RESET
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_breaker_released_probe_allows_new_one() -> None:
+    """Несостоявшаяся проба (отмена, очередь) не блокирует следующую."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=RESET, clock=clock)
+    breaker.record_failure()
+    clock.now += RESET
+
+    assert breaker.allow()
+    breaker.release_probe()
+    assert breaker.state == "half_open" and breaker.allow()
+
+
+async def test_open_breaker_fails_fast_without_calling_provider(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Открытый выключатель: провайдер не вызывается, отвечают правила."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=RESET, clock=clock)
+    openai = FakeOpenAI()
+    openai.error = RuntimeError("провайдер недоступен")
+    analyzer = make_analyzer(monkeypatch, openai, breaker=breaker)
+    rules = await analyzer._analyze_with_rules("Болит голова")
+
+    for _ in range(2):
+        assert await analyzer.analyze_symptoms("Болит голова") == rules
+    assert openai.calls == 2 and breaker.state == "open"
+
+    assert analyzer.llm is not None
+    with pytest.raises(LLMUnavailableError, match="выключатель"):
+        await analyzer.llm.complete(model="test", messages=[])
+    assert await analyzer.analyze_symptoms("Болит голова") == rules
+    assert openai.calls == 2
+
+    # После reset_seconds пробный запрос проходит и закрывает выключатель
+    openai.error = None
+    clock.now += RESET
+    recommendations = await analyzer.analyze_symptoms("Болит голова")
+    assert openai.calls == 3 and breaker.state == "closed"
+    assert recommendations[0].specialist_name == "Невролог"
+
+
+async def test_semaphore_deadline_does_not_trip_breaker() -> None:
+    """Не дождались слота семафора - LLMUnavailableError, но не отказ провайдера."""
+    openai = FakeOpenAI()
+    openai.release.clear()
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = GovernedLLMClient(
+        openai,  # type: ignore[arg-type]
+        max_concurrency=1,
+        timeout_seconds=5.0,
+        breaker=breaker,
+    )
+    first = asyncio.create_task(client.complete(model="test", messages=[]))
+    await asyncio.sleep(0.01)
+    assert openai.active == 1
+
+    # Срок второго вызова короче, чем первый держит единственный слот
+    client.timeout_seconds = 0.05
+    with pytest.raises(LLMUnavailableError, match="слоты"):
+        await client.complete(model="test", messages=[])
+
+    assert openai.calls == 1
+    assert breaker.state == "closed" and breaker.failures == 0
+    openai.release.set()
+    assert await first
+    assert breaker.failures == 0
+
+
+async def test_provider_timeout_counts_as_failure() -> None:
+    """Провайдер не ответил в срок - отказ выключателя, слот освобождается."""
+    openai = FakeOpenAI()
+    openai.release.clear()
+    breaker = CircuitBreaker(failure_threshold=1)
+    client = GovernedLLMClient(
+        openai,  # type: ignore[arg-type]
+        max_concurrency=1,
+        timeout_seconds=0.05,
+        breaker=breaker,
+    )
+
+    with pytest.raises(LLMUnavailableError, match="не ответил"):
+        await client.complete(model="test", messages=[])
+
+    assert breaker.state == "open" and openai.active == 0
+    assert not client._semaphore.locked()
+
+
+async def test_hedge_answers_with_rules_and_caches_late_llm_answer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """LLM не уложился в порог hedge: ответ правил, поздний ответ LLM - в кэш."""
+    openai = FakeOpenAI()
+    openai.release.clear()
+    analyzer = make_analyzer(monkeypatch, openai, hedge_seconds=0.01)
+    rules = await analyzer._analyze_with_rules("Болит голова")
+
+    assert await analyzer.analyze_symptoms("Болит голова") == rules
+    assert len(analyzer.cache) == 0 and len(analyzer._late_answers) == 1
+
+    openai.release.set()
+    await asyncio.gather(*analyzer._late_answers)
+    await asyncio.sleep(0)
+
+    assert not analyzer._late_answers
+    recommendations = await analyzer.analyze_symptoms("болит голова")
+    assert recommendations[0].specialist_name == "Невролог"
+    assert openai.calls == 1 and analyzer.cache.hits == 1
+
+
+async def test_close_cancels_late_llm_answers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """close() отменяет запросы к LLM, на которые уже ответили правила."""
+    openai = FakeOpenAI()
+    openai.release.clear()
+    analyzer = make_analyzer(monkeypatch, openai, hedge_seconds=0.01)
+    await analyzer.analyze_symptoms("Болит голова")
+    (late,) = analyzer._late_answers
+
+    await analyzer.close()
+
+    assert late.cancelled() and openai.closed
+    assert len(analyzer.cache) == 0
@@ -0,0 +1,162 @@
+"""Тесты страниц свободных слотов бота с упреждающей загрузкой."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from bot.api.clinic_client import AvailableSlot  # noqa: E402
+from bot.api.slot_pages import SlotPages  # noqa: E402
+
+START = datetime(2030, 3, 4, 9, 0, tzinfo=timezone.utc)
+TTL = 30.0
+
+
+class FakeClock:
+    """Управляемые часы вместо time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeFetcher:
+    """API слотов: получасовые слоты подряд; запоминает запросы, может падать."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, Optional[datetime]]] = []
+        self.fail_doctors: set[int] = set()
+
+    async def __call__(
+        self, doctor_id: int, after: Optional[datetime], limit: int
+    ) -> list[AvailableSlot]:
+        self.calls.append((doctor_id, after))
+        await asyncio.sleep(0)
+        if doctor_id in self.fail_doctors:
+            raise RuntimeError("API клиники недоступно")
+        first = START if after is None else after + timedelta(minutes=30)
+        return [AvailableSlot(first + timedelta(minutes=30 * i)) for i in range(limit)]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Часы кэша страниц."""
+    return FakeClock()
+
+
+@pytest.fixture
+def fetcher() -> FakeFetcher:
+    """Загрузчик слотов."""
+    return FakeFetcher()
+
+
+async def settle(pages: SlotPages) -> None:
+    """Дождаться фоновых загрузок."""
+    await asyncio.gather(
+        *(task for _, task in pages._pages.values()), return_exceptions=True
+    )
+
+
+async def test_page_is_cached_and_next_page_prefetched(
+    clock: FakeClock, fetcher: FakeFetcher
+) -> None:
+    """Страница берется из кэша в пределах TTL, следующая грузится заранее."""
+    pages = SlotPages(fetcher, page_size=3, ttl_seconds=TTL, clock=clock)
+
+    page = await pages.get_page(1)
+    await settle(pages)
+
+    assert [slot.datetime_obj for slot in page.slots] == [
+        START + timedelta(minutes=30 * i) for i in range(3)
+    ]
+    assert page.has_more and page.next_after == page.slots[-1].datetime_obj
+    assert fetcher.calls == [(1, None), (1, page.next_after)]
+
+    next_page = await pages.get_page(1, page.next_after)
+    assert next_page.slots[0].datetime_obj == START + timedelta(minutes=90)
+    assert await pages.get_page(1) == page
+    await settle(pages)
+    assert len(fetcher.calls) == 3  # + упреждающая загрузка третьей страницы
+
+
+async def test_expired_page_is_reloaded(clock: FakeClock, fetcher: FakeFetcher) -> None:
+    """После TTL страница загружается заново."""
+    pages = SlotPages(fetcher, page_size=3, ttl_seconds=TTL, clock=clock)
+    pages.prefetch(1)
+    await settle(pages)
+
+    clock.now += TTL - 1
+    await pages.get_page(1)
+    first_loads = fetcher.calls.count((1, None))
+    clock.now += 1
+    await pages.get_page(1)
+
+    assert first_loads == 1
+    assert fetcher.calls.count((1, None)) == 2
+    await pages.close()
+
+
+async def test_cache_is_bounded_lru(clock: FakeClock, fetcher: FakeFetcher) -> None:
+    """Сверх max_pages вытесняется давно не запрошенная страница."""
+    pages = SlotPages(fetcher, ttl_seconds=TTL, max_pages=2, clock=clock)
+    pages.prefetch(1)
+    pages.prefetch(2)
+    pages.prefetch(1)  # 1 - недавно запрошенная, 2 - кандидат на вытеснение
+    pages.prefetch(3)
+    await settle(pages)
+
+    assert list(pages._pages) == [(1, None), (3, None)]
+    assert fetcher.calls == [(1, None), (2, None), (3, None)]
+
+
+async def test_failed_prefetch_is_evicted(
+    clock: FakeClock, fetcher: FakeFetcher
+) -> None:
+    """Неудачная загрузка не кэшируется: следующий запрос повторяет ее."""
+    pages = SlotPages(fetcher, ttl_seconds=TTL, clock=clock)
+    fetcher.fail_doctors.add(1)
+    pages.prefetch(1)
+    await settle(pages)
+
+    assert (1, None) not in pages._pages
+    with pytest.raises(RuntimeError):
+        await pages.get_page(1)
+
+    fetcher.fail_doctors.clear()
+    page = await pages.get_page(1)
+    assert page.slots and fetcher.calls.count((1, None)) == 3
+    await pages.close()
+
+
+async def test_invalidate_drops_only_doctor_pages(
+    clock: FakeClock, fetcher: FakeFetcher
+) -> None:
+    """invalidate(doctor_id) сбрасывает все страницы врача и только их."""
+    pages = SlotPages(fetcher, page_size=2, ttl_seconds=TTL, clock=clock)
+    await pages.get_page(1)
+    await pages.get_page(2)
+    await settle(pages)
+    assert len(pages._pages) == 4
+
+    pages.invalidate(1)
+
+    assert {key[0] for key in pages._pages} == {2}
+    await pages.get_page(1)
+    assert fetcher.calls.count((1, None)) == 2
+    await pages.close()
+
+
+async def test_close_cancels_pending_loads(fetcher: FakeFetcher) -> None:
+    """close() отменяет незавершенные загрузки и очищает кэш."""
+    pages = SlotPages(fetcher)
+    pages.prefetch(1)
+    task = pages._pages[(1, None)][1]
+
+    await pages.close()
+
+    assert task.cancelled() and not pages._pages
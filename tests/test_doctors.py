@@ -0,0 +1,165 @@
+"""Тесты справочника врачей."""
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.doctor import get_doctors
+from app.main import app
+from app.models.doctor import Doctor
+from app.services.doctor_directory import get_doctor_directory
+
+
+async def create_doctors(test_db: AsyncSession) -> list[Doctor]:
+    """Два терапевта, кардиолог и неактивный невролог."""
+    doctors = [
+        Doctor(name="Доктор Петров", specialization="Терапевт", is_active=True),
+        Doctor(name="Доктор Иванов", specialization="Терапевт", is_active=True),
+        Doctor(name="Доктор Сидорова", specialization="Кардиолог", is_active=True),
+        Doctor(name="Доктор Козлов", specialization="Невролог", is_active=False),
+    ]
+    test_db.add_all(doctors)
+    await test_db.commit()
+    return doctors
+
+
+async def test_list_doctors(test_db: AsyncSession) -> None:
+    """Список активных врачей по имени."""
+    await create_doctors(test_db)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/doctors")
+
+    assert response.status_code == 200
+    assert [doctor["name"] for doctor in response.json()] == [
+        "Доктор Иванов",
+        "Доктор Петров",
+        "Доктор Сидорова",
+    ]
+
+
+async def test_list_doctors_by_normalized_specialization(
+    test_db: AsyncSession,
+) -> None:
+    """Фильтр по специализации без учета регистра и пробелов."""
+    await create_doctors(test_db)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        therapists = await ac.get("/doctors", params={"specialization": " терапевт "})
+        inactive = await ac.get("/doctors", params={"specialization": "Невролог"})
+        unknown = await ac.get("/doctors", params={"specialization": "Окулист"})
+
+    assert {doctor["name"] for doctor in therapists.json()} == {
+        "Доктор Иванов",
+        "Доктор Петров",
+    }
+    assert inactive.json() == []
+    assert unknown.json() == []
+
+
+async def test_get_doctor(test_db: AsyncSession) -> None:
+    """Врач по ID; неактивный и несуществующий - 404."""
+    doctors = await create_doctors(test_db)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        found = await ac.get(f"/doctors/{doctors[0].id}")
+        inactive = await ac.get(f"/doctors/{doctors[3].id}")
+        missing = await ac.get("/doctors/999")
+
+    assert found.status_code == 200
+    assert found.json() == {
+        "id": doctors[0].id,
+        "name": "Доктор Петров",
+        "specialization": "Терапевт",
+    }
+    assert inactive.status_code == 404
+    assert missing.status_code == 404
+
+
+async def test_directory_serves_from_snapshot_and_refreshes_on_miss(
+    test_db: AsyncSession,
+) -> None:
+    """Повторные чтения не идут в БД; новый врач находится через промах."""
+    await create_doctors(test_db)
+    directory = get_doctor_directory()
+
+    first = await directory.snapshot(test_db)
+    assert await directory.snapshot(test_db) is first
+
+    new_doctor = Doctor(name="Доктор Новиков", specialization="Окулист")
+    test_db.add(new_doctor)
+    await test_db.commit()
+
+    found = await directory.get_doctor(test_db, new_doctor.id)
+    assert found is not None and found.specialization == "Окулист"
+    # Промах сбросил снимок: следующий запрос видит нового врача по индексу
+    oculists = await directory.list_doctors(test_db, "окулист")
+    assert [doctor.id for doctor in oculists] == [new_doctor.id]
+
+
+async def test_directory_caches_misses_until_refresh(test_db: AsyncSession) -> None:
+    """Подтвержденный промах не повторяет запрос до перезагрузки снимка."""
+    await create_doctors(test_db)
+    directory = get_doctor_directory()
+
+    assert await directory.get_doctor(test_db, 1000) is None
+    assert await directory.list_doctors(test_db, "Окулист") == ()
+
+    test_db.add_all(
+        [
+            Doctor(id=1000, name="Доктор Новиков", specialization="Хирург"),
+            Doctor(name="Доктор Орлова", specialization="Окулист"),
+        ]
+    )
+    await test_db.commit()
+
+    # Промахи запомнены в снимке: новые врачи не видны до перезагрузки
+    assert await directory.get_doctor(test_db, 1000) is None
+    assert await directory.list_doctors(test_db, " окулист ") == ()
+
+    directory.invalidate()
+    found = await directory.get_doctor(test_db, 1000)
+    assert found is not None and found.name == "Доктор Новиков"
+    oculists = await directory.list_doctors(test_db, "Окулист")
+    assert [doctor.name for doctor in oculists] == ["Доктор Орлова"]
+
+
+async def test_get_doctors_normalizes_specialization(test_db: AsyncSession) -> None:
+    """Фильтр по специализации нормализуется так же, как ключ справочника."""
+    test_db.add_all(
+        [
+            Doctor(name="Dr. Smith", specialization=" ENT "),
+            Doctor(name="Доктор Петров", specialization="Терапевт"),
+            Doctor(name="Доктор Орлова", specialization="Детский  Невролог"),
+        ]
+    )
+    await test_db.commit()
+
+    ent = await get_doctors(test_db, specialization="ent")
+    assert [doctor.name for doctor in ent] == ["Dr. Smith"]
+    # Регистр кириллицы и пробелы внутри строки (lower() SQLite их не видит)
+    therapists = await get_doctors(test_db, specialization="  ТЕРАПЕВТ")
+    assert [doctor.name for doctor in therapists] == ["Доктор Петров"]
+    neurologists = await get_doctors(test_db, specialization="детский невролог")
+    assert [doctor.name for doctor in neurologists] == ["Доктор Орлова"]
+    assert await get_doctors(test_db, specialization="Хирург") == []
+
+
+async def test_directory_miss_uses_same_normalization(test_db: AsyncSession) -> None:
+    """Врач, добавленный после загрузки снимка, находится промахом по ключу."""
+    await create_doctors(test_db)
+    directory = get_doctor_directory()
+    await directory.snapshot(test_db)
+
+    test_db.add(Doctor(name="Доктор Орлова", specialization="Детский  Невролог"))
+    await test_db.commit()
+
+    found = await directory.list_doctors(test_db, "ДЕТСКИЙ невролог")
+    assert [doctor.name for doctor in found] == ["Доктор Орлова"]
+    # Промах нашел врача и сбросил снимок, а не запомнился как отсутствующий
+    assert directory._snapshot is None
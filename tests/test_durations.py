@@ -0,0 +1,192 @@
+"""Тесты приемов разной длительности (15/30/60 минут)."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.intervals import IntervalIndex
+from app.core.schedule import clinic_timezone
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from tests.test_slot_holds import next_workday_slot
+
+
+async def create_doctor(test_db: AsyncSession) -> Doctor:
+    """Активный врач."""
+    doctor = Doctor(name="Доктор Иванов", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+    return doctor
+
+
+async def book(doctor_id: int, start_time: datetime, **payload: Any) -> Any:
+    """POST /appointments."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        return await client.post(
+            "/appointments",
+            json={
+                "doctor_id": doctor_id,
+                "patient_name": "Пациент",
+                "start_time": start_time.isoformat(),
+                **payload,
+            },
+        )
+
+
+def test_interval_index_finds_overlaps() -> None:
+    """Пересечение ищется по соседнему слева интервалу; касание - не пересечение."""
+    base = datetime(2030, 3, 4, 9, 0, tzinfo=timezone.utc)
+
+    def at(minutes: int) -> datetime:
+        return base + timedelta(minutes=minutes)
+
+    index = IntervalIndex([(at(60), at(120)), (at(0), at(30))])
+
+    assert index.overlapping(at(30), at(60)) is None
+    assert index.overlapping(at(90), at(105)) == at(60)
+    assert index.overlapping(at(15), at(75)) == at(60)
+    assert index.overlapping(at(120), at(150)) is None
+    assert index.add(at(30), at(45))
+    assert not index.add(at(40), at(50))
+    # Пересекающиеся на входе интервалы склеиваются
+    assert list(IntervalIndex([(at(0), at(30)), (at(15), at(45))])) == [(at(0), at(45))]
+
+
+async def test_long_visit_blocks_overlapping_slots(test_db: AsyncSession) -> None:
+    """Часовой прием занимает и следующий получасовой слот."""
+    doctor = await create_doctor(test_db)
+    start = next_workday_slot(10)
+
+    response = await book(doctor.id, start, duration_minutes=60)
+    assert response.status_code == 201
+    body = response.json()
+    assert body["duration_minutes"] == 60
+    end = datetime.fromisoformat(body["end_time"]).replace(tzinfo=timezone.utc)
+    assert end == start.astimezone(timezone.utc) + timedelta(hours=1)
+
+    response = await book(doctor.id, start + timedelta(minutes=30))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Врач уже занят в это время"
+
+    response = await book(doctor.id, start + timedelta(hours=1))
+    assert response.status_code == 201
+
+
+async def test_short_visits_use_quarter_hour_grid(test_db: AsyncSession) -> None:
+    """15-минутный прием можно начать в :15 и поставить вплотную к соседним."""
+    doctor = await create_doctor(test_db)
+    quarter_past = next_workday_slot(11).replace(minute=15)
+
+    response = await book(doctor.id, quarter_past, duration_minutes=15)
+    assert response.status_code == 201
+
+    response = await book(doctor.id, quarter_past.replace(minute=45))
+    assert response.status_code == 422
+
+    response = await book(doctor.id, quarter_past.replace(minute=0))
+    assert response.status_code == 400
+
+    response = await book(
+        doctor.id, quarter_past.replace(minute=0), duration_minutes=15
+    )
+    assert response.status_code == 201
+    response = await book(doctor.id, quarter_past.replace(minute=30))
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize(
+    ("hour", "minute", "duration", "expected"),
+    [(17, 30, 60, 422), (17, 0, 60, 201), (17, 45, 15, 201), (17, 30, 45, 422)],
+)
+async def test_visit_must_end_within_working_hours(
+    test_db: AsyncSession, hour: int, minute: int, duration: int, expected: int
+) -> None:
+    """Прием должен закончиться к 18:00; длительность - только 15/30/60."""
+    doctor = await create_doctor(test_db)
+    start = next_workday_slot(hour).replace(minute=minute)
+
+    response = await book(doctor.id, start, duration_minutes=duration)
+
+    assert response.status_code == expected
+
+
+async def test_database_rejects_overlapping_visits(test_db: AsyncSession) -> None:
+    """Пересечение отсекается и на уровне БД, в обход проверок API."""
+    doctor = await create_doctor(test_db)
+    start = next_workday_slot(10).astimezone(timezone.utc)
+    test_db.add(
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name="Первый",
+            start_time=start,
+            duration_minutes=60,
+        )
+    )
+    await test_db.commit()
+
+    test_db.add(
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name="Второй",
+            start_time=start + timedelta(minutes=45),
+            duration_minutes=15,
+        )
+    )
+    with pytest.raises(IntegrityError, match="appointments_no_overlap"):
+        await test_db.commit()
+    await test_db.rollback()
+
+
+async def test_slot_search_respects_duration(test_db: AsyncSession) -> None:
+    """Поиск часовых приемов пропускает окна короче часа."""
+    doctor = await create_doctor(test_db)
+    day = next_workday_slot().astimezone(clinic_timezone()).date()
+    ten = datetime.combine(day, datetime.min.time(), tzinfo=clinic_timezone())
+    ten = ten.replace(hour=10)
+    test_db.add(
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name="Занято",
+            start_time=ten.astimezone(timezone.utc),
+        )
+    )
+    await test_db.commit()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(
+            f"/doctors/{doctor.id}/slots",
+            params={
+                "date_from": day.isoformat(),
+                "date_to": day.isoformat(),
+                "duration_minutes": 60,
+            },
+        )
+
+    assert response.status_code == 200
+    local = [
+        datetime.fromisoformat(row["start_time"])
+        .replace(tzinfo=timezone.utc)
+        .astimezone(clinic_timezone())
+        for row in response.json()
+    ]
+    hours = [(t.hour, t.minute) for t in local]
+    assert (9, 0) in hours and (10, 30) in hours
+    assert (9, 30) not in hours and (10, 0) not in hours
+    assert hours[-1] == (17, 0)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(
+            f"/doctors/{doctor.id}/slots", params={"duration_minutes": 45}
+        )
+    assert response.status_code == 422
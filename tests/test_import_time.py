@@ -0,0 +1,92 @@
+"""Бюджет времени импорта приложения (по отчету `python -X importtime`)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Бюджет на импорт app.main (мс). Можно переопределить для медленных CI-машин.
+IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+# Модули, которые не должны загружаться при импорте приложения:
+# драйвер БД подключается только при создании движка.
+LAZY_MODULES = ["asyncpg", "sqlalchemy.dialects.postgresql.asyncpg"]
+
+
+def parse_importtime(report: str) -> dict[str, tuple[int, int]]:
+    """Разобрать отчет `-X importtime` в {модуль: (self_us, cumulative_us)}."""
+    modules: dict[str, tuple[int, int]] = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Строка заголовка
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_importtime(module: str) -> dict[str, tuple[int, int]]:
+    """Импортировать модуль в отдельном процессе и вернуть отчет."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def test_parse_importtime() -> None:
+    """Тест разбора отчета importtime."""
+    report = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   app.core\n"
+        "import time:      4400 |     831619 | app.main\n"
+    )
+
+    modules = parse_importtime(report)
+
+    assert modules == {"app.core": (120, 120), "app.main": (4400, 831619)}
+
+
+def test_app_import_does_not_load_db_driver() -> None:
+    """Импорт приложения не создает движок и не загружает драйвер БД."""
+    modules = run_importtime("app.main")
+
+    assert "app.main" in modules
+    for lazy_module in LAZY_MODULES:
+        assert lazy_module not in modules, f"{lazy_module} импортирован при старте"
+
+
+def test_app_import_does_not_build_app() -> None:
+    """Импорт app.main не читает настройки и не собирает приложение."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import app.main as m; "
+            "assert 'app' not in vars(m); "
+            "assert m.get_settings.cache_info().currsize == 0; "
+            "assert m.app is m.get_app()",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_app_import_time_budget() -> None:
+    """Импорт app.main укладывается в бюджет."""
+    modules = run_importtime("app.main")
+
+    _, cumulative_us = modules["app.main"]
+    assert cumulative_us / 1000 < IMPORT_TIME_BUDGET_MS, (
+        f"Импорт app.main занял {cumulative_us / 1000:.0f} мс "
+        f"(бюджет {IMPORT_TIME_BUDGET_MS} мс)"
+    )
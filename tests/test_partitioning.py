@@ -0,0 +1,41 @@
+"""Тесты обслуживания помесячных секций appointments."""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import get_settings
+from app.db.partitioning import ensure_partitions, month_start, partition_name
+from app.main import start_background_tasks, stop_background_tasks
+from tests.conftest import engine
+
+
+def test_month_start_is_utc_month_boundary() -> None:
+    """Начало месяца считается в UTC, а не в timezone клиента."""
+    # 1 июля 01:00 по Москве - это еще 30 июня по UTC
+    moment = datetime(2025, 7, 1, 1, 0, tzinfo=timezone(timedelta(hours=3)))
+
+    assert month_start(moment) == datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def test_partition_name() -> None:
+    """Имя секции совпадает с формированием в ensure_appointments_partitions."""
+    moment = datetime(2025, 1, 31, 20, 0, tzinfo=timezone.utc)
+
+    assert partition_name(moment) == "appointments_y2025m01"
+
+
+async def test_ensure_partitions_noop_without_partitioning(
+    test_db: AsyncSession,
+) -> None:
+    """На несекционированной таблице (и не PostgreSQL) секции не создаются."""
+    assert await ensure_partitions(engine, months_ahead=3) == []
+
+
+async def test_partition_maintenance_disabled_by_default() -> None:
+    """Фоновое обслуживание секций выключено по умолчанию."""
+    tasks = start_background_tasks(get_settings())
+    try:
+        assert tasks == []
+    finally:
+        await stop_background_tasks(tasks)
@@ -0,0 +1,329 @@
+"""
+Регрессионные тесты планов запросов.
+
+Набор данных промышленной формы (benchmarks.datagen) загружается в БД,
+CRUD-функции выполняются как в приложении, а их SQL перехватывается и
+прогоняется через EXPLAIN. Тесты проверяют, что ключевые запросы идут по
+ожидаемым индексам, не сканируют `appointments` целиком и (в PostgreSQL)
+что оценка строк остается в разумных пределах.
+
+По умолчанию тесты идут на SQLite. Для PostgreSQL задайте отдельную базу:
+    QUERY_PLAN_DATABASE_URL=postgresql+asyncpg://.../clinic_plans \
+        pytest tests/test_query_plans.py
+(схема в этой базе пересоздается).
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.crud.appointment import (
+    find_series_conflicts,
+    get_appointment,
+    get_doctor_appointments,
+)
+from app.crud.archive import archive_appointments_batch
+from app.crud.doctor import check_doctor_availability, get_doctors
+from app.crud.reminder import claim_due_reminders
+from app.db.database import Base
+from app.models.appointment import Appointment
+from benchmarks.datagen import DatagenConfig, load_dataset
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+PLAN_DATASET = DatagenConfig(doctors=300, appointments=40_000, years=1.0)
+PRIMARY_KEY = "PRIMARY KEY"
+
+SQLITE_INDEX_RE = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+@dataclass
+class QueryPlan:
+    """Сводка плана одного запроса."""
+
+    indexes: set[str] = field(default_factory=set)
+    full_scans: set[str] = field(default_factory=set)
+    estimated_rows: Optional[float] = None
+    raw: Any = None
+
+
+@dataclass
+class PlanDatabase:
+    """БД с набором данных и перехватом SQL."""
+
+    engine: AsyncEngine
+    captured: list[tuple[str, Any]] = field(default_factory=list)
+    index_aliases: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def dialect(self) -> str:
+        """Имя диалекта."""
+        return self.engine.dialect.name
+
+
+def database_urls(tmp_dir: Path) -> dict[str, Optional[str]]:
+    """URL баз для проверки планов по диалектам."""
+    return {
+        "sqlite": f"sqlite+aiosqlite:///{tmp_dir / 'plans.db'}",
+        "postgresql": os.getenv("QUERY_PLAN_DATABASE_URL"),
+    }
+
+
+async def sqlite_index_aliases(engine: AsyncEngine) -> dict[str, str]:
+    """Сопоставить автоиндексы SQLite с именами UNIQUE-ограничений модели."""
+    constraints = {
+        tuple(column.name for column in constraint.columns): constraint.name
+        for table in Base.metadata.tables.values()
+        for constraint in table.constraints
+        if constraint.name and constraint.__class__.__name__ == "UniqueConstraint"
+    }
+    aliases = {}
+    async with engine.connect() as conn:
+        for table in Base.metadata.tables:
+            indexes = await conn.exec_driver_sql(f"PRAGMA index_list({table})")
+            for _, index_name, _, origin, _ in indexes.all():
+                if origin != "u":
+                    continue
+                info = await conn.exec_driver_sql(f"PRAGMA index_info({index_name})")
+                columns = tuple(row[2] for row in info.all())
+                if columns in constraints:
+                    aliases[index_name] = str(constraints[columns])
+    return aliases
+
+
+@pytest_asyncio.fixture(
+    scope="module", loop_scope="module", params=["sqlite", "postgresql"]
+)
+async def plan_db(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> AsyncIterator[PlanDatabase]:
+    """Загрузить набор данных и перехватывать SQL, отправляемый в БД."""
+    url = database_urls(tmp_path_factory.mktemp("plans"))[request.param]
+    if url is None:
+        pytest.skip("QUERY_PLAN_DATABASE_URL не задан")
+
+    engine = create_async_engine(url)
+    await load_dataset(engine, PLAN_DATASET, reset=True)
+    database = PlanDatabase(engine=engine)
+    if database.dialect == "sqlite":
+        database.index_aliases = await sqlite_index_aliases(engine)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(
+        conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any
+    ) -> None:
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            database.captured.append((statement, parameters))
+
+    yield database
+
+    await engine.dispose()
+
+
+async def explain(database: PlanDatabase, statement: str, parameters: Any) -> QueryPlan:
+    """Выполнить EXPLAIN для перехваченного запроса."""
+    async with database.engine.connect() as conn:
+        if database.dialect == "postgresql":
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            return postgres_plan(result.scalar_one())
+
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        )
+        return sqlite_plan([row[3] for row in result.all()], database.index_aliases)
+
+
+def sqlite_plan(details: list[str], aliases: dict[str, str]) -> QueryPlan:
+    """Разобрать EXPLAIN QUERY PLAN SQLite."""
+    plan = QueryPlan(raw=details)
+    for detail in details:
+        if "USING INTEGER PRIMARY KEY" in detail:
+            plan.indexes.add(PRIMARY_KEY)
+        match = SQLITE_INDEX_RE.search(detail)
+        if match:
+            plan.indexes.add(aliases.get(match.group(1), match.group(1)))
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            plan.full_scans.add(detail.split()[1])
+    return plan
+
+
+def postgres_plan(document: Any) -> QueryPlan:
+    """Разобрать EXPLAIN (FORMAT JSON) PostgreSQL."""
+    if isinstance(document, str):
+        document = json.loads(document)
+    root = document[0]["Plan"]
+    plan = QueryPlan(estimated_rows=root.get("Plan Rows"), raw=document)
+
+    nodes = [root]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        index_name = node.get("Index Name")
+        if index_name:
+            is_primary_key = index_name.endswith("_pkey")
+            plan.indexes.add(PRIMARY_KEY if is_primary_key else index_name)
+        if node.get("Node Type") == "Seq Scan":
+            plan.full_scans.add(node.get("Relation Name", ""))
+    return plan
+
+
+async def capture_plans(
+    database: PlanDatabase, call: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[QueryPlan]:
+    """Выполнить CRUD-функцию и вернуть планы всех ее запросов."""
+    database.captured.clear()
+    async with AsyncSession(database.engine, expire_on_commit=False) as session:
+        await call(session)
+        await session.rollback()
+
+    statements = list(database.captured)
+    assert statements, "CRUD-функция не выполнила ни одного запроса"
+    return [await explain(database, sql, params) for sql, params in statements]
+
+
+def assert_plan(
+    plan: QueryPlan, expected_indexes: set[str], max_rows: Optional[float]
+) -> None:
+    """Проверить индексы, отсутствие полного сканирования и оценку строк."""
+    assert (
+        plan.indexes & expected_indexes
+    ), f"Ожидался один из индексов {expected_indexes}, план: {plan.raw}"
+    assert "appointments" not in plan.full_scans, f"Seq scan appointments: {plan.raw}"
+    if plan.estimated_rows is not None and max_rows is not None:
+        assert (
+            plan.estimated_rows <= max_rows
+        ), f"Оценка строк {plan.estimated_rows} > {max_rows}: {plan.raw}"
+
+
+async def busiest_doctor_slot(database: PlanDatabase) -> tuple[int, datetime]:
+    """Самый загруженный врач и время одной из его записей."""
+    async with AsyncSession(database.engine) as session:
+        doctor_id, start_time = (
+            await session.execute(
+                select(Appointment.doctor_id, func.max(Appointment.start_time))
+                .group_by(Appointment.doctor_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+        ).one()
+    if start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=timezone.utc)
+    return doctor_id, start_time
+
+
+async def test_get_appointment_uses_primary_key(plan_db: PlanDatabase) -> None:
+    """get_appointment ищет по первичному ключу."""
+    plans = await capture_plans(
+        plan_db, lambda db: get_appointment(db=db, appointment_id=12345)
+    )
+
+    assert len(plans) == 1
+    assert_plan(plans[0], {PRIMARY_KEY}, max_rows=1)
+
+
+async def test_get_doctor_appointments_uses_doctor_time_index(
+    plan_db: PlanDatabase,
+) -> None:
+    """Записи врача за неделю читаются диапазоном по (doctor_id, start_time)."""
+    doctor_id, start_time = await busiest_doctor_slot(plan_db)
+    week_start = start_time - timedelta(days=7)
+
+    plans = await capture_plans(
+        plan_db,
+        lambda db: get_doctor_appointments(db, doctor_id, week_start, start_time),
+    )
+
+    assert len(plans) == 1
+    # Не больше 18 слотов в день; запас на неточность статистики
+    assert_plan(plans[0], {"unique_doctor_time"}, max_rows=7 * 18 * 4)
+
+
+async def test_check_doctor_availability_uses_indexes(plan_db: PlanDatabase) -> None:
+    """Проверка доступности: врач по PK, конфликт по unique_doctor_time."""
+    doctor_id, start_time = await busiest_doctor_slot(plan_db)
+
+    plans = await capture_plans(
+        plan_db, lambda db: check_doctor_availability(db, doctor_id, start_time)
+    )
+
+    doctor_plan, conflict_plan = plans
+    assert_plan(doctor_plan, {PRIMARY_KEY}, max_rows=1)
+    assert_plan(conflict_plan, {"unique_doctor_time"}, max_rows=1)
+
+
+async def test_archive_batch_uses_start_time_index(plan_db: PlanDatabase) -> None:
+    """Выборка пачки для архива идет по индексу start_time, удаление - по PK."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=180)
+
+    plans = await capture_plans(
+        plan_db, lambda db: archive_appointments_batch(db, cutoff, batch_size=1000)
+    )
+
+    select_plan, _, delete_plan = plans
+    assert_plan(
+        select_plan,
+        {"idx_appointments_start_time", "ix_appointments_start_time"},
+        max_rows=1000,
+    )
+    # В SQLite модель создает и дублирующий индекс ix_appointments_id
+    assert_plan(delete_plan, {PRIMARY_KEY, "ix_appointments_id"}, max_rows=1000)
+
+
+async def test_get_doctors_by_specialization_uses_index(
+    plan_db: PlanDatabase,
+) -> None:
+    """Промах справочника врачей: написания и врачи по idx_doctors_specialization."""
+    plans = await capture_plans(
+        plan_db, lambda db: get_doctors(db, specialization=" терапевт ")
+    )
+
+    assert len(plans) == 2
+    for plan in plans:
+        assert_plan(plan, {"idx_doctors_specialization"}, max_rows=None)
+
+
+async def test_claim_due_reminders_uses_start_time_index(
+    plan_db: PlanDatabase,
+) -> None:
+    """Пачка напоминаний выбирается диапазоном по индексу start_time."""
+    _, start_time = await busiest_doctor_slot(plan_db)
+    window_start = start_time - timedelta(days=1)
+
+    plans = await capture_plans(
+        plan_db,
+        lambda db: claim_due_reminders(
+            db, window_start, start_time, batch_size=500, now=window_start
+        ),
+    )
+
+    assert len(plans) == 1
+    assert_plan(
+        plans[0],
+        {"idx_appointments_start_time", "ix_appointments_start_time"},
+        max_rows=500,
+    )
+
+
+async def test_series_conflicts_use_unique_doctor_time(plan_db: PlanDatabase) -> None:
+    """Конфликты серии проверяются одним диапазоном по unique_doctor_time."""
+    doctor_id, start_time = await busiest_doctor_slot(plan_db)
+    series = [start_time - timedelta(weeks=week) for week in range(10)]
+
+    plans = await capture_plans(
+        plan_db, lambda db: find_series_conflicts(db, doctor_id, series, 30)
+    )
+
+    appointments_plan, _ = plans
+    # Не больше 18 записей в день за 10 недель; запас на неточность статистики
+    assert_plan(appointments_plan, {"unique_doctor_time"}, max_rows=70 * 18 * 4)
@@ -0,0 +1,223 @@
+"""Тесты напоминаний о приеме."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.settings import Settings
+from app.crud.reminder import claim_due_reminders
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.services.reminders import (
+    LoggingReminderSender,
+    Reminder,
+    TelegramReminderSender,
+    create_reminder_sender,
+    send_due_reminders,
+)
+from tests.conftest import TestingSessionLocal, engine
+from tests.test_slot_holds import next_workday_slot
+
+NOW = datetime(2030, 3, 4, 6, 0, tzinfo=timezone.utc)
+
+
+class RecordingSender:
+    """Канал, запоминающий отправки и параллелизм."""
+
+    def __init__(self, fail_ids: frozenset[int] = frozenset()) -> None:
+        self.fail_ids = fail_ids
+        self.sent: list[int] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def send(self, reminder: Reminder) -> bool:
+        """Отправить (или упасть для ID из fail_ids)."""
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.001)
+            appointment_id = reminder.appointment.appointment_id
+            if appointment_id in self.fail_ids:
+                raise RuntimeError("канал недоступен")
+            self.sent.append(appointment_id)
+            return reminder.appointment.telegram_chat_id is not None
+        finally:
+            self.active -= 1
+
+
+async def seed_appointments(test_db: AsyncSession, count: int) -> Doctor:
+    """Врач и `count` записей каждые 30 минут начиная с NOW + 30 минут."""
+    doctor = Doctor(name="Доктор Иванов", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.flush()
+    test_db.add_all(
+        Appointment(
+            doctor_id=doctor.id,
+            patient_name=f"Пациент {i}",
+            start_time=NOW + timedelta(minutes=30 * (i + 1)),
+            telegram_chat_id=1000 + i,
+        )
+        for i in range(count)
+    )
+    await test_db.commit()
+    return doctor
+
+
+async def reminded_count() -> int:
+    """Число записей с отметкой напоминания."""
+    async with TestingSessionLocal() as db:
+        return int(
+            await db.scalar(
+                select(func.count()).where(Appointment.reminder_sent_at.is_not(None))
+            )
+            or 0
+        )
+
+
+async def test_reminders_sent_once_in_batches_within_window(
+    test_db: AsyncSession,
+) -> None:
+    """Окно выбирается пачками, каждая запись напоминается ровно один раз."""
+    await seed_appointments(test_db, 10)
+    sender = RecordingSender()
+
+    result = await send_due_reminders(
+        TestingSessionLocal,
+        sender,
+        lead=timedelta(hours=3),
+        batch_size=2,
+        concurrency=4,
+        now=NOW,
+    )
+
+    # В окно 3 часа попадают записи через 0:30 ... 2:30
+    assert result.claimed == result.sent == 5
+    assert result.batches == 3
+    assert len(set(sender.sent)) == 5
+    assert await reminded_count() == 5
+
+    repeat = await send_due_reminders(
+        TestingSessionLocal, sender, timedelta(hours=3), 2, 4, now=NOW
+    )
+    assert repeat.claimed == 0
+    assert len(sender.sent) == 5
+
+
+async def test_claim_works_with_per_model_binds(test_db: AsyncSession) -> None:
+    """Сессия с binds= (без общего db.bind) тоже забирает напоминания."""
+    await seed_appointments(test_db, 3)
+
+    async with AsyncSession(binds={Appointment: engine, Doctor: engine}) as db:
+        claimed = await claim_due_reminders(
+            db, NOW, NOW + timedelta(hours=1), batch_size=10, now=NOW
+        )
+        await db.commit()
+
+    assert [reminder.patient_name for reminder in claimed] == ["Пациент 0"]
+
+
+async def test_reminders_dispatch_is_bounded(test_db: AsyncSession) -> None:
+    """Отправки идут параллельно, но не больше `concurrency` одновременно."""
+    await seed_appointments(test_db, 12)
+    sender = RecordingSender()
+
+    result = await send_due_reminders(
+        TestingSessionLocal, sender, timedelta(days=1), 100, 3, now=NOW
+    )
+
+    assert result.sent == 12
+    assert 1 < sender.max_active <= 3
+
+
+async def test_failed_reminders_are_released_for_next_pass(
+    test_db: AsyncSession,
+) -> None:
+    """С неотправленных напоминаний отметка снимается, следующий проход их берет."""
+    await seed_appointments(test_db, 4)
+    async with TestingSessionLocal() as db:
+        failing_id = await db.scalar(select(func.min(Appointment.id)))
+    assert failing_id is not None
+
+    first = await send_due_reminders(
+        TestingSessionLocal,
+        RecordingSender(fail_ids=frozenset({failing_id})),
+        timedelta(days=1),
+        batch_size=2,
+        concurrency=2,
+        now=NOW,
+    )
+    assert (first.sent, first.failed) == (3, 1)
+    assert await reminded_count() == 3
+
+    retry_sender = RecordingSender()
+    second = await send_due_reminders(
+        TestingSessionLocal, retry_sender, timedelta(days=1), 2, 2, now=NOW
+    )
+    assert retry_sender.sent == [failing_id]
+    assert second.claimed == 1
+
+
+async def test_reminder_is_abandoned_after_max_attempts(
+    test_db: AsyncSession,
+) -> None:
+    """После max_attempts неудач напоминание больше не забирается."""
+    await seed_appointments(test_db, 1)
+    async with TestingSessionLocal() as db:
+        appointment_id = await db.scalar(select(Appointment.id))
+    assert appointment_id is not None
+    sender = RecordingSender(fail_ids=frozenset({appointment_id}))
+
+    results = [
+        await send_due_reminders(
+            TestingSessionLocal, sender, timedelta(days=1), 10, 2, 3, now=NOW
+        )
+        for _ in range(4)
+    ]
+
+    assert [result.claimed for result in results] == [1, 1, 1, 0]
+    assert [result.abandoned for result in results] == [0, 0, 1, 0]
+    assert await reminded_count() == 1
+    async with TestingSessionLocal() as db:
+        appointment = await db.get(Appointment, appointment_id)
+    assert appointment is not None and appointment.reminder_attempts == 3
+
+
+def test_placeholder_bot_token_falls_back_to_log() -> None:
+    """Пустой токен или заглушка из .env.example не включают Telegram."""
+    for token in (None, "", "  ", "your_telegram_bot_token_here"):
+        sender = create_reminder_sender(Settings(telegram_bot_token=token))
+        assert isinstance(sender, LoggingReminderSender)
+
+    sender = create_reminder_sender(Settings(telegram_bot_token="123456:ABC-def_GHI"))
+    assert isinstance(sender, TelegramReminderSender)
+
+
+async def test_booking_stores_reminder_chat(test_db: AsyncSession) -> None:
+    """Чат Telegram из POST /appointments сохраняется для напоминания."""
+    doctor = Doctor(name="Доктор Петров", specialization="Кардиолог", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/appointments",
+            json={
+                "doctor_id": doctor.id,
+                "patient_name": "Пациент",
+                "start_time": next_workday_slot().isoformat(),
+                "telegram_chat_id": 987654321,
+            },
+        )
+    assert response.status_code == 201
+
+    async with TestingSessionLocal() as db:
+        appointment = await db.get(Appointment, response.json()["id"])
+    assert appointment is not None
+    assert appointment.telegram_chat_id == 987654321
+    assert appointment.reminder_sent_at is None
@@ -0,0 +1,190 @@
+"""Тесты серий записей (POST /appointments/series)."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import clinic_timezone
+from app.crud.appointment import find_series_conflicts
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.stats import DoctorDailyStats
+from tests.conftest import TestingSessionLocal
+from tests.test_slot_holds import next_workday_slot
+
+
+async def create_doctor(test_db: AsyncSession) -> Doctor:
+    """Активный врач."""
+    doctor = Doctor(name="Доктор Иванов", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+    return doctor
+
+
+def next_monday_slot(hour: int = 10) -> datetime:
+    """Слот ближайшего будущего понедельника по времени клиники."""
+    slot = next_workday_slot(hour)
+    return slot + timedelta(days=(7 - slot.weekday()) % 7)
+
+
+async def post_series(**payload: Any) -> tuple[int, dict]:
+    """POST /appointments/series."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/appointments/series",
+            json={"patient_name": "Пациент серии", **payload},
+        )
+    return response.status_code, response.json()
+
+
+async def appointments_count(test_db: AsyncSession) -> int:
+    """Число записей в БД."""
+    return int(await test_db.scalar(select(func.count(Appointment.id))) or 0)
+
+
+def utc(value: str) -> datetime:
+    """Время из ответа API в UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+async def test_weekly_series_created_in_clinic_wall_time(
+    test_db: AsyncSession,
+) -> None:
+    """Серия создается целиком, все приемы - в то же время по часам клиники."""
+    doctor = await create_doctor(test_db)
+    first = next_monday_slot(11)
+
+    status, body = await post_series(
+        doctor_id=doctor.id, start_time=first.isoformat(), interval_days=7, count=10
+    )
+
+    assert status == 201
+    assert body["conflicts"] == []
+    assert len(body["created"]) == 10
+    local_times = [
+        utc(row["start_time"]).astimezone(clinic_timezone()) for row in body["created"]
+    ]
+    assert {(t.weekday(), t.hour, t.minute) for t in local_times} == {(0, 11, 0)}
+    assert local_times[-1].date() == (first + timedelta(weeks=9)).date()
+
+    assert await appointments_count(test_db) == 10
+    stats_total = await test_db.scalar(
+        select(func.sum(DoctorDailyStats.appointments_count))
+    )
+    assert stats_total == 10
+
+
+async def test_all_or_nothing_series_reports_conflicts(test_db: AsyncSession) -> None:
+    """При конфликте all_or_nothing не создает ничего и возвращает 409 с датами."""
+    doctor = await create_doctor(test_db)
+    first = next_monday_slot()
+    busy = (first + timedelta(weeks=2)).astimezone(timezone.utc)
+    test_db.add(
+        Appointment(doctor_id=doctor.id, patient_name="Занято", start_time=busy)
+    )
+    await test_db.commit()
+
+    status, body = await post_series(
+        doctor_id=doctor.id, start_time=first.isoformat(), count=4
+    )
+
+    assert status == 409
+    assert body["created"] == []
+    assert [utc(c["start_time"]) for c in body["conflicts"]] == [busy]
+    assert await appointments_count(test_db) == 1
+
+
+async def test_best_effort_series_skips_conflicts_and_days_off(
+    test_db: AsyncSession,
+) -> None:
+    """best_effort создает свободные даты; выходные и занятые - в conflicts."""
+    doctor = await create_doctor(test_db)
+    first = next_monday_slot()
+    busy = (first + timedelta(days=1)).astimezone(timezone.utc)
+    test_db.add(
+        Appointment(doctor_id=doctor.id, patient_name="Занято", start_time=busy)
+    )
+    await test_db.commit()
+
+    status, body = await post_series(
+        doctor_id=doctor.id,
+        start_time=first.isoformat(),
+        interval_days=1,
+        count=7,
+        mode="best_effort",
+    )
+
+    assert status == 201
+    # Пн, Ср, Чт, Пт свободны; Вт занят; Сб и Вс - выходные
+    assert len(body["created"]) == 4
+    reasons = {utc(c["start_time"]): c["reason"] for c in body["conflicts"]}
+    assert reasons[busy] == "Врач уже занят в это время"
+    assert sum("рабочие дни" in reason for reason in reasons.values()) == 2
+    assert await appointments_count(test_db) == 5
+
+
+async def test_series_race_returns_409_with_conflicting_dates(
+    test_db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Запись конкурента между проверкой и вставкой серии - 409, а не 500."""
+    doctor = await create_doctor(test_db)
+    first = next_monday_slot()
+    racer = (first + timedelta(weeks=1)).astimezone(timezone.utc)
+    check = find_series_conflicts
+    raced = False
+
+    async def check_then_race(*args: Any) -> dict[datetime, str]:
+        nonlocal raced
+        busy = await check(*args)
+        if not raced:
+            raced = True
+            # Конкурент на 15 минут позже: UNIQUE не нарушен, пересечение есть
+            async with TestingSessionLocal() as db:
+                db.add(
+                    Appointment(
+                        doctor_id=doctor.id,
+                        patient_name="Конкурент",
+                        start_time=racer + timedelta(minutes=15),
+                        duration_minutes=15,
+                    )
+                )
+                await db.commit()
+        return busy
+
+    monkeypatch.setattr("app.crud.appointment.find_series_conflicts", check_then_race)
+
+    status, body = await post_series(
+        doctor_id=doctor.id, start_time=first.isoformat(), count=3, mode="best_effort"
+    )
+
+    assert status == 409
+    assert body["created"] == []
+    assert [utc(c["start_time"]) for c in body["conflicts"]] == [racer]
+    assert await appointments_count(test_db) == 1
+
+
+async def test_series_validates_doctor_and_first_slot(test_db: AsyncSession) -> None:
+    """Неизвестный врач - 400, недопустимое первое время - 422."""
+    doctor = await create_doctor(test_db)
+
+    status, _ = await post_series(
+        doctor_id=doctor.id + 100, start_time=next_monday_slot().isoformat(), count=2
+    )
+    assert status == 400
+
+    status, _ = await post_series(
+        doctor_id=doctor.id,
+        start_time=next_monday_slot().replace(minute=15).isoformat(),
+        count=2,
+    )
+    assert status == 422
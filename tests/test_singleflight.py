@@ -0,0 +1,171 @@
+"""Тесты объединения одинаковых одновременных чтений."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.singleflight import SingleFlight
+from app.crud.appointment import get_appointment, get_doctor_appointments
+from app.crud.coalesce import can_coalesce, read_flights
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.schemas.appointment import AppointmentResponse
+from tests.conftest import TestingSessionLocal, engine
+
+
+async def test_concurrent_calls_share_one_execution() -> None:
+    """Одновременные вызовы с одним ключом выполняются один раз."""
+    flights = SingleFlight()
+    executions = 0
+
+    async def call() -> int:
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert executions == 1
+    assert flights.stats.as_dict() == {
+        "calls": 5,
+        "executions": 1,
+        "shared": 4,
+        "dedup_ratio": 0.8,
+    }
+    assert flights.in_flight == 0
+
+
+async def test_exception_is_fanned_out() -> None:
+    """Исключение лидера получают все ожидающие."""
+    flights = SingleFlight()
+
+    async def call() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("сбой")
+
+    results = await asyncio.gather(
+        *(flights.do("key", call) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats.executions == 1
+
+
+async def test_cancelled_leader_hands_over_to_follower() -> None:
+    """Отмена лидера не отменяет ожидающих: один из них выполняет вызов."""
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    leader = asyncio.create_task(flights.do("key", call))
+    await started.wait()
+    follower = asyncio.create_task(flights.do("key", call))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flights.stats.executions == 2
+
+
+async def create_appointment(test_db: AsyncSession) -> Appointment:
+    """Врач с одной записью."""
+    doctor = Doctor(name="Тестовый врач", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+    appointment = Appointment(
+        doctor_id=doctor.id,
+        patient_name="Тестовый пациент",
+        start_time=datetime.now(timezone.utc).replace(microsecond=0)
+        + timedelta(days=1),
+    )
+    test_db.add(appointment)
+    await test_db.commit()
+    return appointment
+
+
+def count_selects(statements: list[str]) -> Any:
+    """Подписка на SQL движка тестовой БД."""
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return capture
+
+
+async def test_crud_reads_from_many_sessions_are_coalesced(
+    test_db: AsyncSession,
+) -> None:
+    """Чтения одной записи из разных сессий - один SELECT."""
+    appointment = await create_appointment(test_db)
+    statements: list[str] = []
+    capture = count_selects(statements)
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+
+    async def read_in_session() -> tuple[Any, list[AppointmentResponse]]:
+        async with TestingSessionLocal() as db:
+            week = (appointment.start_time, appointment.start_time + timedelta(7))
+            return await asyncio.gather(
+                get_appointment(db, appointment.id),
+                get_doctor_appointments(db, appointment.doctor_id, *week),
+            )
+
+    try:
+        results = await asyncio.gather(*(read_in_session() for _ in range(4)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    assert {found.id for found, _ in results} == {appointment.id}
+    # Общий результат не привязан к сессии лидера
+    assert all(isinstance(found, AppointmentResponse) for found, _ in results)
+    assert all(len(schedule) == 1 for _, schedule in results)
+    # Один SELECT записи и один SELECT расписания вместо 8
+    assert len(statements) == 2
+
+
+async def test_session_with_own_writes_is_not_coalesced(
+    test_db: AsyncSession,
+) -> None:
+    """Сессия с незафиксированными изменениями читает сама."""
+    appointment = await create_appointment(test_db)
+
+    async with TestingSessionLocal() as db:
+        assert can_coalesce(db)
+        doctor = Doctor(name="Новый врач", specialization="Хирург")
+        db.add(doctor)
+        assert not can_coalesce(db)
+        await db.flush()
+        assert not can_coalesce(db)
+        assert await get_appointment(db, appointment.id) is not None
+        await db.rollback()
+        assert can_coalesce(db)
+
+
+async def test_metrics_expose_dedup_counters(test_db: AsyncSession) -> None:
+    """GET /metrics отдает счетчики объединения."""
+    await get_appointment(test_db, 1)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    singleflight = response.json()["singleflight"]
+    assert singleflight["calls"] == read_flights.stats.calls
+    assert singleflight["calls"] >= 1
+    assert "dedup_ratio" in singleflight
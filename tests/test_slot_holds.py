@@ -0,0 +1,202 @@
+"""Тесты временных удержаний слотов."""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import clinic_timezone
+from app.core.timing_wheel import TimingWheel
+from app.main import app
+from app.models.doctor import Doctor
+from app.models.slot_hold import SlotHold
+from app.services.slot_holds import get_slot_hold_expirer
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture(autouse=True)
+async def stop_expirer() -> AsyncIterator[None]:
+    """Остановить фоновую задачу удаления удержаний после теста."""
+    yield
+    await get_slot_hold_expirer().stop()
+
+
+def test_timing_wheel_expires_at_deadline_tick() -> None:
+    """Таймер истекает в свой тик, отмененный - никогда."""
+    wheel: TimingWheel[str] = TimingWheel(1.0, now=100.0, slots=4, levels=2)
+    wheel.add("near", 102.5)
+    wheel.add("cancelled", 103)
+    wheel.add("far", 111)
+    assert wheel.remove("cancelled")
+
+    assert wheel.advance(102) == []
+    assert wheel.advance(103) == ["near"]
+    assert wheel.advance(110) == []
+    assert wheel.advance(111) == ["far"]
+    assert len(wheel) == 0
+
+
+def test_timing_wheel_cascades_beyond_horizon() -> None:
+    """Таймеры за горизонтом колеса и на разных уровнях истекают вовремя."""
+    wheel: TimingWheel[int] = TimingWheel(1.0, now=0.0, slots=4, levels=2)
+    deadlines = {key: key * 3 + 1 for key in range(20)}  # до 58 при горизонте 16
+    for key, deadline in deadlines.items():
+        wheel.add(key, deadline)
+
+    expired_at = {}
+    for now in range(1, 70):
+        for key in wheel.advance(now):
+            expired_at[key] = now
+
+    assert expired_at == deadlines
+
+
+def next_workday_slot(hour: int = 10) -> datetime:
+    """Слот ближайшего будущего рабочего дня клиники."""
+    day: date = datetime.now(clinic_timezone()).date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime(day.year, day.month, day.day, hour, tzinfo=clinic_timezone())
+
+
+async def create_doctor(test_db: AsyncSession) -> Doctor:
+    """Активный врач."""
+    doctor = Doctor(name="Тестовый врач", specialization="Терапевт", is_active=True)
+    test_db.add(doctor)
+    await test_db.commit()
+    return doctor
+
+
+def appointment_json(doctor_id: int, start_time: datetime, **extra: str) -> dict:
+    """Тело POST /appointments."""
+    return {
+        "doctor_id": doctor_id,
+        "patient_name": "Тестовый пациент",
+        "start_time": start_time.isoformat(),
+        **extra,
+    }
+
+
+async def expire_all_holds() -> None:
+    """Сдвинуть срок всех удержаний в прошлое."""
+    async with TestingSessionLocal() as db:
+        await db.execute(
+            update(SlotHold).values(
+                expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+            )
+        )
+        await db.commit()
+
+
+async def test_hold_blocks_other_bookings(test_db: AsyncSession) -> None:
+    """Слот с удержанием бронируется только по его токену."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        hold = await ac.post(
+            "/holds",
+            json={"doctor_id": doctor.id, "start_time": start_time.isoformat()},
+        )
+        assert hold.status_code == 201
+        token = hold.json()["token"]
+
+        second_hold = await ac.post(
+            "/holds",
+            json={"doctor_id": doctor.id, "start_time": start_time.isoformat()},
+        )
+        foreign = await ac.post(
+            "/appointments", json=appointment_json(doctor.id, start_time)
+        )
+        own = await ac.post(
+            "/appointments",
+            json=appointment_json(doctor.id, start_time, hold_token=token),
+        )
+
+    assert second_hold.status_code == 400
+    assert foreign.status_code == 400
+    assert foreign.json()["detail"] == "Слот временно удерживается другим пациентом"
+    assert own.status_code == 201
+    # Использованное удержание удаляется вместе с созданием записи
+    assert await test_db.scalar(select(func.count()).select_from(SlotHold)) == 0
+
+
+async def test_expired_hold_does_not_block(test_db: AsyncSession) -> None:
+    """Истекшее удержание не мешает ни новому удержанию, ни записи."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        payload = {"doctor_id": doctor.id, "start_time": start_time.isoformat()}
+        first = await ac.post("/holds", json=payload)
+        await expire_all_holds()
+        second = await ac.post("/holds", json=payload)
+        await expire_all_holds()
+        booking = await ac.post(
+            "/appointments", json=appointment_json(doctor.id, start_time)
+        )
+        held_busy_slot = await ac.post("/holds", json=payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.json()["token"] != first.json()["token"]
+    assert booking.status_code == 201
+    assert held_busy_slot.status_code == 400
+
+
+async def test_release_hold(test_db: AsyncSession) -> None:
+    """DELETE /holds/{token} снимает удержание."""
+    doctor = await create_doctor(test_db)
+    start_time = next_workday_slot()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        hold = await ac.post(
+            "/holds",
+            json={"doctor_id": doctor.id, "start_time": start_time.isoformat()},
+        )
+        token = hold.json()["token"]
+        released = await ac.delete(f"/holds/{token}")
+        missing = await ac.delete(f"/holds/{token}")
+        booking = await ac.post(
+            "/appointments", json=appointment_json(doctor.id, start_time)
+        )
+
+    assert released.status_code == 204
+    assert missing.status_code == 404
+    assert booking.status_code == 201
+    assert token not in get_slot_hold_expirer().wheel
+
+
+async def test_expirer_deletes_expired_rows_by_token(test_db: AsyncSession) -> None:
+    """Колесо процесса удаляет строки истекших удержаний."""
+    doctor = await create_doctor(test_db)
+    expirer = get_slot_hold_expirer()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        for hour in (10, 11):
+            response = await ac.post(
+                "/holds",
+                json={
+                    "doctor_id": doctor.id,
+                    "start_time": next_workday_slot(hour).isoformat(),
+                },
+            )
+            assert response.status_code == 201
+
+    await expire_all_holds()
+    deleted = await expirer.expire_due(TestingSessionLocal, time.time() + 3600)
+
+    assert deleted == 2
+    assert await test_db.scalar(select(func.count()).select_from(SlotHold)) == 0
@@ -0,0 +1,158 @@
+"""Тесты поиска ближайших свободных слотов."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import SLOTS_PER_WORKDAY, clinic_timezone, day_slots
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+from app.models.slot_hold import SlotHold
+from app.services import slot_search
+from tests.test_slot_holds import next_workday_slot
+
+
+async def create_doctors(test_db: AsyncSession) -> list[Doctor]:
+    """Три невролога и терапевт."""
+    doctors = [
+        Doctor(name="Невролог А", specialization="Невролог", is_active=True),
+        Doctor(name="Невролог Б", specialization="Невролог", is_active=True),
+        Doctor(name="Невролог В", specialization="Невролог", is_active=True),
+        Doctor(name="Терапевт", specialization="Терапевт", is_active=True),
+    ]
+    test_db.add_all(doctors)
+    await test_db.commit()
+    return doctors
+
+
+async def get_json(url: str, **params: Any) -> tuple[int, Any]:
+    """GET-запрос к API."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(url, params=params)
+    return response.status_code, response.json()
+
+
+def utc(value: str) -> datetime:
+    """Время из ответа API в UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+async def test_earliest_slots_merge_doctors_of_specialization(
+    test_db: AsyncSession,
+) -> None:
+    """Слоты врачей сливаются по времени; занятые и удержанные пропускаются."""
+    first, second, third, _ = await create_doctors(test_db)
+    day = next_workday_slot().date()
+    nine, half_past_nine = day_slots(day)[:2]
+    test_db.add(Appointment(doctor_id=first.id, patient_name="П", start_time=nine))
+    test_db.add(
+        SlotHold(
+            doctor_id=second.id,
+            start_time=nine,
+            token="held",
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=5),
+        )
+    )
+    await test_db.commit()
+
+    status, body = await get_json(
+        "/slots/earliest", specialization="невролог", date_from=day.isoformat(), limit=4
+    )
+
+    assert status == 200
+    assert [(row["doctor_id"], utc(row["start_time"])) for row in body] == [
+        (third.id, nine),
+        (first.id, half_past_nine),
+        (second.id, half_past_nine),
+        (third.id, half_past_nine),
+    ]
+    assert {row["specialization"] for row in body} == {"Невролог"}
+
+
+async def test_earliest_slots_read_only_days_reached(
+    test_db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Занятость читается только за дни, до которых дошел поиск."""
+    doctor, *_ = await create_doctors(test_db)
+    day = next_workday_slot().date()
+    test_db.add_all(
+        Appointment(doctor_id=doctor.id, patient_name="П", start_time=slot)
+        for slot in day_slots(day)
+    )
+    await test_db.commit()
+
+    calls: list[datetime] = []
+    original = slot_search.get_busy_intervals
+
+    async def counting(*args: Any) -> Any:
+        calls.append(args[2])
+        return await original(*args)
+
+    monkeypatch.setattr(slot_search, "get_busy_intervals", counting)
+
+    status, body = await get_json(
+        f"/doctors/{doctor.id}/slots",
+        date_from=day.isoformat(),
+        date_to=(day + timedelta(days=30)).isoformat(),
+        limit=3,
+    )
+
+    assert status == 200
+    assert len(body) == 3
+    # Первый день занят целиком - слоты со следующего рабочего дня
+    next_day = utc(body[0]["start_time"]).astimezone(clinic_timezone()).date()
+    assert next_day > day
+    assert len(calls) == 2
+
+
+async def test_doctor_slots_skip_booked_and_unknown_doctor(
+    test_db: AsyncSession,
+) -> None:
+    """Слоты врача без занятых; неизвестный врач - 404."""
+    doctor, *_ = await create_doctors(test_db)
+    day = next_workday_slot().date()
+    booked = day_slots(day)[3]
+    test_db.add(Appointment(doctor_id=doctor.id, patient_name="П", start_time=booked))
+    await test_db.commit()
+
+    status, body = await get_json(
+        f"/doctors/{doctor.id}/slots",
+        date_from=day.isoformat(),
+        date_to=day.isoformat(),
+    )
+    assert status == 200
+    times = [utc(row["start_time"]) for row in body]
+    assert len(times) == SLOTS_PER_WORKDAY - 1
+    assert booked not in times
+    assert times == sorted(times)
+
+    status, _ = await get_json(f"/doctors/{doctor.id + 100}/slots")
+    assert status == 404
+
+
+async def test_doctor_slots_page_after_cursor(test_db: AsyncSession) -> None:
+    """`after` отдает следующую страницу без повторов и пропусков."""
+    doctor, *_ = await create_doctors(test_db)
+    day = next_workday_slot().date()
+    params = {"date_from": day.isoformat(), "date_to": day.isoformat()}
+
+    _, everything = await get_json(f"/doctors/{doctor.id}/slots", **params)
+    _, first = await get_json(f"/doctors/{doctor.id}/slots", limit=5, **params)
+    status, second = await get_json(
+        f"/doctors/{doctor.id}/slots",
+        limit=5,
+        after=first[-1]["start_time"],
+        **params,
+    )
+
+    assert status == 200
+    assert first + second == everything[:10]
@@ -0,0 +1,211 @@
+"""Тесты агрегатов загрузки врачей."""
+
+from datetime import date, datetime, timedelta
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.schedule import SLOTS_PER_WORKDAY, clinic_timezone
+from app.crud.stats import (
+    DailyLoad,
+    get_doctor_daily_stats,
+    rebuild_doctor_daily_stats,
+)
+from app.main import app
+from app.models.appointment import Appointment
+from app.models.doctor import Doctor
+
+
+def next_workday() -> date:
+    """Ближайший будущий рабочий день клиники (не сегодня)."""
+    day = datetime.now(clinic_timezone()).date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def slot(day: date, hour: int, minute: int = 0) -> datetime:
+    """Время слота в часовом поясе клиники."""
+    return datetime(
+        day.year, day.month, day.day, hour, minute, tzinfo=clinic_timezone()
+    )
+
+
+async def create_doctors(test_db: AsyncSession) -> tuple[Doctor, Doctor, Doctor]:
+    """Два терапевта (один неактивный) и кардиолог."""
+    doctors = (
+        Doctor(name="Терапевт 1", specialization="Терапевт", is_active=True),
+        Doctor(name="Терапевт 2", specialization="Терапевт", is_active=False),
+        Doctor(name="Кардиолог", specialization="Кардиолог", is_active=True),
+    )
+    test_db.add_all(doctors)
+    await test_db.commit()
+    return doctors
+
+
+async def test_booking_increments_daily_stats(test_db: AsyncSession) -> None:
+    """Каждое бронирование увеличивает счетчик дня врача."""
+    therapist, _, _ = await create_doctors(test_db)
+    day = next_workday()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        for hour in (10, 11):
+            response = await ac.post(
+                "/appointments",
+                json={
+                    "doctor_id": therapist.id,
+                    "patient_name": "Тестовый пациент",
+                    "start_time": slot(day, hour).isoformat(),
+                },
+            )
+            assert response.status_code == 201
+        # Конфликт не должен менять агрегат
+        response = await ac.post(
+            "/appointments",
+            json={
+                "doctor_id": therapist.id,
+                "patient_name": "Другой пациент",
+                "start_time": slot(day, 10).isoformat(),
+            },
+        )
+        assert response.status_code == 400
+
+    stats = await get_doctor_daily_stats(test_db, day, day)
+    assert stats == {(therapist.id, day): DailyLoad(2, 60)}
+
+
+async def test_doctor_daily_stats_endpoint(test_db: AsyncSession) -> None:
+    """Загрузка врача по дням с нулями для дней без записей."""
+    therapist, _, cardiologist = await create_doctors(test_db)
+    day = next_workday()
+    test_db.add_all(
+        Appointment(
+            doctor_id=therapist.id,
+            patient_name=f"Пациент {hour}",
+            start_time=slot(day, hour),
+        )
+        for hour in range(9, 18)
+    )
+    await test_db.commit()
+    await rebuild_doctor_daily_stats(test_db)
+    await test_db.commit()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get(
+            "/stats/doctors/daily",
+            params={"date_from": day.isoformat(), "date_to": day.isoformat()},
+        )
+
+    assert response.status_code == 200
+    data = {row["doctor_id"]: row for row in response.json()}
+    # Неактивный врач не попадает в статистику
+    assert set(data) == {therapist.id, cardiologist.id}
+    assert data[therapist.id]["appointments"] == 9
+    assert data[therapist.id]["capacity"] == SLOTS_PER_WORKDAY
+    assert data[therapist.id]["free_slots"] == SLOTS_PER_WORKDAY - 9
+    assert data[therapist.id]["utilization"] == 0.5
+    assert data[cardiologist.id]["appointments"] == 0
+
+
+async def test_mixed_durations_count_booked_minutes(test_db: AsyncSession) -> None:
+    """Загрузка считается по минутам: 60-минутный прием занимает два слота."""
+    therapist, _, _ = await create_doctors(test_db)
+    day = next_workday()
+    visits = [(slot(day, 9), 60), (slot(day, 10), 60)] + [
+        (slot(day, 11, minute), 15) for minute in (0, 15, 30)
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        for start_time, duration in visits:
+            response = await ac.post(
+                "/appointments",
+                json={
+                    "doctor_id": therapist.id,
+                    "patient_name": "Тестовый пациент",
+                    "start_time": start_time.isoformat(),
+                    "duration_minutes": duration,
+                },
+            )
+            assert response.status_code == 201
+
+        incremental = await get_doctor_daily_stats(test_db, day, day)
+        await rebuild_doctor_daily_stats(test_db)
+        await test_db.commit()
+        assert await get_doctor_daily_stats(test_db, day, day) == incremental
+
+        response = await ac.get(
+            "/stats/doctors/daily",
+            params={
+                "date_from": day.isoformat(),
+                "date_to": day.isoformat(),
+                "doctor_id": therapist.id,
+            },
+        )
+
+    assert incremental == {(therapist.id, day): DailyLoad(5, 165)}
+    (row,) = response.json()
+    assert row["appointments"] == 5
+    assert row["booked_minutes"] == 165
+    # 540 - 165 = 375 свободных минут: 12 целых 30-минутных слотов
+    assert row["free_slots"] == 12
+    assert row["utilization"] == round(165 / (SLOTS_PER_WORKDAY * 30), 4)
+
+
+async def test_specialization_daily_stats_endpoint(test_db: AsyncSession) -> None:
+    """Загрузка по специализациям учитывает только активных врачей."""
+    therapist, _, _ = await create_doctors(test_db)
+    day = next_workday()
+    test_db.add(
+        Appointment(
+            doctor_id=therapist.id, patient_name="Пациент", start_time=slot(day, 9)
+        )
+    )
+    await test_db.commit()
+    await rebuild_doctor_daily_stats(test_db)
+    await test_db.commit()
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get(
+            "/stats/specializations/daily",
+            params={"date_from": day.isoformat(), "date_to": day.isoformat()},
+        )
+
+    assert response.status_code == 200
+    data = {row["specialization"]: row for row in response.json()}
+    assert data["Терапевт"]["doctors"] == 1
+    assert data["Терапевт"]["appointments"] == 1
+    assert data["Терапевт"]["free_slots"] == SLOTS_PER_WORKDAY - 1
+    assert data["Кардиолог"]["appointments"] == 0
+
+
+async def test_stats_rejects_invalid_range(test_db: AsyncSession) -> None:
+    """Период с date_to раньше date_from или слишком длинный - 400."""
+    day = next_workday()
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        reversed_range = await ac.get(
+            "/stats/doctors/daily",
+            params={
+                "date_from": day.isoformat(),
+                "date_to": (day - timedelta(days=1)).isoformat(),
+            },
+        )
+        too_long = await ac.get(
+            "/stats/specializations/daily",
+            params={
+                "date_from": day.isoformat(),
+                "date_to": (day + timedelta(days=400)).isoformat(),
+            },
+        )
+
+    assert reversed_range.status_code == 400
+    assert too_long.status_code == 400
@@ -46,9 +46,18 @@ async def test_create_appointment() -> None:
     mock_appointment_result = MagicMock()
     mock_appointment_result.scalar_one_or_none.return_value = None
 
+    # Мок для проверки удержания слота (удержания нет)
+    mock_hold_result = MagicMock()
+    mock_hold_result.scalar_one_or_none.return_value = None
+
     # Настройка последовательности вызовов execute:
-    # 1-й вызов - поиск врача, 2-й вызов - поиск конфликтующих записей
-    db_mock.execute.side_effect = [mock_doctor_result, mock_appointment_result]
+    # 1-й вызов - поиск врача, 2-й - поиск конфликтующих записей,
+    # 3-й - поиск действующего удержания слота
+    db_mock.execute.side_effect = [
+        mock_doctor_result,
+        mock_appointment_result,
+        mock_hold_result,
+    ]
 
     future_time = get_test_time() + timedelta(days=1)
     test_time = future_time.replace(hour=10, minute=0, second=0, microsecond=0)
@@ -81,7 +90,8 @@ async def test_create_appointment() -> None:
     assert result.start_time == test_time
 
     # Проверяем что были сделаны правильные вызовы
-    assert db_mock.execute.call_count == 2  # Поиск врача + поиск конфликтов
+    # Поиск врача + поиск конфликтов + проверка удержания
+    assert db_mock.execute.call_count == 3
     db_mock.add.assert_called_once()
 
 
@@ -90,10 +100,17 @@ async def test_get_appointment() -> None:
     """Тест получения записи на прием."""
     # Подготовка
     db_mock = AsyncMock(spec=AsyncSession)
-    mock_appointment = Mock(spec=Appointment)
-    mock_appointment.id = 1
-    mock_appointment.doctor_id = 1
-    mock_appointment.patient_name = "Тестовый пациент"
+    start_time = get_test_time().replace(hour=10, minute=0, second=0, microsecond=0)
+    mock_appointment = Appointment(
+        id=1,
+        doctor_id=1,
+        patient_name="Тестовый пациент",
+        start_time=start_time,
+        duration_minutes=30,
+        end_time=start_time + timedelta(minutes=30),
+        created_at=start_time,
+        updated_at=start_time,
+    )
 
     # Настройка mock для успешного результата
     mock_result = MagicMock()